@@ -14,12 +14,226 @@ import zipfile
 import shutil
 import threading
 import re
-from pathlib import Path
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
+from xdvdfs import XDVDFSImage, XDVDFSError, CRC32Reader, extract_iso, rebuild_xiso, rebuild_iso
+
+# The XEX header parser lives in the main application (one level up)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from xex_reader import analizar_cabecera_xex, XEX_HEADER_READ_SIZE
+except ImportError:
+    analizar_cabecera_xex = None
+
+# Prefix of the lines reporting extracted games to X360 TU Manager (--handoff)
+HANDOFF_PREFIX = "X360TUM-GAME "
+
+# Upper bound offered in the "Parallel ISOs" selector
+MAX_ISO_WORKERS = 8
+
+# Written into a game folder once its extraction verified; makes the skip check O(1)
+COMPLETION_MARKER = ".x360extractor-complete"
+
+ENGINE_NATIVE = "Native"
+ENGINE_EXTRACT_XISO = "extract-xiso"
+
+OUTPUT_FOLDERS = "Game folders"
+OUTPUT_TRIMMED_ISO = "Trimmed XISO"
+# A game-partition-only image with less slack than this is already trimmed
+TRIMMED_SLACK = 16 * 1024 * 1024
+
+# extract-xiso progress lines: "extracting <path> (<size> bytes) [<pct>%]", redrawn with \r
+_XISO_PROGRESS = re.compile(rb"extracting .* \((\d+) bytes\) \[(\d+)%\]")
+# Weight of the newest sample in the smoothed MB/s
+RATE_SMOOTHING = 0.3
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class ExtractionProgress:
+    """Thread-safe byte counters for the whole batch and each running ISO"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = 0
+        self.finished = 0
+        self.start = time.monotonic()
+        self.jobs = {}  # tag -> {"done", "total", "start", "sample", "rate"}
+    
+    def start_job(self, tag, total):
+        now = time.monotonic()
+        with self.lock:
+            self.total += total
+            self.jobs[tag] = {"done": 0, "total": total, "start": now, "sample": (now, 0), "rate": 0.0}
+    
+    def update_job(self, tag, done):
+        with self.lock:
+            job = self.jobs.get(tag)
+            if job:
+                job["done"] = min(done, job["total"])
+    
+    def finish_job(self, tag, success=True):
+        """Stop tracking an ISO; returns (seconds, average bytes/s)"""
+        with self.lock:
+            job = self.jobs.pop(tag, None)
+            if not job:
+                return 0.0, 0.0
+            if success:
+                self.finished += job["total"]
+            else:
+                # Failed/skipped work no longer counts towards the batch ETA
+                self.total -= job["total"]
+            elapsed = max(time.monotonic() - job["start"], 0.001)
+            return elapsed, job["done"] / elapsed
+    
+    def snapshot(self):
+        """(done, total, bytes/s, eta seconds, [(tag, done, total, bytes/s, eta)]) for the display"""
+        now = time.monotonic()
+        with self.lock:
+            jobs = []
+            batch_rate = 0.0
+            done = self.finished
+            for tag, job in self.jobs.items():
+                sample_time, sample_done = job["sample"]
+                if now - sample_time >= 0.5:
+                    current = (job["done"] - sample_done) / (now - sample_time)
+                    job["rate"] = current if not job["rate"] else (
+                        RATE_SMOOTHING * current + (1 - RATE_SMOOTHING) * job["rate"])
+                    job["sample"] = (now, job["done"])
+                # Average since the start until the first smoothed sample exists
+                rate = job["rate"] or job["done"] / max(now - job["start"], 0.001)
+                remaining = job["total"] - job["done"]
+                jobs.append((tag, job["done"], job["total"], rate, remaining / rate if rate else None))
+                batch_rate += rate
+                done += job["done"]
+            total = self.total
+        eta = (total - done) / batch_rate if batch_rate else None
+        return done, total, batch_rate, eta, sorted(jobs)
+
+# Kept free on every disk so the system and other programs don't run out of space
+SPACE_MARGIN = 256 * 1024 * 1024
+# Extracted files occupy whole filesystem blocks
+SPACE_BLOCK = 4096
+
+
+def allocated(size):
+    return -(-size // SPACE_BLOCK) * SPACE_BLOCK
+
+
+def format_size(size):
+    size_mb = size / (1024 * 1024)
+    return f"{size_mb:.1f}M" if size_mb < 1024 else f"{size_mb / 1024:.1f}G"
+
+
+def device_of(path):
+    """st_dev of path, or of its nearest existing parent"""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return os.stat(path).st_dev
+
+
+class SpaceJob:
+    """Disk space a job writes (needs) and gives back once verified (frees), per device"""
+    
+    def __init__(self, name, needs=None, frees=None):
+        self.name = name
+        self.needs = needs or {}
+        self.frees = frees or {}
+    
+    def add(self, which, dev, size):
+        table = self.needs if which == "needs" else self.frees
+        table[dev] = table.get(dev, 0) + size
+    
+    @property
+    def net(self):
+        return sum(self.frees.values()) - sum(self.needs.values())
+
+
+def order_space_jobs(jobs):
+    """Order jobs to keep peak disk usage low
+
+    Jobs that give back at least what they take go first, smallest first; the rest
+    follow with the ones that give back the most first.
+    """
+    gaining = sorted((j for j in jobs if j.net >= 0), key=lambda j: sum(j.needs.values()))
+    losing = sorted((j for j in jobs if j.net < 0), key=lambda j: -sum(j.frees.values()))
+    return gaining + losing
+
+
+def check_space_plan(jobs, free):
+    """Run the jobs in order on paper; returns [(job, dev, missing bytes)] that don't fit"""
+    free = dict(free)
+    problems = []
+    for job in jobs:
+        for dev, size in job.needs.items():
+            if size > free.get(dev, 0):
+                problems.append((job, dev, size - free.get(dev, 0)))
+        for dev, size in job.needs.items():
+            free[dev] = free.get(dev, 0) - size
+        for dev, size in job.frees.items():
+            free[dev] = free.get(dev, 0) + size
+    return problems
+
+
+class SpacePlanner:
+    """Reserves disk space before each job so parallel jobs never overcommit a disk"""
+    
+    def __init__(self, free=None):
+        # None: no plan was made, every reservation succeeds
+        self.free = dict(free) if free is not None else None
+        self.active = 0
+        self.condition = threading.Condition()
+    
+    def _fits(self, needs):
+        return all(size <= self.free.get(dev, 0) for dev, size in needs.items())
+    
+    def reserve(self, needs):
+        """Wait until the job fits; False when it cannot fit even with nothing else running"""
+        if self.free is None:
+            return True
+        with self.condition:
+            while not self._fits(needs):
+                if self.active == 0:
+                    return False
+                self.condition.wait()
+            for dev, size in needs.items():
+                self.free[dev] = self.free.get(dev, 0) - size
+            self.active += 1
+            return True
+    
+    def release(self, needs, success, frees=None):
+        """Finish a reservation; failed jobs cleaned up their files, so their space comes back"""
+        if self.free is None:
+            return
+        with self.condition:
+            if not success:
+                for dev, size in needs.items():
+                    self.free[dev] = self.free.get(dev, 0) + size
+            for dev, size in (frees or {}).items():
+                self.free[dev] = self.free.get(dev, 0) + size
+            self.active -= 1
+            self.condition.notify_all()
+
+
 class X360CuratorGUI:
-    def __init__(self, root):
+    def __init__(self, root, handoff=False):
         self.root = root
+        self.handoff = handoff
+        self._handoff_lock = threading.Lock()
         self.root.title("X360 Extractor GUI v1.0")
         self.root.geometry("800x600")
         self.root.resizable(True, True)
@@ -47,7 +261,18 @@ class X360CuratorGUI:
         # Variables
         self.source_dir = tk.StringVar()
         self.output_dir = tk.StringVar()
+        self.iso_workers = tk.StringVar(value="Auto")
+        self.stream_zip_isos = tk.BooleanVar(value=True)
+        # extract-xiso stays the default; the native XDVDFS engine is opt-in
+        self.iso_engine = tk.StringVar(value=ENGINE_EXTRACT_XISO)
+        self.output_format = tk.StringVar(value=OUTPUT_FOLDERS)
+        self.status_text = tk.StringVar(value="")
+        self.tracker = ExtractionProgress()
+        self.space_jobs = {}
+        self.job_order = {}
+        self.space = SpacePlanner()
         self.processing = False
+        self._log_lock = threading.Lock()
         
         # Set extract-xiso path (fixed location)
         self.extract_xiso_path = self.get_extract_xiso_path()
@@ -103,9 +328,27 @@ class X360CuratorGUI:
                   command=self.browse_output_dir).grid(
             row=2, column=2, pady=5)
         
+        # Parallel ISO extractions ("Auto" picks a value from the disks involved)
+        ttk.Label(main_frame, text="Parallel ISOs:").grid(
+            row=3, column=0, sticky=tk.W, pady=5)
+        options_frame = ttk.Frame(main_frame)
+        options_frame.grid(row=3, column=1, columnspan=2, sticky=tk.W, padx=(5, 5), pady=5)
+        ttk.Spinbox(options_frame, textvariable=self.iso_workers, width=6, state="readonly",
+                    values=["Auto"] + [str(n) for n in range(1, MAX_ISO_WORKERS + 1)]).pack(side=tk.LEFT)
+        # Zipped ISOs are read straight from the archive, no temporary .iso on disk
+        ttk.Checkbutton(options_frame, text="Extract ISOs directly from ZIPs",
+                        variable=self.stream_zip_isos).pack(side=tk.LEFT, padx=(15, 0))
+        ttk.Label(options_frame, text="Engine:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(options_frame, textvariable=self.iso_engine, width=12, state="readonly",
+                     values=[ENGINE_EXTRACT_XISO, ENGINE_NATIVE]).pack(side=tk.LEFT)
+        # Trimmed XISO: keep ISOs, but only the game partition with files laid out contiguously
+        ttk.Label(options_frame, text="Output:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(options_frame, textvariable=self.output_format, width=14, state="readonly",
+                     values=[OUTPUT_FOLDERS, OUTPUT_TRIMMED_ISO]).pack(side=tk.LEFT)
+        
         # Action buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=3, column=0, columnspan=3, pady=20)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=20)
         
         self.process_button = ttk.Button(button_frame, text="Process Games", 
                                         command=self.start_processing)
@@ -116,17 +359,19 @@ class X360CuratorGUI:
         
         # Progress bar
         self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
-        self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+        self.progress.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
+        ttk.Label(main_frame, textvariable=self.status_text, justify=tk.LEFT).grid(
+            row=6, column=0, columnspan=3, sticky=tk.W, pady=(2, 5))
         
         # Log area
         ttk.Label(main_frame, text="Processing log:").grid(
-            row=5, column=0, sticky=tk.W, pady=(10, 5))
+            row=7, column=0, sticky=tk.W, pady=(10, 5))
         
         self.log_text = scrolledtext.ScrolledText(main_frame, height=20, width=80)
-        self.log_text.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        self.log_text.grid(row=8, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
         # Configure expansion
-        main_frame.rowconfigure(6, weight=1)
+        main_frame.rowconfigure(8, weight=1)
     
     def browse_source_dir(self):
         """Select source directory"""
@@ -181,10 +426,18 @@ class X360CuratorGUI:
         return ""
     
     def log(self, message, color="black"):
-        """Add message to log"""
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Add message to log (safe to call from worker threads)"""
+        def append():
+            self.log_text.insert(tk.END, f"{message}\n")
+            self.log_text.see(tk.END)
+        
+        if threading.current_thread() is threading.main_thread():
+            append()
+            self.root.update_idletasks()
+        else:
+            # Tk widgets must only be touched from the main thread
+            with self._log_lock:
+                self.root.after(0, append)
     
     def clear_log(self):
         """Clear log area"""
@@ -204,38 +457,64 @@ class X360CuratorGUI:
             messagebox.showerror("Error", "Please select the output directory")
             return
         
-        if not self.extract_xiso_path:
-            messagebox.showerror("Error", "extract-xiso not found in expected location")
-            return
-        
-        # Verify extract-xiso exists and is executable
-        if not os.path.isfile(self.extract_xiso_path):
-            messagebox.showerror("Error", f"extract-xiso file not found at: {self.extract_xiso_path}")
-            return
-        
-        # Check executable permissions (skip on Windows)
-        system = platform.system().lower()
-        if system != "windows" and not os.access(self.extract_xiso_path, os.X_OK):
-            messagebox.showerror("Error", "extract-xiso is not executable")
-            return
+        # The native engine (and the XISO rebuild) needs no external binary
+        if self.iso_engine.get() == ENGINE_EXTRACT_XISO and not self.rebuild_mode():
+            if not self.extract_xiso_path:
+                messagebox.showerror("Error", "extract-xiso not found in expected location")
+                return
+            
+            # Verify extract-xiso exists and is executable
+            if not os.path.isfile(self.extract_xiso_path):
+                messagebox.showerror("Error", f"extract-xiso file not found at: {self.extract_xiso_path}")
+                return
+            
+            # Check executable permissions (skip on Windows)
+            system = platform.system().lower()
+            if system != "windows" and not os.access(self.extract_xiso_path, os.X_OK):
+                messagebox.showerror("Error", "extract-xiso is not executable")
+                return
         
         # Start processing
         self.processing = True
         self.process_button.config(state='disabled')
+        self.tracker = ExtractionProgress()
+        self.progress.config(mode='indeterminate')
         self.progress.start()
+        self.refresh_progress()
         
         # Execute in separate thread
         thread = threading.Thread(target=self.process_games)
         thread.daemon = True
         thread.start()
     
+    def refresh_progress(self):
+        """Redraw the progress bar and MB/s / ETA status (main thread, twice per second)"""
+        done, total, rate, eta, jobs = self.tracker.snapshot()
+        if total > 0:
+            if str(self.progress.cget('mode')) != 'determinate':
+                self.progress.stop()
+                self.progress.config(mode='determinate', maximum=1000)
+            self.progress['value'] = 1000 * done / total
+            lines = [f"Batch: {done / 1048576:.0f} / {total / 1048576:.0f} MB "
+                     f"({100 * done / total:.0f}%) - {rate / 1048576:.1f} MB/s - ETA {format_eta(eta)}"]
+            for tag, job_done, job_total, job_rate, job_eta in jobs:
+                percent = 100 * job_done / job_total if job_total else 100
+                lines.append(f"{tag} {percent:.0f}% - {job_rate / 1048576:.1f} MB/s - ETA {format_eta(job_eta)}")
+            self.status_text.set("\n".join(lines))
+        
+        if self.processing:
+            self.root.after(500, self.refresh_progress)
+    
     def process_games(self):
         """Process games (executed in separate thread)"""
         try:
             self.log("=== STARTING PROCESSING ===")
             system_name = platform.system()
             self.log(f"Operating System: {system_name}")
-            self.log(f"extract-xiso path: {self.extract_xiso_path}")
+            if self.iso_engine.get() == ENGINE_EXTRACT_XISO:
+                self.log(f"extract-xiso path: {self.extract_xiso_path}")
+            else:
+                self.log("ISO engine: native XDVDFS extractor")
             
             source_dir = self.source_dir.get()
             output_dir = self.output_dir.get()
@@ -245,8 +524,12 @@ class X360CuratorGUI:
             
             steps_completed = 0
             
-            # STEP 1: Extract ZIPs
-            if self.extract_zips(source_dir):
+            # Refuse batches that cannot fit on disk before writing anything
+            if not self.plan_batch(source_dir, output_dir):
+                return
+            
+            # STEP 1: Extract ZIPs (zipped ISOs go straight to output_dir in streaming mode)
+            if self.extract_zips(source_dir, output_dir):
                 steps_completed += 1
             
             # STEP 2: Process ISOs
@@ -262,45 +545,193 @@ class X360CuratorGUI:
         finally:
             self.processing = False
             self.process_button.config(state='normal')
-            self.progress.stop()
+            self.root.after(0, self.progress.stop)
     
-    def extract_zips(self, source_dir):
-        """Extract ZIP files"""
-        zip_files = [f for f in os.listdir(source_dir) 
-                    if f.lower().endswith('.zip')]
+    def extract_zips(self, source_dir, output_dir=None):
+        """Extract ZIP files (one pass per archive, several archives at once)"""
+        zip_files = self.in_plan_order(f for f in os.listdir(source_dir) 
+                                       if f.lower().endswith('.zip'))
         
         if not zip_files:
             self.log("No ZIP files found")
             return False
         
+        # Archives are extracted next to themselves, so the same disk rule as ISOs applies
+        workers = self.get_iso_workers(source_dir, source_dir, len(zip_files))
         self.log(f"Extracting {len(zip_files)} ZIP file(s)...")
         
         extracted = 0
-        for zip_file in zip_files:
-            zip_path = os.path.join(source_dir, zip_file)
-            self.log(f"Extracting: {zip_file}")
-            
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.run_zip_job, zip_file, source_dir,
+                                   output_dir if self.stream_zip_isos.get() else None)
+                       for zip_file in zip_files]
+            for future in as_completed(futures):
+                if future.result():
+                    extracted += 1
+        
+        self.log(f"ZIPs extracted: {extracted} of {len(zip_files)}")
+        return extracted > 0
+    
+    def run_zip_job(self, zip_file, source_dir, iso_output_dir):
+        """Reserve space, extract one ZIP and delete it as soon as it verified"""
+        job = self.space_jobs.get(zip_file, SpaceJob(zip_file))
+        if not self.space.reserve(job.needs):
+            self.log(f"✗ Not enough disk space left for {zip_file}, skipping")
+            return False
+        
+        success = self.extract_single_zip(os.path.join(source_dir, zip_file), source_dir, iso_output_dir)
+        removed = False
+        if success:
+            # Remove ZIP only after every member was extracted and verified
             try:
-                # Verify integrity
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.testzip()
-                
-                # Extract
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(source_dir)
-                
-                self.log(f"✓ Extracted: {zip_file}")
-                extracted += 1
-                
-                # Remove ZIP after successful extraction
-                os.remove(zip_path)
+                os.remove(os.path.join(source_dir, zip_file))
+                removed = True
                 self.log(f"✓ Removed ZIP: {zip_file}")
-                
             except Exception as e:
-                self.log(f"✗ Error extracting {zip_file}: {str(e)}")
+                self.log(f"⚠ Could not remove ZIP {zip_file}: {str(e)}")
+        self.space.release(job.needs, success, job.frees if removed else None)
+        return success
+    
+    def zip_member_path(self, dest_dir, member_name):
+        """Safe destination path for a ZIP member (None if it would escape dest_dir)"""
+        parts = [p for p in member_name.replace("\\", "/").split("/") if p not in ("", ".")]
+        if not parts or ".." in parts or os.path.isabs(member_name) or ":" in parts[0]:
+            return None
+        return os.path.join(dest_dir, *parts)
+    
+    def extract_single_zip(self, zip_path, dest_dir, iso_output_dir=None):
+        """Stream every member to a temporary .part file while its CRC is checked
+
+        The files are renamed into place only when all members verified, so a damaged
+        archive leaves nothing half-extracted behind. With iso_output_dir, .iso members
+        are extracted as games straight from the archive instead. Returns True on success.
+        """
+        zip_file = os.path.basename(zip_path)
+        self.log(f"Extracting: {zip_file}")
+        pending = []  # (part path, final path)
+        streamed = 0
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    target = self.zip_member_path(dest_dir, info.filename)
+                    if target is None:
+                        raise zipfile.BadZipFile(f"unsafe member path: {info.filename}")
+                    if info.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                        continue
+                    
+                    if iso_output_dir and info.filename.lower().endswith('.iso'):
+                        iso_log = lambda message: self.log(f"[{zip_file}] {message}")
+                        if not self.extract_zipped_iso(zip_ref, info, iso_output_dir, iso_log):
+                            raise zipfile.BadZipFile(f"could not extract {info.filename}")
+                        streamed += 1
+                        continue
+                    
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    part = target + ".part"
+                    pending.append((part, target))
+                    # ZipExtFile raises BadZipFile on a CRC mismatch when the member is fully read
+                    with zip_ref.open(info) as src, open(part, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+            
+            for part, target in pending:
+                os.replace(part, target)
+            self.log(f"✓ Extracted: {zip_file} ({len(pending) + streamed} file(s) verified)")
+            return True
+            
+        except Exception as e:
+            for part, _ in pending:
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+            self.log(f"✗ Error extracting {zip_file}: {str(e)}")
+            return False
+    
+    def extract_zipped_iso(self, zip_ref, info, output_dir, log):
+        """Extract an ISO member of an open ZIP straight into its game folder
+
+        The member is read as a seekable stream in disk order and every byte of it is
+        checked against the CRC-32 stored in the ZIP. The ISO itself is never written to disk.
+        """
+        original_name = os.path.splitext(os.path.basename(info.filename))[0]
+        base_name = self.clean_game_name(original_name)
+        log(f"  - Streaming {os.path.basename(info.filename)} from ZIP as '{base_name}'")
         
-        self.log(f"ZIPs extracted: {extracted} of {len(zip_files)}")
-        return extracted > 0
+        if self.rebuild_mode():
+            return self.rebuild_zipped_iso(zip_ref, info, self.trimmed_iso_path(output_dir, info.filename), log)
+        
+        game_dir = os.path.join(output_dir, base_name)
+        if not self.prepare_game_dir(game_dir, log):
+            return True
+        
+        try:
+            tag = f"[{os.path.basename(info.filename)}]"
+            with zip_ref.open(info) as member:
+                src = CRC32Reader(member)
+                image = XDVDFSImage(src)
+                # Tables and files are read in one pass, so the data size is only known at the
+                # end: progress counts bytes of the member read, which is the real work anyway
+                self.tracker.start_job(tag, info.file_size)
+                try:
+                    file_count, data_size = image.extract(
+                        game_dir, lambda _done, _total: self.tracker.update_job(tag, src.consumed))
+                    self.check_member_crc(src, info)
+                except Exception:
+                    self.tracker.finish_job(tag, False)
+                    raise
+                self.tracker.finish_job(tag, True)
+        except XDVDFSError as e:
+            log(f"  - ✗ {e} (disable 'Extract ISOs directly from ZIPs' to use extract-xiso)")
+            shutil.rmtree(game_dir, ignore_errors=True)
+            return False
+        except Exception as e:
+            log(f"  - ✗ Error streaming ISO: {str(e)}")
+            shutil.rmtree(game_dir, ignore_errors=True)
+            return False
+        
+        log(f"  - ✓ ISO extracted from ZIP ({file_count} files, CRC verified)")
+        return self.verify_extracted_game(game_dir, log)
+    
+    def check_member_crc(self, src, info):
+        """Compare the CRC-32 of every byte read from a ZIP member with the archive's"""
+        crc = src.finish()
+        if crc != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename} ({crc:08x}, expected {info.CRC:08x})")
+    
+    def rebuild_zipped_iso(self, zip_ref, info, out_path, log):
+        """Write a trimmed XISO straight from a ZIP member, checking the member's CRC-32"""
+        if os.path.exists(out_path):
+            log(f"  - Game already processed, skipping")
+            return True
+        
+        tag = f"[{os.path.basename(info.filename)}]"
+        part = out_path + ".part"
+        start = time.monotonic()
+        try:
+            with zip_ref.open(info) as member:
+                src = CRC32Reader(member)
+                image = XDVDFSImage(src)
+                data_size = image.data_size()
+                file_count = sum(1 for e in image.entries() if not e.is_dir)
+                self.tracker.start_job(tag, data_size)
+                try:
+                    with open(part, "wb") as out:
+                        written = rebuild_xiso(image, out, lambda done, _total: self.tracker.update_job(tag, done))
+                    self.check_member_crc(src, info)
+                except Exception:
+                    self.tracker.finish_job(tag, False)
+                    raise
+                self.tracker.finish_job(tag, True)
+            os.replace(part, out_path)
+        except Exception as e:
+            log(f"  - ✗ Error rebuilding ISO from ZIP: {str(e)}")
+            if os.path.exists(part):
+                os.remove(part)
+            return False
+        
+        elapsed = max(time.monotonic() - start, 0.001)
+        return self.verify_rebuilt_iso(out_path, file_count, data_size, log, written, elapsed)
     
     def clean_game_name(self, original_name):
         """Clean game name by removing region patterns"""
@@ -324,82 +755,478 @@ class X360CuratorGUI:
         
         return clean_name
     
+    def is_rotational(self, path):
+        """True for spinning disks, False for SSD/NVMe, None when unknown (Linux sysfs only)"""
+        try:
+            dev = os.stat(path).st_dev
+            block = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+            # Partitions keep the queue settings on their parent device
+            for candidate in (block, os.path.join(block, "..")):
+                queue = os.path.join(candidate, "queue", "rotational")
+                if os.path.isfile(queue):
+                    with open(queue) as f:
+                        return f.read().strip() == "1"
+        except (OSError, AttributeError):
+            pass
+        return None
+    
+    def default_iso_workers(self, source_dir, output_dir):
+        """I/O-aware default: parallelism only pays off when reads and writes don't share a disk head"""
+        try:
+            same_disk = os.stat(source_dir).st_dev == os.stat(output_dir).st_dev
+        except OSError:
+            return 1
+        
+        solid_state = self.is_rotational(source_dir) is False and self.is_rotational(output_dir) is False
+        if same_disk:
+            return 2 if solid_state else 1
+        return 4 if solid_state else 2
+    
+    def get_iso_workers(self, source_dir, output_dir, iso_count):
+        """Number of ISOs to extract at once"""
+        value = self.iso_workers.get()
+        if value.isdigit() and int(value) > 0:
+            workers = int(value)
+        else:
+            workers = self.default_iso_workers(source_dir, output_dir)
+        return max(1, min(workers, iso_count))
+    
     def process_isos(self, source_dir, output_dir):
-        """Process ISO files"""
-        iso_files = [f for f in os.listdir(source_dir) 
-                    if f.lower().endswith('.iso')]
+        """Process ISO files, several at once when the disks allow it"""
+        iso_files = self.in_plan_order(f for f in os.listdir(source_dir) 
+                                       if f.lower().endswith('.iso'))
         
         if not iso_files:
             self.log("No ISO files found")
             return False
         
-        self.log(f"Processing {len(iso_files)} ISO file(s)...")
+        total = len(iso_files)
+        workers = self.get_iso_workers(source_dir, output_dir, total)
+        self.log(f"Processing {total} ISO file(s) with {workers} parallel extraction(s)...")
+        
+        # ISOs that clean to the same game folder must not be extracted at the same time
+        groups = {}
+        for index, iso_file in enumerate(iso_files, 1):
+            base_name = self.clean_game_name(os.path.splitext(iso_file)[0])
+            groups.setdefault(base_name.lower(), []).append((index, iso_file))
         
-        processed = 0
         successful = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.process_iso_group, group, total, source_dir, output_dir)
+                       for group in groups.values()]
+            for future in as_completed(futures):
+                successful += future.result()
         
-        for iso_file in iso_files:
-            processed += 1
+        self.log(f"ISOs processed: {successful} of {total}")
+        return successful > 0
+    
+    def process_iso_group(self, group, total, source_dir, output_dir):
+        """Extract the ISOs of one game folder in order; returns how many succeeded"""
+        successful = 0
+        for index, iso_file in group:
+            tag = f"[{index}/{total}]"
+            iso_log = lambda message, tag=tag: self.log(f"{tag} {message}")
             iso_path = os.path.join(source_dir, iso_file)
             
-            self.log(f"[{processed}/{len(iso_files)}] {iso_file}")
-            
-            if self.process_single_iso(iso_path, output_dir):
+            iso_log(iso_file)
+            job = self.space_jobs.get(iso_file, SpaceJob(iso_file))
+            if not self.space.reserve(job.needs):
+                iso_log("✗ Not enough disk space left, skipping")
+                continue
+            self.tracker.start_job(tag, self.iso_data_size(iso_path))
+            ok = self.process_single_iso(iso_path, output_dir, iso_log,
+                                         lambda done, _total, tag=tag: self.tracker.update_job(tag, done))
+            elapsed, rate = self.tracker.finish_job(tag, ok)
+            removed = False
+            if ok and self.rebuild_mode() and \
+                    os.path.abspath(self.trimmed_iso_path(output_dir, iso_file)) == os.path.abspath(iso_path):
+                # Rebuilt in place: the trimmed image replaced the source
+                successful += 1
+                iso_log(f"✓ Processed successfully in {elapsed:.1f}s ({rate / 1048576:.1f} MB/s)")
+            elif ok:
                 successful += 1
-                self.log(f"[{processed}/{len(iso_files)}] ✓ Processed successfully")
+                iso_log(f"✓ Processed successfully in {elapsed:.1f}s ({rate / 1048576:.1f} MB/s)")
                 
-                # Remove ISO after successful processing
+                # Remove ISO only after successful processing
                 try:
                     os.remove(iso_path)
-                    self.log(f"[{processed}/{len(iso_files)}] ✓ ISO removed")
+                    removed = True
+                    iso_log("✓ ISO removed")
                 except Exception as e:
-                    self.log(f"[{processed}/{len(iso_files)}] ⚠ Could not remove ISO: {str(e)}")
+                    iso_log(f"⚠ Could not remove ISO: {str(e)}")
+            else:
+                iso_log("✗ Processing error")
+            self.space.release(job.needs, ok, job.frees if removed else None)
+        return successful
+    
+    def plan_batch(self, source_dir, output_dir):
+        """Estimate every job's disk needs, order the jobs and check the batch fits
+
+        Logs a report and returns False when it cannot fit even in the best order.
+        """
+        source_dev = device_of(source_dir)
+        output_dev = device_of(output_dir)
+        stream = self.stream_zip_isos.get()
+        jobs = []
+        
+        for name in sorted(os.listdir(source_dir)):
+            path = os.path.join(source_dir, name)
+            if name.lower().endswith('.zip'):
+                job = SpaceJob(name, frees={source_dev: os.path.getsize(path)})
+                try:
+                    with zipfile.ZipFile(path, 'r') as zip_ref:
+                        members = [i for i in zip_ref.infolist() if not i.is_dir()]
+                except (OSError, zipfile.BadZipFile):
+                    members = []  # Reported when it is extracted
+                for info in members:
+                    is_iso = info.filename.lower().endswith('.iso')
+                    already = is_iso and self.game_extracted(self.game_dir_for(output_dir, info.filename))
+                    if is_iso and stream:
+                        # The member size is an upper bound of the ISO's file data
+                        if not already:
+                            job.add("needs", output_dev, allocated(info.file_size))
+                        continue
+                    job.add("needs", source_dev, allocated(info.file_size))
+                    if is_iso and "/" not in info.filename.strip("/"):
+                        # Becomes an ISO job of its own once the ZIP is extracted
+                        iso_job = SpaceJob(os.path.basename(info.filename),
+                                           frees={source_dev: allocated(info.file_size)})
+                        if not already:
+                            iso_job.add("needs", output_dev, allocated(info.file_size))
+                        jobs.append(iso_job)
+                jobs.append(job)
+            elif name.lower().endswith('.iso'):
+                job = SpaceJob(name, frees={source_dev: os.path.getsize(path)})
+                if not self.game_extracted(self.game_dir_for(output_dir, name)):
+                    job.add("needs", output_dev, self.iso_space_needed(path))
+                jobs.append(job)
+        
+        # ISOs coming out of a ZIP can only start after it, so ZIPs are planned first
+        ordered = order_space_jobs([j for j in jobs if j.name.lower().endswith('.zip')]) + \
+            order_space_jobs([j for j in jobs if not j.name.lower().endswith('.zip')])
+        self.space_jobs = {j.name: j for j in ordered}
+        self.job_order = {j.name: i for i, j in enumerate(ordered)}
+        
+        free = {}
+        for dev, path in ((source_dev, source_dir), (output_dev, output_dir)):
+            free[dev] = max(0, shutil.disk_usage(path).free - SPACE_MARGIN)
+        self.space = SpacePlanner(free)
+        
+        needed = sum(sum(j.needs.values()) for j in ordered)
+        self.log(f"Space plan: {len(ordered)} job(s), {format_size(needed)} to write, "
+                 f"{' / '.join(format_size(f) for f in free.values())} available")
+        
+        problems = check_space_plan(ordered, free)
+        if not problems:
+            return True
+        
+        self.log("✗ NOT ENOUGH DISK SPACE - nothing was extracted")
+        report = []
+        for job, dev, missing in problems:
+            disk = output_dir if dev == output_dev else source_dir
+            line = f"{job.name}: needs {format_size(job.needs[dev])} on {disk}, {format_size(missing)} short"
+            report.append(line)
+            self.log(f"  - {line}")
+        self.log(f"  (a margin of {format_size(SPACE_MARGIN)} is kept free on each disk)")
+        self.root.after(0, lambda: messagebox.showerror(
+            "Not enough disk space",
+            "The batch does not fit on disk even when deleting each source as soon as it is verified:\n\n"
+            + "\n".join(report[:10]) + ("\n..." if len(report) > 10 else "")
+            + "\n\nFree some space or process fewer files."))
+        return False
+    
+    def in_plan_order(self, names):
+        """Sort file names by the space plan (unplanned names last, alphabetically)"""
+        return sorted(names, key=lambda n: (self.job_order.get(n, len(self.job_order)), n))
+    
+    def game_dir_for(self, output_dir, iso_name):
+        return os.path.join(output_dir, self.clean_game_name(os.path.splitext(os.path.basename(iso_name))[0]))
+    
+    def game_extracted(self, game_dir):
+        """Completed games are skipped, so they need no space"""
+        if self.rebuild_mode():
+            return os.path.isfile(game_dir + ".iso")
+        if os.path.isfile(os.path.join(game_dir, COMPLETION_MARKER)):
+            return True
+        return os.path.isdir(game_dir) and self.has_any_file(game_dir)
+    
+    def iso_space_needed(self, iso_path):
+        """Disk space the extracted game will take (file data rounded to blocks)"""
+        try:
+            with open(iso_path, "rb") as f:
+                return sum(allocated(e.size) for e in XDVDFSImage(f).entries() if not e.is_dir)
+        except Exception:
+            return allocated(os.path.getsize(iso_path))
+    
+    def iso_data_size(self, iso_path):
+        """Bytes of file data in the ISO (from its directory tables), or the ISO size"""
+        try:
+            with open(iso_path, "rb") as f:
+                return XDVDFSImage(f).data_size()
+        except Exception:
+            try:
+                return os.path.getsize(iso_path)
+            except OSError:
+                return 0
+    
+    def has_any_file(self, directory):
+        """True as soon as one file is found (stops at the first hit)"""
+        pending = [directory]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            return True
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except OSError:
+                continue
+        return False
+    
+    def scan_game_dir(self, game_dir, sample_size=10):
+        """File count, total size and the first file names in one scandir traversal"""
+        count = 0
+        total_size = 0
+        sample = []
+        pending = [game_dir]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name != COMPLETION_MARKER:
+                        count += 1
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                        if len(sample) < sample_size:
+                            sample.append(entry.name)
+        return count, total_size, sample
+    
+    def prepare_game_dir(self, game_dir, log):
+        """Return False when the game is already extracted, otherwise leave an empty game_dir"""
+        if os.path.isfile(os.path.join(game_dir, COMPLETION_MARKER)):
+            log(f"  - Game already processed, skipping")
+            return False
+        
+        # If already exists and has content, skip it (folders extracted before the marker existed)
+        if os.path.exists(game_dir):
+            if self.has_any_file(game_dir):
+                log(f"  - Game already processed, skipping")
+                return False
             else:
-                self.log(f"[{processed}/{len(iso_files)}] ✗ Processing error")
+                log(f"  - Directory exists but empty, re-processing")
+                shutil.rmtree(game_dir)
+        
+        # Create destination directory
+        os.makedirs(game_dir, exist_ok=True)
+        return True
+    
+    def verify_extracted_game(self, game_dir, log):
+        """Check the extracted folder, log its stats and mark it complete; removes it when empty"""
+        if not os.path.exists(game_dir):
+            log(f"  - ✗ Destination directory was not created")
+            return False
+        
+        content_count, total_size, files = self.scan_game_dir(game_dir)
+        
+        if content_count > 0:
+            size_mb = total_size / (1024 * 1024)
             
-            self.log("----------------------------------------")
+            if size_mb < 1024:
+                size_str = f"{size_mb:.1f}M"
+            else:
+                size_str = f"{size_mb/1024:.1f}G"
+            
+            log(f"  - Extraction completed: {content_count} files, Size: {size_str}")
+            
+            # Show some extracted files
+            log(f"  - Extracted files (first 10):")
+            for file in files:
+                log(f"    - {file}")
+            
+            try:
+                with open(os.path.join(game_dir, COMPLETION_MARKER), "w") as f:
+                    json.dump({"files": content_count, "size": total_size, "completed": time.time()}, f)
+            except OSError as e:
+                log(f"  - ⚠ Could not write completion marker: {str(e)}")
+            
+            if self.handoff:
+                self.publish_game(game_dir, log)
+            return True
+        else:
+            log(f"  - ✗ Extracted directory is empty")
+            shutil.rmtree(game_dir)
+            return False
+    
+    def rebuild_mode(self):
+        return self.output_format.get() == OUTPUT_TRIMMED_ISO
+    
+    def trimmed_iso_path(self, output_dir, iso_name):
+        return self.game_dir_for(output_dir, iso_name) + ".iso"
+    
+    def rebuild_single_iso(self, iso_path, out_path, log, progress=None):
+        """Write a trimmed XISO (game partition only, files contiguous) and verify it"""
+        try:
+            with open(iso_path, "rb") as f:
+                image = XDVDFSImage(f)
+                data_size = image.data_size()
+                file_count = sum(1 for e in image.entries() if not e.is_dir)
+                trimmed = image.partition_offset == 0 and os.path.getsize(iso_path) - data_size < TRIMMED_SLACK
+        except Exception as e:
+            log(f"  - ✗ Not a valid Xbox ISO: {str(e)}")
+            return False
         
-        self.log(f"ISOs processed: {successful} of {len(iso_files)}")
-        return successful > 0
+        same_file = os.path.abspath(out_path) == os.path.abspath(iso_path)
+        if same_file and trimmed:
+            log(f"  - ISO is already trimmed, skipping")
+            return True
+        if not same_file and os.path.exists(out_path):
+            log(f"  - Game already processed, skipping")
+            return True
+        
+        log(f"  - Rebuilding as trimmed XISO: {os.path.basename(out_path)}")
+        start = time.monotonic()
+        try:
+            written = rebuild_iso(iso_path, out_path, progress)
+        except Exception as e:
+            log(f"  - ✗ Error rebuilding ISO: {str(e)}")
+            return False
+        
+        elapsed = max(time.monotonic() - start, 0.001)
+        return self.verify_rebuilt_iso(out_path, file_count, data_size, log, written, elapsed)
     
-    def process_single_iso(self, iso_path, output_dir):
-        """Process a single ISO"""
+    def verify_rebuilt_iso(self, out_path, file_count, data_size, log, written, elapsed):
+        """Re-read the new image's directory tables and check nothing went missing"""
+        try:
+            with open(out_path, "rb") as f:
+                image = XDVDFSImage(f)
+                count = sum(1 for e in image.entries() if not e.is_dir)
+                size = image.data_size()
+        except Exception as e:
+            count, size = -1, -1
+            log(f"  - ✗ Rebuilt ISO cannot be read back: {str(e)}")
+        if (count, size) != (file_count, data_size):
+            log(f"  - ✗ Rebuilt ISO does not match the source, removing it")
+            os.remove(out_path)
+            return False
+        
+        log(f"  - ✓ Trimmed XISO written: {count} files, {format_size(written)} "
+            f"({data_size / (1024 * 1024) / elapsed:.1f} MB/s)")
+        if self.handoff:
+            self.publish_game(os.path.splitext(out_path)[0], log, iso_path=out_path)
+        return True
+    
+    def read_xex_ids(self, header, read_range):
+        if not analizar_cabecera_xex:
+            return None
+        try:
+            return analizar_cabecera_xex(header, read_range)
+        except Exception:
+            return None
+    
+    def publish_game(self, game_dir, log, iso_path=None):
+        """Report an extracted game to X360 TU Manager on stdout (one JSON line)
+
+        The IDs come from the default.xex header that was just written (or from inside
+        the trimmed ISO), so the main application does not need to scan it again.
+        """
+        if iso_path:
+            info = None
+            try:
+                with open(iso_path, "rb") as f:
+                    image = XDVDFSImage(f)
+                    xex = image.find("default.xex")
+                    if xex:
+                        info = self.read_xex_ids(image.read(xex, XEX_HEADER_READ_SIZE),
+                                                 lambda offset, length: image.read(xex, length, offset))
+            except Exception:
+                info = None
+            self.send_handoff({
+                "nombre": os.path.basename(game_dir),
+                "ruta": os.path.abspath(iso_path),
+                "xex": None,
+                "media_id": info["media_id"] if info else None,
+                "title_id": info["title_id"] if info else None,
+            }, log)
+            return
+        
+        xex_path = None
+        try:
+            with os.scandir(game_dir) as entries:
+                for entry in entries:
+                    if entry.name.lower() == "default.xex" and entry.is_file():
+                        xex_path = entry.path
+                        break
+        except OSError:
+            pass
+        if not xex_path:
+            return
+        
+        info = None
+        try:
+            with open(xex_path, "rb") as f:
+                header = f.read(XEX_HEADER_READ_SIZE) if analizar_cabecera_xex else b""
+                
+                def read_range(offset, length):
+                    f.seek(offset)
+                    return f.read(length)
+                
+                info = self.read_xex_ids(header, read_range)
+        except OSError:
+            info = None
+        
+        self.send_handoff({
+            "nombre": os.path.basename(game_dir),
+            "ruta": os.path.abspath(game_dir),
+            "xex": os.path.abspath(xex_path),
+            "media_id": info["media_id"] if info else None,
+            "title_id": info["title_id"] if info else None,
+        }, log)
+    
+    def send_handoff(self, game, log):
+        with self._handoff_lock:
+            try:
+                print(HANDOFF_PREFIX + json.dumps(game), flush=True)
+            except (OSError, ValueError):
+                # Main application closed the pipe; keep extracting
+                self.handoff = False
+                return
+        log(f"  - Sent to X360 TU Manager ({game['title_id'] or 'IDs pending'})")
+    
+    def process_single_iso(self, iso_path, output_dir, log=None, progress=None):
+        """Process a single ISO; progress(done_bytes, total_bytes) follows the extraction"""
+        log = log or self.log
         try:
             iso_file = os.path.basename(iso_path)
             original_name = os.path.splitext(iso_file)[0]
             base_name = self.clean_game_name(original_name)
             
-            self.log(f"  - Original name: {original_name}")
-            self.log(f"  - Clean name: {base_name}")
+            log(f"  - Original name: {original_name}")
+            log(f"  - Clean name: {base_name}")
             
             # Verify file exists and is not empty
             if not os.path.isfile(iso_path):
-                self.log(f"  - ✗ ISO file does not exist: {iso_path}")
+                log(f"  - ✗ ISO file does not exist: {iso_path}")
                 return False
             
             iso_size = os.path.getsize(iso_path)
             if iso_size < 1000000:  # Less than 1MB
-                self.log(f"  - ✗ ISO file appears to be empty or corrupted")
+                log(f"  - ✗ ISO file appears to be empty or corrupted")
                 return False
             
+            if self.rebuild_mode():
+                return self.rebuild_single_iso(iso_path, self.trimmed_iso_path(output_dir, iso_file), log, progress)
+            
             # Create game directory
             game_dir = os.path.join(output_dir, base_name)
+            if not self.prepare_game_dir(game_dir, log):
+                return True
             
-            # If already exists and has content, skip it
-            if os.path.exists(game_dir):
-                content_count = len([f for f in Path(game_dir).rglob('*') if f.is_file()])
-                if content_count > 0:
-                    self.log(f"  - Game already processed, skipping")
-                    return True
-                else:
-                    self.log(f"  - Directory exists but empty, re-processing")
-                    shutil.rmtree(game_dir)
-            
-            # Create destination directory
-            os.makedirs(game_dir, exist_ok=True)
+            if self.iso_engine.get() != ENGINE_EXTRACT_XISO:
+                return self.extract_iso_native(iso_path, game_dir, log, progress)
             
             # Extract ISO using extract-xiso
-            self.log(f"  - Extracting ISO with extract-xiso...")
+            log(f"  - Extracting ISO with extract-xiso...")
             
             # Get absolute paths
             iso_fullpath = os.path.abspath(iso_path)
@@ -407,53 +1234,74 @@ class X360CuratorGUI:
             
             cmd = [self.extract_xiso_path, '-x', iso_fullpath, '-d', game_fullpath]
             
-            self.log(f"    - Command: {' '.join(cmd)}")
+            log(f"    - Command: {' '.join(cmd)}")
             
-            # Execute extract-xiso
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Execute extract-xiso, following its per-file progress output
+            returncode, output = self.run_extract_xiso(cmd, progress)
             
-            if result.returncode == 0:
-                self.log(f"  - ✓ ISO extracted successfully with extract-xiso")
+            if returncode == 0:
+                log(f"  - ✓ ISO extracted successfully with extract-xiso")
                 
                 # Verify successful extraction
-                if os.path.exists(game_dir):
-                    content_count = len([f for f in Path(game_dir).rglob('*') if f.is_file()])
-                    
-                    if content_count > 0:
-                        # Calculate directory size
-                        total_size = sum(f.stat().st_size for f in Path(game_dir).rglob('*') if f.is_file())
-                        size_mb = total_size / (1024 * 1024)
-                        
-                        if size_mb < 1024:
-                            size_str = f"{size_mb:.1f}M"
-                        else:
-                            size_str = f"{size_mb/1024:.1f}G"
-                        
-                        self.log(f"  - Extraction completed: {content_count} files, Size: {size_str}")
-                        
-                        # Show some extracted files
-                        files = [f.name for f in Path(game_dir).rglob('*') if f.is_file()][:10]
-                        self.log(f"  - Extracted files (first 10):")
-                        for file in files:
-                            self.log(f"    - {file}")
-                        
-                        return True
-                    else:
-                        self.log(f"  - ✗ Extracted directory is empty")
-                        shutil.rmtree(game_dir)
-                        return False
-                else:
-                    self.log(f"  - ✗ Destination directory was not created")
-                    return False
+                return self.verify_extracted_game(game_dir, log)
             else:
-                self.log(f"  - ✗ Error executing extract-xiso: {result.stderr}")
+                log(f"  - ✗ Error executing extract-xiso: {output}")
                 if os.path.exists(game_dir):
                     shutil.rmtree(game_dir)
                 return False
                 
         except Exception as e:
-            self.log(f"  - ✗ Error processing ISO: {str(e)}")
+            log(f"  - ✗ Error processing ISO: {str(e)}")
+            return False
+    
+    def run_extract_xiso(self, cmd, progress=None):
+        """Run extract-xiso and turn its "(N bytes) [P%]" lines into byte progress
+
+        Returns (exit code, last lines of non-progress output).
+        """
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        completed = 0
+        current = (None, 0)  # (line prefix, bytes done in the file being extracted)
+        messages = []
+        pending = b""
+        while True:
+            chunk = process.stdout.read1(65536)
+            if not chunk:
+                break
+            # Progress is redrawn with \r, so split on both line endings
+            parts = re.split(rb"[\r\n]", pending + chunk)
+            pending = parts.pop()
+            for line in parts:
+                match = _XISO_PROGRESS.search(line)
+                if not match:
+                    if line.strip():
+                        messages = (messages + [line.decode(errors="replace").strip()])[-5:]
+                    continue
+                size, percent = int(match.group(1)), int(match.group(2))
+                key = line[:match.start(2)]
+                if current[0] is not None and key != current[0]:
+                    completed += current[1]
+                current = (key, size * min(percent, 100) // 100)
+                if progress:
+                    progress(completed + current[1], None)
+        return process.wait(), " | ".join(messages)
+    
+    def extract_iso_native(self, iso_path, game_dir, log, progress=None):
+        """Extract an ISO with the built-in XDVDFS engine (no subprocess)"""
+        log(f"  - Extracting ISO with native engine...")
+        start = time.monotonic()
+        try:
+            file_count, data_size = extract_iso(iso_path, game_dir, progress)
+        except Exception as e:
+            log(f"  - ✗ Error extracting ISO: {str(e)}")
+            if os.path.exists(game_dir):
+                shutil.rmtree(game_dir)
             return False
+        
+        elapsed = max(time.monotonic() - start, 0.001)
+        log(f"  - ✓ ISO extracted successfully ({file_count} files, "
+            f"{data_size / (1024 * 1024) / elapsed:.1f} MB/s)")
+        return self.verify_extracted_game(game_dir, log)
     
     def show_summary(self, output_dir, steps_completed):
         """Show final summary"""
@@ -462,7 +1310,8 @@ class X360CuratorGUI:
         # Count processed games
         if os.path.exists(output_dir):
             game_dirs = [d for d in os.listdir(output_dir) 
-                        if os.path.isdir(os.path.join(output_dir, d))]
+                        if os.path.isdir(os.path.join(output_dir, d))
+                        or (self.rebuild_mode() and d.lower().endswith('.iso'))]
             total_games = len(game_dirs)
         else:
             total_games = 0
@@ -496,7 +1345,7 @@ class X360CuratorGUI:
 
 def main():
     root = tk.Tk()
-    app = X360CuratorGUI(root)
+    app = X360CuratorGUI(root, handoff="--handoff" in sys.argv[1:])
     root.mainloop()
 
 if __name__ == "__main__":
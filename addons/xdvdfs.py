@@ -0,0 +1,541 @@
+"""
+XDVDFS (Xbox DVD filesystem) reader used by the X360 Extractor addon.
+
+Works on any seekable binary stream (a plain .iso file or a member opened from
+a ZIP archive). extract() reads directory tables and file data in one pass,
+lowest sector first; images built by extract-xiso store each table before the
+files it lists, so a compressed stream is decompressed once. Anything that reads
+all the tables up front (entries(), data_size(), rebuild_xiso) has to seek back
+for the file data, which restarts decompression of a deflated ZIP member.
+"""
+
+import argparse
+import fnmatch
+import heapq
+import itertools
+import os
+import struct
+import sys
+import time
+import zlib
+
+SECTOR_SIZE = 2048
+VOLUME_DESCRIPTOR_SECTOR = 32
+XDVDFS_MAGIC = b"MICROSOFT*XBOX*MEDIA"
+
+# Game partition offsets: plain XISO, XGD3, XGD2 and XGD1 (Redump) images, ascending
+GAME_PARTITION_OFFSETS = (0, 0x2080000, 0xFD90000, 0x18300000)
+
+ATTRIBUTE_DIRECTORY = 0x10
+ATTRIBUTE_NORMAL = 0x20
+# Multiple of the sector size, so every read after the first stays sector aligned
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+# Files needed to identify a game and show it in a dashboard
+MINIMAL_PATTERNS = ("default.xex", "media/*", "*.xex")
+
+# left/right subtree offsets (uint16, in dwords), start sector, size, attributes, name length
+_ENTRY = struct.Struct("<HHIIBB")
+
+
+class XDVDFSError(Exception):
+    """The stream is not a valid XDVDFS image"""
+
+
+class XDVDFSEntry:
+    """A file or directory inside the image"""
+
+    __slots__ = ("path", "sector", "size", "is_dir")
+
+    def __init__(self, path, sector, size, is_dir):
+        self.path = path
+        self.sector = sector
+        self.size = size
+        self.is_dir = is_dir
+
+    def __repr__(self):
+        kind = "dir" if self.is_dir else "file"
+        return f"XDVDFSEntry({self.path!r}, {kind}, sector={self.sector}, size={self.size})"
+
+
+class XDVDFSImage:
+    """Read-only view of an XDVDFS image on a seekable stream"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.partition_offset, self.root_sector, self.root_size = self._find_volume_descriptor()
+        self._entries = None
+
+    def _find_volume_descriptor(self):
+        for offset in GAME_PARTITION_OFFSETS:
+            try:
+                self.stream.seek(offset + VOLUME_DESCRIPTOR_SECTOR * SECTOR_SIZE)
+                header = self.stream.read(28)
+            except (OSError, ValueError, EOFError):
+                break
+            if len(header) < 28:
+                break
+            if header[:20] == XDVDFS_MAGIC:
+                root_sector, root_size = struct.unpack_from("<II", header, 20)
+                return offset, root_sector, root_size
+        raise XDVDFSError("XDVDFS volume descriptor not found")
+
+    def _offset(self, sector):
+        return self.partition_offset + sector * SECTOR_SIZE
+
+    def _parse_directory(self, data, parent):
+        """Yield the entries of one directory table (read linearly, padding skipped)"""
+        pos = 0
+        while pos + _ENTRY.size <= len(data):
+            left = struct.unpack_from("<H", data, pos)[0]
+            if left == 0xFFFF:
+                # Rest of this sector is padding
+                pos = (pos // SECTOR_SIZE + 1) * SECTOR_SIZE
+                continue
+            _left, _right, sector, size, attributes, name_length = _ENTRY.unpack_from(data, pos)
+            name_start = pos + _ENTRY.size
+            if not name_length or name_start + name_length > len(data):
+                break
+            name = data[name_start:name_start + name_length].decode("latin-1")
+            # Entries are aligned to 4 bytes
+            pos = (name_start + name_length + 3) & ~3
+            if name in (".", "..") or "/" in name or "\\" in name:
+                continue  # Never let a crafted image write outside the destination
+            yield XDVDFSEntry(f"{parent}/{name}" if parent else name, sector, size,
+                              bool(attributes & ATTRIBUTE_DIRECTORY))
+
+    def entries(self):
+        """All entries of the image; directory tables are read in ascending sector order
+
+        Tables are spread over the image, so on a deflated ZIP member this decompresses
+        most of it; extract() doesn't need it called first.
+        """
+        if self._entries is not None:
+            return self._entries
+
+        entries = []
+        pending = [(self.root_sector, self.root_size, "")]
+        while pending:
+            sector, size, parent = heapq.heappop(pending)
+            if not size:
+                continue
+            self.stream.seek(self._offset(sector))
+            data = self.stream.read(size)
+            for entry in self._parse_directory(data, parent):
+                entries.append(entry)
+                if entry.is_dir:
+                    heapq.heappush(pending, (entry.sector, entry.size, entry.path))
+
+        self._entries = entries
+        return entries
+
+    def data_size(self):
+        """Total bytes of file data in the image"""
+        return sum(e.size for e in self.entries() if not e.is_dir)
+
+    def read(self, entry, length, offset=0):
+        """Read part of a file (e.g. the default.xex header) without extracting it"""
+        length = max(0, min(length, entry.size - offset))
+        self.stream.seek(self._offset(entry.sector) + offset)
+        return self.stream.read(length)
+
+    def find(self, path):
+        """Entry for a path inside the image (case-insensitive), or None"""
+        path = path.strip("/").lower()
+        for entry in self.entries():
+            if entry.path.lower() == path:
+                return entry
+        return None
+
+    def _target(self, dest_dir, path):
+        return os.path.join(dest_dir, *path.split("/"))
+
+    def extract(self, dest_dir, progress=None, include=None):
+        """Extract files to dest_dir in a single pass in disk order
+
+        Directory tables and file extents are read together, lowest sector first, so
+        the stream only moves forward when every table comes before the files it
+        lists. If the tables were already read, only file data is read.
+
+        progress(done_bytes, total_bytes) is called as data is copied; until the last
+        table has been read, total only counts the files found so far. include is an
+        optional predicate on the image path ("media/foo.bin") to extract a subset.
+        Returns (file count, byte count).
+        """
+        def wanted(entry):
+            return include is None or include(entry.path)
+
+        # (sector, tie-breaker, size, path, entry): entry None is a directory table still to read
+        pending = []
+        order = itertools.count()
+        found = None
+        if self._entries is None:
+            found = []
+            pending.append((self.root_sector, next(order), self.root_size, "", None))
+        else:
+            for entry in self._entries:
+                if entry.is_dir and wanted(entry):
+                    os.makedirs(self._target(dest_dir, entry.path), exist_ok=True)
+                elif not entry.is_dir and wanted(entry):
+                    pending.append((entry.sector, next(order), entry.size, entry.path, entry))
+            heapq.heapify(pending)
+
+        total = sum(item[2] for item in pending if item[4] is not None)
+        done = 0
+        files = 0
+        if progress:
+            progress(0, total)
+
+        copy = self._copy_with_copy_file_range if self._can_copy_file_range() else self._copy_buffered
+        buffer = bytearray(COPY_BUFFER_SIZE)
+        while pending:
+            sector, _order, size, path, entry = heapq.heappop(pending)
+            if entry is None:
+                if not size:
+                    continue
+                self.stream.seek(self._offset(sector))
+                data = self.stream.read(size)
+                for child in self._parse_directory(data, path):
+                    found.append(child)
+                    if child.is_dir:
+                        if wanted(child):
+                            os.makedirs(self._target(dest_dir, child.path), exist_ok=True)
+                        heapq.heappush(pending, (child.sector, next(order), child.size, child.path, None))
+                    elif wanted(child):
+                        total += child.size
+                        heapq.heappush(pending, (child.sector, next(order), child.size, child.path, child))
+                continue
+
+            target = self._target(dest_dir, entry.path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as out:
+                # Empty files point at sector 0: don't seek back there for nothing
+                for copied in (copy(entry, out, buffer) if entry.size else ()):
+                    done += copied
+                    if progress:
+                        progress(done, total)
+            files += 1
+
+        if found is not None:
+            self._entries = found
+        return files, total
+
+    def _can_copy_file_range(self):
+        """Kernel-side copies need a real file descriptor (not a ZIP member) and Linux"""
+        if not hasattr(os, "copy_file_range"):
+            return False
+        try:
+            self.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            return False
+        return True
+
+    def _copy_with_copy_file_range(self, entry, out, _buffer):
+        src = self.stream.fileno()
+        dst = out.fileno()
+        offset = self._offset(entry.sector)
+        remaining = entry.size
+        while remaining:
+            try:
+                copied = os.copy_file_range(src, dst, min(COPY_BUFFER_SIZE, remaining), offset)
+            except OSError:
+                # e.g. EXDEV on older kernels or filesystems that refuse it
+                out.seek(entry.size - remaining)
+                yield from self._copy_buffered(entry, out, _buffer, entry.size - remaining)
+                return
+            if not copied:
+                raise XDVDFSError(f"Image truncated while reading {entry.path}")
+            offset += copied
+            remaining -= copied
+            yield copied
+
+    def _copy_buffered(self, entry, out, buffer, start=0):
+        view = memoryview(buffer)
+        self.stream.seek(self._offset(entry.sector) + start)
+        remaining = entry.size - start
+        while remaining:
+            length = min(len(buffer), remaining)
+            if hasattr(self.stream, "readinto"):
+                read = self.stream.readinto(view[:length])
+            else:
+                chunk = self.stream.read(length)
+                read = len(chunk)
+                view[:read] = chunk
+            if not read:
+                raise XDVDFSError(f"Image truncated while reading {entry.path}")
+            out.write(view[:read])
+            remaining -= read
+            yield read
+
+
+def _sectors(size):
+    return -(-size // SECTOR_SIZE)
+
+
+def _sort_key(name):
+    # The console compares names case-insensitively, byte by byte
+    return name.upper().encode("latin-1")
+
+
+def _build_directory_table(children, locations):
+    """Serialize one directory as a balanced binary tree of entries
+
+    children: list of (name, path, is_dir, size); locations: path -> (sector, size).
+    Entries never cross a sector boundary; unused bytes are 0xFF.
+    """
+    ordered = sorted(children, key=lambda c: _sort_key(c[0]))
+
+    # Pre-order of a balanced tree over the sorted names: root first, as the format requires
+    layout = []
+
+    def visit(low, high):
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        node = {"child": ordered[middle]}
+        layout.append(node)
+        node["left"] = visit(low, middle - 1)
+        node["right"] = visit(middle + 1, high)
+        return node
+
+    visit(0, len(ordered) - 1)
+
+    # Assign offsets, moving entries that would straddle a sector to the next one
+    position = 0
+    for node in layout:
+        length = _ENTRY.size + len(node["child"][0].encode("latin-1"))
+        if position // SECTOR_SIZE != (position + length - 1) // SECTOR_SIZE:
+            position = _sectors(position) * SECTOR_SIZE
+        node["offset"] = position
+        position = (position + length + 3) & ~3
+
+    table = bytearray(b"\xff" * (_sectors(position) * SECTOR_SIZE))
+    for node in layout:
+        name, path, is_dir, _size = node["child"]
+        sector, size = locations[path]
+        encoded = name.encode("latin-1")
+        left = node["left"]["offset"] // 4 if node["left"] else 0
+        right = node["right"]["offset"] // 4 if node["right"] else 0
+        attributes = ATTRIBUTE_DIRECTORY if is_dir else ATTRIBUTE_NORMAL
+        _ENTRY.pack_into(table, node["offset"], left, right, sector, size, attributes, len(encoded))
+        start = node["offset"] + _ENTRY.size
+        table[start:start + len(encoded)] = encoded
+        # Alignment bytes inside an entry are zero
+        end = (start + len(encoded) + 3) & ~3
+        table[start + len(encoded):end] = b"\x00" * (end - start - len(encoded))
+    return bytes(table)
+
+
+def _table_size(children):
+    return len(_build_directory_table(children, {c[1]: (0, 0) for c in children}))
+
+
+def rebuild_xiso(image, out, progress=None):
+    """Write a trimmed XISO of image to the binary stream out
+
+    Only the game partition is kept (no video partition or padding). Directory
+    tables come right after the volume descriptor and the files follow
+    contiguously, in the order they had on the source. The tables must all be read
+    before anything is written, so the file data is read in a second pass; from a
+    deflated ZIP member that decompresses the image up to its last table twice.
+    Returns the number of bytes written.
+    """
+    entries = image.entries()
+    children = {"": []}
+    for entry in entries:
+        parent, _, name = entry.path.rpartition("/")
+        children.setdefault(parent, []).append((name, entry.path, entry.is_dir, entry.size))
+        if entry.is_dir:
+            children.setdefault(entry.path, [])
+
+    # Directory tables, breadth first from the root
+    locations = {}
+    next_sector = VOLUME_DESCRIPTOR_SECTOR + 1
+    directories = [""]
+    for directory in directories:
+        size = _table_size(children[directory]) if children[directory] else 0
+        locations[directory] = (next_sector if size else 0, size)
+        next_sector += _sectors(size)
+        directories.extend(c[1] for c in sorted(children[directory]) if c[2])
+
+    # File data
+    files = sorted((e for e in entries if not e.is_dir), key=lambda e: e.sector)
+    for entry in files:
+        locations[entry.path] = (next_sector if entry.size else 0, entry.size)
+        next_sector += _sectors(entry.size)
+
+    descriptor = bytearray(SECTOR_SIZE)
+    root_sector, root_size = locations[""]
+    descriptor[:20] = XDVDFS_MAGIC
+    struct.pack_into("<II", descriptor, 20, root_sector, root_size)
+    descriptor[SECTOR_SIZE - 20:] = XDVDFS_MAGIC
+    out.write(bytes(VOLUME_DESCRIPTOR_SECTOR * SECTOR_SIZE))
+    out.write(descriptor)
+
+    for directory in directories:
+        if children[directory]:
+            out.write(_build_directory_table(children[directory], locations))
+
+    total = sum(e.size for e in files)
+    done = 0
+    if progress:
+        progress(0, total)
+    for entry in files:
+        remaining = entry.size
+        image.stream.seek(image._offset(entry.sector))
+        while remaining:
+            chunk = image.stream.read(min(COPY_BUFFER_SIZE, remaining))
+            if not chunk:
+                raise XDVDFSError(f"Image truncated while reading {entry.path}")
+            out.write(chunk)
+            remaining -= len(chunk)
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+        padding = -entry.size % SECTOR_SIZE
+        if padding:
+            out.write(bytes(padding))
+
+    return next_sector * SECTOR_SIZE
+
+
+def rebuild_iso(iso_path, out_path, progress=None):
+    """Rebuild an ISO file as a trimmed XISO (written to a .part file, then renamed)"""
+    part = out_path + ".part"
+    try:
+        with open(iso_path, "rb") as src, open(part, "wb") as out:
+            written = rebuild_xiso(XDVDFSImage(src), out, progress)
+        os.replace(part, out_path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    return written
+
+
+class CRC32Reader:
+    """Seekable wrapper that runs every byte of a stream through CRC-32 exactly once
+
+    Forward seeks read through the bytes they skip instead of jumping over them, and
+    bytes read again after a backward seek are not counted twice, so the checksum
+    covers the whole stream in whatever order the image is read. zipfile's own check
+    can't be relied on here: it is skipped when a stored member is seeked (Python 3.12+).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.crc = 0
+        self._position = 0
+        self._checked = 0  # Bytes [0, _checked) are in self.crc
+
+    @property
+    def consumed(self):
+        """Bytes of the stream checked so far (a progress measure for the whole stream)"""
+        return self._checked
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence != os.SEEK_SET:
+            raise OSError("CRC32Reader only seeks from the start or the current position")
+        if offset > self._checked:
+            self._read_through(offset)
+        else:
+            self.stream.seek(offset)
+        self._position = offset
+        return offset
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self._count(data)
+        return data
+
+    def readinto(self, buffer):
+        read = self.stream.readinto(buffer)
+        if read:
+            self._count(memoryview(buffer)[:read])
+        return read
+
+    def finish(self):
+        """Read whatever is left and return the CRC-32 of the whole stream"""
+        self.seek(max(self._position, self._checked))
+        while self.read(COPY_BUFFER_SIZE):
+            pass
+        return self.crc
+
+    def _read_through(self, offset):
+        if self._position != self._checked:
+            self.stream.seek(self._checked)
+        while self._checked < offset:
+            data = self.stream.read(min(COPY_BUFFER_SIZE, offset - self._checked))
+            if not data:
+                break
+            self.crc = zlib.crc32(data, self.crc)
+            self._checked += len(data)
+
+    def _count(self, data):
+        start = self._position
+        self._position += len(data)
+        if start <= self._checked < self._position:
+            self.crc = zlib.crc32(data[self._checked - start:], self.crc)
+            self._checked = self._position
+
+
+
+def pattern_filter(patterns):
+    """Predicate matching image paths against case-insensitive glob patterns"""
+    patterns = [p.lower() for p in patterns]
+
+    def include(path):
+        path = path.lower()
+        return any(fnmatch.fnmatchcase(path, p) for p in patterns)
+    return include
+
+
+def extract_iso(iso_path, dest_dir, progress=None, include=None):
+    """Extract an ISO file with the native engine; returns (file count, byte count)"""
+    with open(iso_path, "rb") as f:
+        return XDVDFSImage(f).extract(dest_dir, progress, include)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Native XDVDFS (Xbox 360 ISO) extractor")
+    parser.add_argument("iso")
+    parser.add_argument("dest", nargs="?")
+    parser.add_argument("-l", "--list", action="store_true", help="list files instead of extracting")
+    parser.add_argument("-p", "--pattern", action="append",
+                        help="only extract paths matching this glob (repeatable)")
+    parser.add_argument("-m", "--minimal", action="store_true",
+                        help="only extract " + ", ".join(MINIMAL_PATTERNS))
+    parser.add_argument("-r", "--rebuild", action="store_true",
+                        help="write a trimmed XISO to dest instead of extracting")
+    args = parser.parse_args()
+
+    if args.list:
+        with open(args.iso, "rb") as f:
+            for entry in XDVDFSImage(f).entries():
+                print(f"{entry.path}{'/' if entry.is_dir else ''}\t{entry.size}")
+        return 0
+    if not args.dest:
+        parser.error("dest is required when extracting")
+
+    if args.rebuild:
+        start = time.monotonic()
+        written = rebuild_iso(args.iso, args.dest)
+        print(f"{os.path.getsize(args.iso) / (1024 * 1024):.1f} MB -> {written / (1024 * 1024):.1f} MB "
+              f"in {time.monotonic() - start:.2f}s")
+        return 0
+
+    patterns = list(args.pattern or []) + (list(MINIMAL_PATTERNS) if args.minimal else [])
+    start = time.monotonic()
+    files, size = extract_iso(args.iso, args.dest, include=pattern_filter(patterns) if patterns else None)
+    elapsed = max(time.monotonic() - start, 1e-6)
+    print(f"{files} files, {size / (1024 * 1024):.1f} MB in {elapsed:.2f}s "
+          f"({size / (1024 * 1024) / elapsed:.1f} MB/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
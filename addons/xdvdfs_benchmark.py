@@ -0,0 +1,161 @@
+"""
+Benchmark the native XDVDFS engine against extract-xiso.
+
+Generates a synthetic game tree (default.xex, media/ and a spread of data files),
+packs it into an XISO with `extract-xiso -c`, then extracts that image with both
+engines several times and checks the two output trees are identical:
+
+    python addons/xdvdfs_benchmark.py --size-mb 800 --files 400
+
+The generated image can be kept (--keep) and passed back with --iso to compare
+against a real game image instead.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from xdvdfs import extract_iso
+
+DEFAULT_SIZE_MB = 800
+DEFAULT_FILES = 400
+DEFAULT_DIRECTORIES = 20
+DEFAULT_RUNS = 3
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_EXTRACT_XISO = os.path.join(
+    ADDON_DIR, "isoextract", "extract-xiso.exe" if os.name == "nt" else "extract-xiso")
+
+
+def make_game_tree(dest, size_mb, files, directories, seed=0):
+    """Write a game-like folder: default.xex, media/ and data files of mixed sizes
+
+    A few large files hold most of the bytes, like real games. Returns the byte count.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(dest, "media"), exist_ok=True)
+    paths = [os.path.join(dest, "default.xex")]
+    paths += [os.path.join(dest, "media", f"media{i:03}.xmv") for i in range(max(1, files // 20))]
+    while len(paths) < files:
+        folder = os.path.join(dest, f"data{rng.randrange(directories):02}")
+        paths.append(os.path.join(folder, f"file{len(paths):04}.bin"))
+
+    weights = [rng.paretovariate(1.2) for _ in paths]
+    scale = size_mb * 1024 * 1024 / sum(weights)
+    written = 0
+    for path, weight in zip(paths, weights):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = max(1, int(weight * scale))
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining:
+                chunk = min(remaining, 1024 * 1024)
+                f.write(rng.randbytes(chunk))
+                remaining -= chunk
+        written += size
+    return written
+
+
+def build_iso(extract_xiso, tree, iso_path):
+    """Pack a folder into an XISO with extract-xiso -c"""
+    subprocess.run([extract_xiso, "-c", tree, iso_path], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def tree_digest(root):
+    """{relative path: sha1} of every file under root"""
+    digests = {}
+    for folder, _dirs, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            h = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            digests[os.path.relpath(path, root).replace(os.sep, "/")] = h.hexdigest()
+    return digests
+
+
+def time_extract_xiso(extract_xiso, iso_path, dest):
+    start = time.perf_counter()
+    subprocess.run([extract_xiso, "-x", iso_path, "-d", dest], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def time_native(iso_path, dest):
+    start = time.perf_counter()
+    extract_iso(iso_path, dest)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare native XDVDFS extraction with extract-xiso")
+    parser.add_argument("--iso", help="benchmark this image instead of generating one")
+    parser.add_argument("--size-mb", type=int, default=DEFAULT_SIZE_MB, help="size of the generated game")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="files in the generated game")
+    parser.add_argument("--dirs", type=int, default=DEFAULT_DIRECTORIES, help="data folders in the generated game")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="extractions per engine")
+    parser.add_argument("--extract-xiso", default=BUNDLED_EXTRACT_XISO, help="extract-xiso binary to compare with")
+    parser.add_argument("--work-dir", help="where to write the image and outputs (default: a temp folder)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated image")
+    args = parser.parse_args()
+
+    if not (os.path.isfile(args.extract_xiso) and os.access(args.extract_xiso, os.X_OK)):
+        print(f"extract-xiso not found or not executable: {args.extract_xiso}")
+        return 2
+
+    work = args.work_dir or tempfile.mkdtemp(prefix="xdvdfs-bench-")
+    os.makedirs(work, exist_ok=True)
+    try:
+        iso_path = args.iso
+        if not iso_path:
+            tree = os.path.join(work, "game")
+            iso_path = os.path.join(work, "bench.iso")
+            start = time.perf_counter()
+            size = make_game_tree(tree, args.size_mb, args.files, args.dirs)
+            build_iso(args.extract_xiso, tree, iso_path)
+            shutil.rmtree(tree)
+            print(f"Generated {iso_path}: {args.files} files, {size / (1024 * 1024):.0f} MB "
+                  f"({time.perf_counter() - start:.1f}s)")
+
+        engines = {
+            "extract-xiso": lambda dest: time_extract_xiso(args.extract_xiso, iso_path, dest),
+            "native": lambda dest: time_native(iso_path, dest),
+        }
+        times = {name: [] for name in engines}
+        digests = {}
+        for run in range(args.runs):
+            # Alternate the order so neither engine always gets the warmer cache
+            for name in (engines if run % 2 == 0 else reversed(list(engines))):
+                dest = os.path.join(work, f"out-{name}")
+                shutil.rmtree(dest, ignore_errors=True)
+                times[name].append(engines[name](dest))
+                if run == 0:
+                    digests[name] = tree_digest(dest)
+                shutil.rmtree(dest, ignore_errors=True)
+
+        for name, samples in times.items():
+            print(f"{name:<13} median {statistics.median(samples):.2f}s  "
+                  f"({' / '.join(f'{s:.2f}' for s in samples)})")
+        if digests["native"] != digests["extract-xiso"]:
+            print("Output trees differ between the two engines")
+            return 1
+        print(f"Output trees identical ({len(digests['native'])} files)")
+        return 0
+    finally:
+        if args.keep and not args.iso:
+            print(f"Image kept in {work}")
+        elif not args.work_dir:
+            shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import tempfile
+
+# Title databases kept by console dashboards, tried in order. Aurora keeps its library in
+# Data/DataBases/content.db; FreeStyle Dash 3 names its database fsd2data.db.
+DASHBOARD_DB_PATHS = (
+    "/Hdd1/Aurora/Data/DataBases/content.db",
+    "/Usb0/Aurora/Data/DataBases/content.db",
+    "/Hdd1/Freestyle Dash/Data/Databases/fsd2data.db",
+)
+
+# Table/column candidates (matched case-insensitively)
+_TABLAS = ("contentitems", "content", "titles", "games")
+_COLUMNAS_TITLE_ID = ("titleid", "title_id")
+_COLUMNAS_MEDIA_ID = ("mediaid", "media_id")
+_COLUMNAS_NOMBRE = ("titlename", "title_name", "name", "displayname")
+_COLUMNAS_DIRECTORIO = ("directory", "path", "location")
+
+
+def _formatear_id(valor):
+    """IDs are stored as (possibly signed) integers or hex strings"""
+    if valor in (None, "", 0):
+        return None
+    if isinstance(valor, int):
+        return f"{valor & 0xFFFFFFFF:08X}" if valor else None
+    texto = str(valor).strip()
+    if texto.lower().startswith("0x"):
+        texto = texto[2:]
+    try:
+        numero = int(texto, 16)
+    except ValueError:
+        return None
+    return f"{numero:08X}" if numero else None
+
+
+def _primera_columna(columnas, candidatas):
+    for candidata in candidatas:
+        if candidata in columnas:
+            return columnas[candidata]
+    return None
+
+
+def leer_base_contenido(ruta_db):
+    """Read the games from a dashboard content database
+
+    Returns a list of {"nombre", "media_id", "title_id"} dicts (one per TitleID/MediaID pair),
+    or None when the file has no recognizable content table.
+    """
+    conn = sqlite3.connect(f"file:{ruta_db}?mode=ro", uri=True)
+    try:
+        tablas = {fila[0].lower(): fila[0] for fila in
+                  conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for candidata in _TABLAS:
+            if candidata not in tablas:
+                continue
+            tabla = tablas[candidata]
+            columnas = {fila[1].lower(): fila[1] for fila in conn.execute(f'PRAGMA table_info("{tabla}")')}
+            col_title = _primera_columna(columnas, _COLUMNAS_TITLE_ID)
+            if not col_title:
+                continue
+            col_media = _primera_columna(columnas, _COLUMNAS_MEDIA_ID)
+            col_nombre = _primera_columna(columnas, _COLUMNAS_NOMBRE)
+            col_dir = _primera_columna(columnas, _COLUMNAS_DIRECTORIO)
+
+            seleccion = ", ".join(f'"{c}"' if c else "NULL" for c in (col_title, col_media, col_nombre, col_dir))
+            juegos = []
+            vistos = set()
+            for title_id, media_id, nombre, directorio in conn.execute(f'SELECT {seleccion} FROM "{tabla}"'):
+                title_id, media_id = _formatear_id(title_id), _formatear_id(media_id)
+                if not title_id and not media_id:
+                    continue
+                if (title_id, media_id) in vistos:
+                    continue
+                vistos.add((title_id, media_id))
+                if not nombre and directorio:
+                    nombre = str(directorio).replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
+                juegos.append({"nombre": nombre or title_id or media_id,
+                               "media_id": media_id, "title_id": title_id})
+            juegos.sort(key=lambda j: j["nombre"].lower())
+            return juegos
+        return None
+    finally:
+        conn.close()
+
+
+def descargar_base_contenido(ftp, log=print):
+    """Download the first dashboard database found on the console to a temporary file
+
+    Returns (local_path, remote_path) or (None, None). The caller removes the file.
+    """
+    for ruta_remota in DASHBOARD_DB_PATHS:
+        try:
+            ftp.voidcmd("TYPE I")
+            tamano = ftp.size(ruta_remota)
+        except Exception:
+            continue
+        if not tamano:
+            continue
+
+        descriptor, ruta_local = tempfile.mkstemp(prefix="x360tum-", suffix=".db")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                ftp.retrbinary(f"RETR {ruta_remota}", f.write, blocksize=256 * 1024)
+        except Exception as e:
+            log(f"  ERROR: Could not download {ruta_remota}: {e}")
+            os.remove(ruta_local)
+            continue
+        log(f"Downloaded dashboard database {ruta_remota} ({tamano / 1024:.0f} KB)")
+        return ruta_local, ruta_remota
+    return None, None
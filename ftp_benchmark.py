@@ -0,0 +1,137 @@
+"""FTP upload benchmark for X360 TU Manager
+
+Uploads a synthetic set of TUs to a local pyftpdlib server that stands in for the
+console's FTP plugin, once over a single connection and once over the connection
+pool, and reports wall time and throughput. Console FTP servers are slow to answer
+commands over Wi-Fi, so every command can be delayed to imitate that:
+
+    pip install pyftpdlib
+    python ftp_benchmark.py --latency 20
+
+A second, incremental pass measures how long it takes to find out that nothing
+needs uploading.
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+
+from ftp_uploader import FTPUploadEngine, UploadJournal, DEFAULT_CONNECTIONS, formatear_velocidad
+import ftp_uploader
+
+DEFAULT_FILES = 19
+DEFAULT_DIRECTORIES = 6
+DEFAULT_FILE_KB = 512
+DEFAULT_LATENCY_MS = 20
+DEFAULT_PORT = 2121
+
+USUARIO = CLAVE = "xbox"
+
+
+def iniciar_servidor(raiz, puerto, latencia):
+    """Start a threaded pyftpdlib server on localhost, adding `latencia` seconds to every command"""
+    try:
+        from pyftpdlib.authorizers import DummyAuthorizer
+        from pyftpdlib.handlers import FTPHandler
+        from pyftpdlib.servers import ThreadedFTPServer
+    except ImportError:
+        print("[ERROR] pyftpdlib is required for this benchmark: pip install pyftpdlib")
+        sys.exit(2)
+    # Without a handler of its own pyftpdlib would log every command to the terminal
+    logging.getLogger("pyftpdlib").addHandler(logging.NullHandler())
+    logging.getLogger("pyftpdlib").propagate = False
+
+    autorizador = DummyAuthorizer()
+    autorizador.add_user(USUARIO, CLAVE, raiz, perm="elradfmwMT")
+
+    class ManejadorLento(FTPHandler):
+        def process_command(self, cmd, *args, **kwargs):
+            if latencia:
+                time.sleep(latencia)
+            return super().process_command(cmd, *args, **kwargs)
+
+    ManejadorLento.authorizer = autorizador
+    servidor = ThreadedFTPServer(("127.0.0.1", puerto), ManejadorLento)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def crear_tus(carpeta, archivos, directorios, tamano_kb):
+    """Write `archivos` random files spread over `directorios` fake TitleIDs; returns upload jobs"""
+    trabajos = []
+    for i in range(archivos):
+        title_id = f"4D53{i % directorios:04X}"
+        ruta = os.path.join(carpeta, f"tu{i:08X}_00000000")
+        with open(ruta, "wb") as f:
+            f.write(os.urandom(tamano_kb * 1024))
+        trabajos.append((ruta, f"/Hdd1/Content/0000000000000000/{title_id}/000B0000"))
+    return trabajos
+
+
+def medir(trabajos, conexiones, ruta_diario, incremental=False):
+    """Run one upload and return (seconds, summary)
+
+    The upload journal lives in the benchmark's temp folder, not the user's home.
+    """
+    engine = FTPUploadEngine("127.0.0.1", USUARIO, CLAVE, conexiones=conexiones, log=lambda mensaje: None,
+                             diario=UploadJournal(ruta_diario))
+    inicio = time.perf_counter()
+    resumen = engine.subir(trabajos, incremental=incremental)
+    return time.perf_counter() - inicio, resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FTP upload time against a local stand-in server")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="number of TU files")
+    parser.add_argument("--dirs", type=int, default=DEFAULT_DIRECTORIES, help="number of TitleID folders")
+    parser.add_argument("--size-kb", type=int, default=DEFAULT_FILE_KB, help="size of each file")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY_MS, help="ms added to every FTP command")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help="pool size to compare")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="local port for the stand-in server")
+    args = parser.parse_args()
+
+    ftp_uploader.FTP_PORT = args.port
+    with tempfile.TemporaryDirectory(prefix="x360tum-ftp-") as temporal:
+        local = os.path.join(temporal, "local")
+        os.makedirs(local)
+        trabajos = crear_tus(local, args.files, args.dirs, args.size_kb)
+        total = sum(os.path.getsize(ruta) for ruta, _ in trabajos)
+        print(f"{args.files} file(s) in {args.dirs} folder(s), {total / (1024 * 1024):.1f} MB, "
+              f"{args.latency:.0f} ms per command")
+
+        remoto = os.path.join(temporal, "remote")
+        os.makedirs(remoto)
+        servidor = iniciar_servidor(remoto, args.port, args.latency / 1000)
+        diario = os.path.join(temporal, "uploads.json")
+        resultados = {}
+        try:
+            for conexiones in sorted({1, args.connections}):
+                # Every run starts from an empty console
+                shutil.rmtree(remoto)
+                os.makedirs(remoto)
+                segundos, resumen = medir(trabajos, conexiones, diario)
+                if resumen["errores"]:
+                    print(f"[ERROR] {len(resumen['errores'])} file(s) failed with {conexiones} connection(s)")
+                    return 1
+                resultados[conexiones] = segundos
+                print(f"  {conexiones} connection(s): {segundos:.2f} s "
+                      f"({formatear_velocidad(resumen['bytes'], segundos)})")
+
+                segundos, resumen = medir(trabajos, conexiones, diario, incremental=True)
+                print(f"    incremental pass: {segundos:.2f} s, "
+                      f"{len(resumen['omitidos'])} file(s) already on the server")
+        finally:
+            servidor.close_all()
+
+        if len(resultados) > 1:
+            print(f"Speed-up with {args.connections} connections: "
+                  f"{resultados[1] / resultados[args.connections]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
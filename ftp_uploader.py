@@ -0,0 +1,685 @@
+import hashlib
+import json
+import os
+import queue
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from ftplib import FTP, all_errors, error_perm, error_temp
+
+FTP_PORT = 21
+# Aurora/FSD servers handle a few concurrent sessions well; more mostly adds contention
+DEFAULT_CONNECTIONS = 3
+
+# Buffered fallback block size (ftplib's storbinary default is 8 KB)
+DEFAULT_BLOCK_SIZE = 256 * 1024
+# sendfile() is issued in slices of this size so progress keeps updating
+SENDFILE_SLICE = 4 * 1024 * 1024
+
+# Streaming uploads: chunks held between the HTTP download and the FTP data connection
+STREAM_BUFFER_CHUNKS = 64
+
+# Reconnection after a dropped link (Wi-Fi to the console): 1s, 2s, 4s... capped
+MAX_REINTENTOS = 5
+BACKOFF_INICIAL = 1.0
+BACKOFF_MAXIMO = 30.0
+
+# Uploads in flight, so only files this engine started are resumed after a drop or a crash
+UPLOAD_JOURNAL_FILE = os.path.expanduser("~/.x360-tu-manager-uploads.json")
+
+# How long to wait for the reply to a failed transfer before giving up on the session
+RESYNC_TIMEOUT = 5
+
+# Unix-style LIST line: perms links owner group size month day time/year name
+_LIST_UNIX = re.compile(r"^([\-dl])\S*\s+\d+\s+\S+\s+\S+\s+(\d+)\s+\S+\s+\S+\s+\S+\s+(.+)$")
+
+
+def formatear_velocidad(num_bytes, segundos):
+    if segundos <= 0:
+        return "n/a"
+    mb_s = num_bytes / segundos / (1024 * 1024)
+    return f"{mb_s:.2f} MB/s"
+
+
+def _es_archivo_regular(f):
+    try:
+        return stat.S_ISREG(os.fstat(f.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _tamano_local(ruta):
+    """Size of a local file, or None if it can't be read (the upload reports the error)"""
+    try:
+        return os.path.getsize(ruta)
+    except OSError:
+        return None
+
+
+def resincronizar(ftp):
+    """Drain pending replies after an aborted transfer until a NOOP is answered
+
+    If the NOOP reply doesn't show up, the session is closed and ConnectionError is
+    raised, so callers reconnect instead of reading stale replies.
+    """
+    ftp.putcmd("NOOP")
+    for _ in range(4):
+        try:
+            if ftp.getresp().startswith("200"):
+                return
+        except (error_temp, error_perm):
+            continue  # 426/451 from the aborted transfer
+    ftp.close()
+    raise ConnectionError("FTP control connection out of sync")
+
+
+def listar_directorio(ftp, ruta):
+    """List a remote directory as ({name: size, or None for directories/unknown}, exists)
+
+    Uses MLSD, falling back to parsing LIST. A missing directory (550) lists as empty.
+    Some servers answer LIST on a missing path with an empty listing, so an empty LIST
+    only counts as an existing directory if it can be entered with CWD.
+    """
+    entradas, existe = None, False
+    try:
+        entradas = {}
+        for nombre, hechos in ftp.mlsd(ruta, facts=["type", "size"]):
+            if nombre in (".", ".."):
+                continue
+            tamano = hechos.get("size")
+            entradas[nombre] = int(tamano) if tamano and hechos.get("type") == "file" else None
+        existe = True
+    except error_perm as e:
+        entradas = {} if str(e).startswith("550") else None
+
+    if entradas is None:
+        # MLSD not supported: parse LIST, keeping names of lines we can't parse
+        entradas = {}
+        try:
+            lineas = []
+            ftp.retrlines(f"LIST {ruta}", lineas.append)
+            for linea in lineas:
+                coincidencia = _LIST_UNIX.match(linea)
+                if coincidencia:
+                    tipo, tamano, nombre = coincidencia.groups()
+                    entradas[nombre] = int(tamano) if tipo == "-" else None
+                elif linea.strip():
+                    entradas[linea.split()[-1]] = None
+            existe = bool(entradas) or _directorio_accesible(ftp, ruta)
+        except error_perm:
+            pass  # Some servers answer 550 for empty directories
+    return entradas, existe
+
+
+def listar_recursivo(ftp, ruta):
+    """List a remote tree with a single LIST -R as {directory: {name: size or None}}
+
+    Directories are keyed by absolute path. Returns None when the server has no
+    recursive listing (it refuses -R or answers with the top level only).
+    """
+    lineas = []
+    try:
+        ftp.retrlines(f"LIST -R {ruta}", lineas.append)
+    except error_perm:
+        return None
+
+    raiz = ruta.rstrip("/") or "/"
+    arbol, actual, recursivo = {}, raiz, False
+    for linea in lineas:
+        if not linea.strip():
+            continue
+        coincidencia = _LIST_UNIX.match(linea)
+        if not coincidencia and linea.endswith(":"):
+            # "path:" opens the listing of the next directory, relative or absolute
+            cabecera = linea[:-1].strip()
+            if cabecera in (".", raiz):
+                actual = raiz
+            elif cabecera.startswith("/"):
+                actual = cabecera.rstrip("/")
+            else:
+                actual = f"{raiz.rstrip('/')}/{cabecera[2:] if cabecera.startswith('./') else cabecera}"
+            arbol.setdefault(actual, {})
+            recursivo = True
+            continue
+        entradas = arbol.setdefault(actual, {})
+        if coincidencia:
+            tipo, tamano, nombre = coincidencia.groups()
+            if nombre not in (".", ".."):
+                entradas[nombre] = int(tamano) if tipo == "-" else None
+        else:
+            entradas[linea.split()[-1]] = None
+    return arbol if recursivo else None
+
+
+def _directorio_accesible(ftp, ruta):
+    """CWD into `ruta` and back to the previous directory; False if the server refuses it"""
+    try:
+        anterior = ftp.pwd()
+    except all_errors:
+        anterior = None
+    try:
+        ftp.cwd(ruta)
+    except error_perm:
+        return False
+    if anterior:
+        ftp.cwd(anterior)
+    return True
+
+
+class UploadJournal:
+    """Uploads started but not finished, keyed by host and remote path
+
+    A shorter remote file is only resumed when it is listed here for the same local
+    file (size and mtime unchanged); any other shorter file is an older copy and is
+    overwritten with a full STOR.
+    """
+
+    def __init__(self, ruta_diario=UPLOAD_JOURNAL_FILE):
+        self.ruta_diario = ruta_diario
+        self._lock = threading.Lock()
+        self._entradas = {}
+        try:
+            with open(self.ruta_diario, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if isinstance(datos, dict):
+                self._entradas = datos
+        except (OSError, ValueError):
+            pass
+
+    def iniciar(self, host, ruta_remota, ruta_local):
+        st = os.stat(ruta_local)
+        with self._lock:
+            self._entradas[f"{host}:{ruta_remota}"] = {
+                "local": os.path.abspath(ruta_local),
+                "tamano": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+            self._guardar()
+
+    def terminar(self, host, ruta_remota):
+        with self._lock:
+            if self._entradas.pop(f"{host}:{ruta_remota}", None) is not None:
+                self._guardar()
+
+    def reanudable(self, host, ruta_remota, ruta_local):
+        """True if this upload was started from this very file and never finished"""
+        with self._lock:
+            entrada = self._entradas.get(f"{host}:{ruta_remota}")
+        if not entrada or entrada.get("local") != os.path.abspath(ruta_local):
+            return False
+        try:
+            st = os.stat(ruta_local)
+        except OSError:
+            return False
+        return st.st_size == entrada.get("tamano") and st.st_mtime_ns == entrada.get("mtime_ns")
+
+    def _guardar(self):
+        temporal = self.ruta_diario + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(self._entradas, f)
+            os.replace(temporal, self.ruta_diario)
+        except OSError as e:
+            print(f"[ERROR] Saving upload journal: {e}")
+
+
+class StreamBuffer:
+    """Bounded, file-like buffer between a producer thread and the FTP data connection"""
+
+    def __init__(self, max_bloques=STREAM_BUFFER_CHUNKS):
+        self._cola = queue.Queue(max_bloques)
+        self._resto = b""
+        self._terminado = False
+        self._abortado = threading.Event()
+        self.error = None
+
+    def put(self, bloque):
+        """Queue a chunk, blocking while the buffer is full (False once the reader aborted)"""
+        while not self._abortado.is_set():
+            try:
+                self._cola.put(bloque, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def cerrar(self, error=None):
+        """Signal end of data (or a producer error)"""
+        self.error = error
+        self.put(None)
+
+    def abortar(self):
+        self._abortado.set()
+
+    def read(self, n=-1):
+        while not self._resto and not self._terminado:
+            bloque = self._cola.get()
+            if bloque is None:
+                self._terminado = True
+                if self.error:
+                    raise OSError(f"Download interrupted: {self.error}")
+            else:
+                self._resto = bloque
+        if n is None or n < 0:
+            n = len(self._resto)
+        datos, self._resto = self._resto[:n], self._resto[n:]
+        return datos
+
+
+class FTPUploadEngine:
+    """Upload files to the console over a small pool of authenticated FTP connections
+
+    Files are grouped by destination directory. Each group is uploaded in order by a
+    single connection, while different groups run in parallel on the other connections.
+    """
+
+    def __init__(self, host, user="", password="", conexiones=DEFAULT_CONNECTIONS,
+                 timeout=30, log=print, progreso_callback=None,
+                 tamano_bloque=DEFAULT_BLOCK_SIZE, usar_sendfile=True, diario=None):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.conexiones = max(1, int(conexiones))
+        self.timeout = timeout
+        self.log = log
+        self.progreso_callback = progreso_callback
+        self.tamano_bloque = max(8192, int(tamano_bloque))
+        self.usar_sendfile = usar_sendfile and hasattr(os, "sendfile")
+
+        self._lock = threading.Lock()
+        self._bytes_enviados = 0
+        self._bytes_totales = 0
+
+        # Remote directories known to exist, and one listing ({name: size}) per directory
+        self._dirs_lock = threading.Lock()
+        self._dirs_conocidos = set()
+        self._listados = {}
+
+        # (remote_dir, name) -> bytes already on the console from an interrupted upload
+        self._parciales = {}
+        self._diario = diario if diario is not None else UploadJournal()
+
+    def conectar(self):
+        """Open and authenticate a new FTP connection"""
+        ftp = FTP()
+        ftp.connect(self.host, FTP_PORT, timeout=self.timeout)
+        if self.user and self.password:
+            ftp.login(self.user, self.password)
+        else:
+            ftp.login()  # Anonymous login
+        return ftp
+
+    def planificar(self, ftp, trabajos):
+        """Split jobs into (pending, skipped) by comparing name and size with the console
+
+        Each target directory is listed once (MLSD, falling back to LIST/SIZE). A shorter
+        remote file is resumed only if the upload journal says this engine started it.
+        """
+        pendientes, omitidos = [], []
+        for ruta_local, dir_remoto in trabajos:
+            nombre = os.path.basename(ruta_local)
+            tamano_local = _tamano_local(ruta_local)
+            if tamano_local is None:
+                pendientes.append((ruta_local, dir_remoto))
+                continue
+            entradas = self._listar(ftp, dir_remoto)
+            tamano_remoto = None
+            if nombre in entradas:
+                tamano_remoto = entradas[nombre]
+                if tamano_remoto is None:
+                    tamano_remoto = self._tamano_remoto(ftp, f"{dir_remoto}/{nombre}")
+                    entradas[nombre] = tamano_remoto
+            if tamano_remoto == tamano_local:
+                omitidos.append((ruta_local, dir_remoto))
+                self._diario.terminar(self.host, f"{dir_remoto}/{nombre}")
+            else:
+                if (tamano_remoto and tamano_remoto < tamano_local
+                        and self._diario.reanudable(self.host, f"{dir_remoto}/{nombre}", ruta_local)):
+                    self._parciales[(dir_remoto, nombre)] = tamano_remoto
+                pendientes.append((ruta_local, dir_remoto))
+        return pendientes, omitidos
+
+    def subir(self, trabajos, incremental=True, simulacion=False):
+        """Upload a list of (local_path, remote_dir) jobs and return a summary dict
+
+        With `incremental`, files already on the console with the same size are skipped.
+        With `simulacion` (dry run) nothing is transferred; the summary lists what would be.
+        """
+        resumen = {"archivos": 0, "bytes": 0, "segundos": 0.0, "errores": [],
+                   "pendientes": list(trabajos), "omitidos": []}
+        if not trabajos:
+            return resumen
+
+        # The first connection is opened here so login errors surface immediately
+        primera = self.conectar()
+        if incremental or simulacion:
+            resumen["pendientes"], resumen["omitidos"] = self.planificar(primera, trabajos)
+            trabajos = resumen["pendientes"]
+            self.log(f"Sync plan: {len(trabajos)} file(s) to upload, "
+                     f"{len(resumen['omitidos'])} already on the console")
+
+        if simulacion or not trabajos:
+            self._cerrar(primera)
+            return resumen
+
+        grupos = OrderedDict()
+        for ruta_local, dir_remoto in trabajos:
+            grupos.setdefault(dir_remoto, []).append(ruta_local)
+
+        tamanos = {ruta: _tamano_local(ruta) or 0 for ruta, _ in trabajos}
+        # Bytes already on the console from interrupted uploads are not sent again
+        self._bytes_totales = sum(tamanos.values()) - sum(self._parciales.values())
+        self._bytes_enviados = 0
+
+        # Largest directories first so the connections finish at roughly the same time
+        cola = queue.Queue()
+        for dir_remoto, archivos in sorted(grupos.items(),
+                                           key=lambda g: -sum(tamanos[r] for r in g[1])):
+            cola.put((dir_remoto, archivos))
+
+        conexiones = [primera]
+        for _ in range(min(self.conexiones, len(grupos)) - 1):
+            try:
+                conexiones.append(self.conectar())
+            except all_errors as e:
+                self.log(f"Could not open extra FTP connection ({e}), continuing with {len(conexiones)}")
+                break
+        self.log(f"Uploading {len(trabajos)} file(s) over {len(conexiones)} FTP connection(s)...")
+
+        inicio = time.monotonic()
+        hilos = [threading.Thread(target=self._worker, args=(ftp, cola, resumen), daemon=True)
+                 for ftp in conexiones]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        resumen["segundos"] = time.monotonic() - inicio
+
+        # Directories left in the queue if every connection gave up
+        while not cola.empty():
+            resumen["errores"].extend(cola.get_nowait()[1])
+
+        self.log(f"Transferred {resumen['bytes'] / (1024 * 1024):.1f} MB in {resumen['segundos']:.1f}s "
+                 f"({formatear_velocidad(resumen['bytes'], resumen['segundos'])} aggregate)")
+        return resumen
+
+    def _worker(self, ftp, cola, resumen):
+        try:
+            while True:
+                try:
+                    dir_remoto, archivos = cola.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._asegurar_directorio(ftp, dir_remoto)
+                    ftp.cwd(dir_remoto)
+                except all_errors as e:
+                    self.log(f"❌ Cannot access {dir_remoto}: {e}")
+                    with self._lock:
+                        resumen["errores"].extend(archivos)
+                    continue
+
+                for indice, ruta_local in enumerate(archivos):
+                    nombre = os.path.basename(ruta_local)
+                    inicio_archivo = time.monotonic()
+                    try:
+                        ftp, enviados, metodo = self._subir_con_reintentos(ftp, dir_remoto, ruta_local)
+                    except Exception as e:
+                        # Local problems (file deleted or unreadable since planning) only fail this file
+                        enviados = None
+                        self.log(f"❌ Error uploading {nombre}: {e}")
+
+                    if enviados is None:
+                        with self._lock:
+                            resumen["errores"].append(ruta_local)
+                            if ftp is None:
+                                # Give up on this directory: the rest of it can't be sent either
+                                resumen["errores"].extend(archivos[indice + 1:])
+                        if ftp is None:
+                            return
+                        continue
+                    with self._lock:
+                        resumen["archivos"] += 1
+                        resumen["bytes"] += enviados
+                    duracion = time.monotonic() - inicio_archivo
+                    self.log(f"✅ Uploaded: {nombre} to {dir_remoto}/ "
+                             f"({formatear_velocidad(enviados, duracion)}, {metodo})")
+        finally:
+            if ftp is not None:
+                self._cerrar(ftp)
+
+    def _subir_con_reintentos(self, ftp, dir_remoto, ruta_local):
+        """Upload one file, reconnecting and resuming after a dropped connection
+
+        Returns (connection to keep using, bytes sent or None if the server refused the
+        file, data path used). The connection is None once reconnecting gave up. Errors
+        opening the local file are raised to the caller.
+        """
+        nombre = os.path.basename(ruta_local)
+        ruta_remota = f"{dir_remoto}/{nombre}"
+        offset = self._parciales.pop((dir_remoto, nombre), 0)
+        intentos = 0
+        with open(ruta_local, "rb") as f:
+            tamano_local = os.fstat(f.fileno()).st_size
+            self._diario.iniciar(self.host, ruta_remota, ruta_local)
+            while True:
+                try:
+                    if offset:
+                        self.log(f"Resuming {nombre} at {offset} bytes")
+                    enviados, metodo = self._subir_archivo(ftp, f, nombre, offset)
+                    self._diario.terminar(self.host, ruta_remota)
+                    return ftp, enviados, metodo
+                except error_perm as e:
+                    self.log(f"❌ Error uploading {nombre}: {e}")
+                    self._diario.terminar(self.host, ruta_remota)
+                    return ftp, None, None
+                except all_errors as e:
+                    intentos += 1
+                    self.log(f"⚠ Connection lost while uploading {nombre}: {e}")
+                    ftp = self._reconectar(ftp, dir_remoto, intentos)
+                    if ftp is None:
+                        return None, None, None
+                    offset = self._offset_reanudacion(ftp, tamano_local, nombre)
+
+    def _reconectar(self, ftp, dir_remoto, intentos):
+        """Reopen the connection with exponential backoff; None once retries are exhausted"""
+        try:
+            ftp.close()
+        except Exception:
+            pass
+        while intentos <= MAX_REINTENTOS:
+            espera = min(BACKOFF_INICIAL * (2 ** (intentos - 1)), BACKOFF_MAXIMO)
+            self.log(f"Reconnecting in {espera:.0f}s (attempt {intentos}/{MAX_REINTENTOS})...")
+            time.sleep(espera)
+            try:
+                nuevo = self.conectar()
+                nuevo.cwd(dir_remoto)
+                return nuevo
+            except all_errors as e:
+                self.log(f"Reconnect failed: {e}")
+                intentos += 1
+        self.log(f"❌ Giving up on {dir_remoto} after {MAX_REINTENTOS} reconnect attempts")
+        return None
+
+    def _offset_reanudacion(self, ftp, tamano_local, nombre):
+        """Bytes of `nombre` that already reached the console (0 = start over)"""
+        tamano_remoto = self._tamano_remoto(ftp, nombre)
+        if tamano_remoto and tamano_remoto <= tamano_local:
+            return tamano_remoto
+        return 0
+
+    def _cerrar(self, ftp):
+        try:
+            ftp.quit()
+        except all_errors:
+            ftp.close()
+
+    def _subir_archivo(self, ftp, f, nombre, offset=0):
+        """Upload an open local file into the current directory, resuming at `offset` if non-zero
+
+        Returns (bytes actually sent, data path used).
+        """
+        if offset >= os.fstat(f.fileno()).st_size:
+            return 0, "already complete"  # Everything arrived before the link dropped
+        if not offset:
+            return self._enviar(ftp, f"STOR {nombre}", f)
+
+        try:
+            return self._enviar(ftp, f"STOR {nombre}", f, offset)
+        except error_perm as e:
+            # REST before STOR not supported: append to the partial file instead
+            if str(e)[:3] not in ("500", "501", "502", "504"):
+                raise
+            return self._enviar(ftp, f"APPE {nombre}", f, offset, rest=False)
+
+    def _enviar(self, ftp, comando, f, offset=0, rest=True):
+        """Send a file over a new data connection
+
+        Regular files go through socket.sendfile (zero-copy where the OS supports it);
+        anything else uses a buffered loop with the configured block size.
+        """
+        ftp.voidcmd("TYPE I")
+        conn = ftp.transfercmd(comando, offset if offset and rest else None)
+        enviados = 0
+        completo = False
+        try:
+            if self.usar_sendfile and _es_archivo_regular(f):
+                metodo = "sendfile"
+                posicion = offset
+                while True:
+                    n = conn.sendfile(f, posicion, SENDFILE_SLICE)
+                    if not n:
+                        break
+                    posicion += n
+                    enviados += n
+                    self._avanzar(n)
+            else:
+                metodo = f"buffered {self.tamano_bloque // 1024} KB"
+                if offset:
+                    f.seek(offset)
+                while True:
+                    bloque = f.read(self.tamano_bloque)
+                    if not bloque:
+                        break
+                    conn.sendall(bloque)
+                    enviados += len(bloque)
+                    self._avanzar(len(bloque))
+            completo = True
+        finally:
+            conn.close()
+            if not completo:
+                self._descartar_respuesta(ftp)
+        ftp.voidresp()
+        return enviados, metodo
+
+    def _descartar_respuesta(self, ftp):
+        """Read the reply to a transfer that failed midway so the next command isn't answered by it
+
+        If the server doesn't answer in time the session is closed; callers reconnect.
+        """
+        try:
+            anterior = ftp.sock.gettimeout()
+            ftp.sock.settimeout(RESYNC_TIMEOUT)
+            try:
+                resincronizar(ftp)
+            finally:
+                ftp.sock.settimeout(anterior)
+        except (*all_errors, AttributeError):
+            ftp.close()
+
+    def subir_stream(self, ftp, trozos, dir_remoto, nombre, ruta_copia=None, total=0):
+        """Stream chunks (e.g. an HTTP download) straight into STOR on the console
+
+        A producer thread pulls `trozos`, hashes them (MD5) and optionally tees them to
+        `ruta_copia`, while this thread sends them through a bounded buffer.
+        Returns (bytes sent, md5 hex digest).
+        """
+        self._asegurar_directorio(ftp, dir_remoto)
+        ftp.cwd(dir_remoto)
+        with self._lock:
+            self._bytes_enviados, self._bytes_totales = 0, total
+
+        buffer = StreamBuffer()
+        md5 = hashlib.md5()
+
+        def productor():
+            copia = None
+            try:
+                if ruta_copia:
+                    copia = open(ruta_copia, "wb")
+                for bloque in trozos:
+                    if not bloque:
+                        continue
+                    md5.update(bloque)
+                    if copia:
+                        copia.write(bloque)
+                    if not buffer.put(bloque):
+                        return  # The FTP side gave up
+                buffer.cerrar()
+            except Exception as e:
+                buffer.cerrar(e)
+            finally:
+                if copia:
+                    copia.close()
+
+        hilo = threading.Thread(target=productor, daemon=True)
+        hilo.start()
+        try:
+            enviados, _ = self._enviar(ftp, f"STOR {nombre}", buffer)
+        finally:
+            buffer.abortar()
+            hilo.join()
+        return enviados, md5.hexdigest()
+
+    def _avanzar(self, num_bytes):
+        with self._lock:
+            self._bytes_enviados += num_bytes
+            enviados, total = self._bytes_enviados, self._bytes_totales
+        if self.progreso_callback:
+            self.progreso_callback(enviados, total)
+
+    def _listar(self, ftp, ruta):
+        """Entries of a remote directory as {name: size or None}, listed once per session"""
+        if ruta in self._listados:
+            return self._listados[ruta]
+        entradas, existe = listar_directorio(ftp, ruta)
+        if existe:
+            self._dirs_conocidos.add(ruta)
+        self._listados[ruta] = entradas
+        return entradas
+
+    def _tamano_remoto(self, ftp, ruta):
+        try:
+            ftp.voidcmd("TYPE I")
+            return ftp.size(ruta)
+        except all_errors:
+            return None
+
+    def _asegurar_directorio(self, ftp, ruta):
+        """Ensure an absolute remote directory path exists without re-checking known directories"""
+        with self._dirs_lock:
+            if ruta in self._dirs_conocidos:
+                return
+
+            actual = ""
+            for parte in ruta.strip("/").split("/"):
+                if not parte:
+                    continue
+                padre = actual or "/"
+                actual = f"{actual}/{parte}"
+                if actual in self._dirs_conocidos:
+                    continue
+
+                nombres = self._listar(ftp, padre)
+                if parte not in nombres:
+                    try:
+                        ftp.mkd(actual)
+                        self.log(f"Created directory: {actual}")
+                        self._listados[actual] = {}
+                    except error_perm:
+                        # Listing may not show it (e.g. drive roots); accept it if we can enter it
+                        ftp.cwd(actual)
+                    nombres[parte] = None
+                self._dirs_conocidos.add(actual)
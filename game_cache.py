@@ -0,0 +1,84 @@
+import os
+import json
+import threading
+
+# Stored next to the config file in the user's home directory
+GAME_CACHE_FILE = os.path.expanduser("~/.x360-tu-manager-games.json")
+
+
+def _normalizar_ruta(ruta):
+    return os.path.normcase(os.path.abspath(ruta))
+
+
+class GameScanCache:
+    """MediaID/TitleID of every default.xex already read, keyed by path and validated by size/mtime"""
+
+    def __init__(self, ruta_cache=GAME_CACHE_FILE):
+        self.ruta_cache = ruta_cache
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._modificado = False
+        try:
+            with open(self.ruta_cache, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if isinstance(datos, dict):
+                self._entradas = datos
+        except (OSError, ValueError):
+            pass
+
+    def obtener(self, ruta_xex):
+        """Cached {"media_id", "title_id"} for a default.xex, or None if unknown or changed"""
+        clave = _normalizar_ruta(ruta_xex)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+        if not entrada:
+            return None
+        try:
+            st = os.stat(ruta_xex)
+        except OSError:
+            return None
+        if st.st_size != entrada.get("tamano") or st.st_mtime_ns != entrada.get("mtime_ns"):
+            return None
+        return {"media_id": entrada.get("media_id"), "title_id": entrada.get("title_id")}
+
+    def registrar(self, ruta_xex, media_id, title_id):
+        try:
+            st = os.stat(ruta_xex)
+        except OSError:
+            return
+        with self._lock:
+            self._entradas[_normalizar_ruta(ruta_xex)] = {
+                "media_id": media_id,
+                "title_id": title_id,
+                "tamano": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+            self._modificado = True
+
+    def guardar(self):
+        """Write the cache to disk if anything changed (atomic replace)"""
+        with self._lock:
+            if not self._modificado:
+                return
+            datos = dict(self._entradas)
+            self._modificado = False
+        temporal = self.ruta_cache + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+            os.replace(temporal, self.ruta_cache)
+        except OSError as e:
+            print(f"[ERROR] Saving game scan cache: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_juegos():
+    """Shared game scan cache (loaded lazily on first use)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GameScanCache()
+        return _cache
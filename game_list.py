@@ -0,0 +1,415 @@
+import re
+import bisect
+import threading
+from itertools import chain
+import tkinter as tk
+from tkinter import ttk
+
+# Rows added by worker threads are shown together at most this often
+BATCH_MS = 100
+WHEEL_ROWS = 3
+# Matches of recent search terms, reused while typing (cleared when rows arrive)
+TERM_CACHE_SIZE = 64
+
+_PALABRAS = re.compile(r"\w+")
+
+
+def _claves_busqueda(juego):
+    """Lowercase words of the name plus both IDs; a search term matches their prefixes"""
+    claves = set(_PALABRAS.findall((juego.get("nombre") or "").lower()))
+    for clave in ("media_id", "title_id"):
+        if juego.get(clave):
+            claves.add(juego[clave].lower())
+    return claves
+
+
+def _clave_orden(juego, clave):
+    # Missing IDs sort last
+    return (juego.get(clave) or "\uffff").lower()
+
+
+class IndiceBusqueda:
+    """Word-prefix index over the games of the list
+
+    Every word of a game's name and both IDs map to the model rows that contain
+    them. A search term matches every word it is a prefix of, found with bisect in
+    the sorted word list; matches of recent terms are cached until rows are added.
+    """
+
+    def __init__(self):
+        self._palabras = {}       # Search word -> model rows containing it
+        self._ordenadas = []
+        self._terminos = {}
+
+    def agregar(self, filas, juegos):
+        """Add a batch of new rows (model indexes and their games)"""
+        palabras = self._palabras
+        self._terminos = {}
+        nuevas = []
+        for indice, juego in zip(filas, juegos):
+            for palabra in _claves_busqueda(juego):
+                lista = palabras.get(palabra)
+                if lista is None:
+                    palabras[palabra] = [indice]
+                    nuevas.append(palabra)
+                else:
+                    lista.append(indice)
+        if nuevas:
+            nuevas.sort()
+            # Two sorted runs: the sort only merges them
+            self._ordenadas += nuevas
+            self._ordenadas.sort()
+
+    def buscar(self, texto):
+        """Model rows whose words/IDs start with every term of `texto`, or None for no filter"""
+        terminos = _PALABRAS.findall(texto.lower())
+        if not terminos:
+            return None
+        ordenadas = self._ordenadas
+        resultado = None
+        # Longest term first: usually the fewest matches
+        for termino in sorted(terminos, key=len, reverse=True):
+            filas = self._terminos.get(termino)
+            if filas is None:
+                desde = bisect.bisect_left(ordenadas, termino)
+                hasta = bisect.bisect_left(ordenadas, termino + "\uffff", desde)
+                filas = frozenset(chain.from_iterable(map(self._palabras.__getitem__, ordenadas[desde:hasta])))
+                if len(self._terminos) >= TERM_CACHE_SIZE:
+                    self._terminos.clear()
+                self._terminos[termino] = filas
+            resultado = filas if resultado is None else resultado & filas
+            if not resultado:
+                break
+        return resultado
+
+
+class GameListView:
+    """Game list that only creates Treeview rows for the visible window
+
+    The games live in a plain list (the model, shared with the application); the
+    Treeview keeps one item per visible line and those items are refilled when the
+    list scrolls. Worker threads call agregar()/limpiar() and the view picks up the
+    changes in batches on the GUI thread. Until then the indexes it holds refer to the
+    old list, so model reads check the generation first.
+
+    Searching and sorting only rebuild the list of model indexes that is shown:
+    the search looks up word prefixes in an IndiceBusqueda kept up to date as rows
+    arrive, and each column's sorted order is cached until new rows are added.
+    """
+
+    COLUMNAS = (("Game", "nombre", 200), ("MediaID", "media_id", 100), ("TitleID", "title_id", 100))
+
+    def __init__(self, parent, root, modelo):
+        self.root = root
+        self.modelo = modelo
+        self._lock = threading.Lock()
+        self._generacion = 0
+        self._programado = False
+
+        # Filled on the GUI thread only
+        self._orden = []          # Every model index, in sort order
+        self._vista = []          # Indexes of _orden that match the search
+        self._conocidas = 0       # Model rows already in _orden
+        self._generacion_vista = 0
+        self._inicio = 0
+        self._filas = 10
+        self._seleccion = None    # Model index of the selected game
+        self._claves_orden = {columna: [] for _, columna, _ in self.COLUMNAS}  # Sort key per model row
+        self._ordenes = {}        # Column key -> model indexes in ascending order
+        self._orden_columna = None
+        self._orden_inverso = False
+        self._indice = IndiceBusqueda()
+        self._coincidencias = None
+
+        buscar_frame = tk.Frame(parent)
+        buscar_frame.pack(fill="x", pady=(0, 5))
+        tk.Label(buscar_frame, text="Search:").pack(side="left")
+        self.texto_busqueda = tk.StringVar()
+        tk.Entry(buscar_frame, textvariable=self.texto_busqueda).pack(side="left", fill="x", expand=True, padx=5)
+        self.etiqueta_total = tk.Label(buscar_frame, text="")
+        self.etiqueta_total.pack(side="right")
+        self.texto_busqueda.trace_add("write", lambda *args: self._al_buscar())
+
+        marco = tk.Frame(parent)
+        marco.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(marco, columns=[c[0] for c in self.COLUMNAS], show="headings",
+                                 selectmode="browse")
+        for nombre, clave, ancho in self.COLUMNAS:
+            self.tree.heading(nombre, text=nombre, command=lambda clave=clave: self.ordenar(clave))
+            self.tree.column(nombre, width=ancho)
+        self.scrollbar = ttk.Scrollbar(marco, orient="vertical", command=self._desplazar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self._mover_vista(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self._mover_vista(WHEEL_ROWS))
+        for tecla, paso in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                            ("<Home>", "inicio"), ("<End>", "fin")):
+            self.tree.bind(tecla, lambda e, paso=paso: self._mover_seleccion(paso))
+
+    # --- Model changes (any thread) ---
+
+    def agregar(self, juego):
+        with self._lock:
+            self.modelo.append(juego)
+        self._programar()
+
+    def agregar_varios(self, juegos):
+        with self._lock:
+            self.modelo.extend(juegos)
+        self._programar()
+
+    def limpiar(self):
+        with self._lock:
+            self.modelo.clear()
+            self._generacion += 1
+        self._programar()
+
+    def generacion(self):
+        """Changes every time the list is cleared or replaced"""
+        with self._lock:
+            return self._generacion
+
+    def reemplazar(self, juegos, generacion=None):
+        """Swap the whole list in one step; with `generacion`, only if nobody cleared it since"""
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return False
+            self.modelo[:] = juegos
+            self._generacion += 1
+        self._programar()
+        return True
+
+    def _programar(self):
+        with self._lock:
+            if self._programado:
+                return
+            self._programado = True
+        self.root.after(BATCH_MS, self._refrescar)
+
+    # --- GUI thread ---
+
+    def _refrescar(self):
+        """Take every row added since the last refresh in one batch
+
+        The new rows are copied under the lock, so a worker clearing the list meanwhile
+        can't change them under the index builders (the next refresh starts over).
+        """
+        with self._lock:
+            self._programado = False
+            total = len(self.modelo)
+            if self._generacion != self._generacion_vista:
+                self._generacion_vista = self._generacion
+                self._orden = []
+                self._conocidas = 0
+                self._claves_orden = {columna: [] for _, columna, _ in self.COLUMNAS}
+                self._ordenes = {}
+                self._indice = IndiceBusqueda()
+                self._inicio = 0
+                self._seleccion = None
+            nuevas = range(self._conocidas, total)
+            juegos = [self.modelo[indice] for indice in nuevas]
+        if juegos:
+            self._conocidas = total
+            self._indice.agregar(nuevas, juegos)
+            self._agregar_claves_orden(nuevas, juegos)
+            if self._orden_columna:
+                self._ordenar_filas()
+            else:
+                self._orden.extend(nuevas)
+        self._aplicar_busqueda()
+        self._renderizar()
+        self.root.after_idle(self._medir)
+
+    def ordenar(self, clave):
+        """Sort by a column; choosing the same column again reverses the order"""
+        if self._orden_columna == clave:
+            self._orden_inverso = not self._orden_inverso
+        else:
+            self._orden_columna, self._orden_inverso = clave, False
+        for nombre, clave_columna, _ in self.COLUMNAS:
+            flecha = (" ▼" if self._orden_inverso else " ▲") if clave_columna == clave else ""
+            self.tree.heading(nombre, text=nombre + flecha)
+        self._ordenar_filas()
+        self._aplicar_busqueda()
+        self._renderizar()
+
+    def _agregar_claves_orden(self, filas, juegos):
+        """Sort keys for a batch of new rows (model indexes and a copy of their games)
+
+        Columns sorted before keep their order up to date.
+        """
+        for _, columna, _ in self.COLUMNAS:
+            claves = self._claves_orden[columna]
+            claves.extend(_clave_orden(juego, columna) for juego in juegos)
+            ascendente = self._ordenes.get(columna)
+            if ascendente is not None:
+                # Sorted old rows + sorted batch: the sort only merges the two runs
+                ascendente.extend(sorted(filas, key=claves.__getitem__))
+                ascendente.sort(key=claves.__getitem__)
+
+    def _ordenar_filas(self):
+        columna = self._orden_columna
+        ascendente = self._ordenes.get(columna)
+        if ascendente is None:
+            ascendente = self._ordenes[columna] = sorted(range(self._conocidas),
+                                                         key=self._claves_orden[columna].__getitem__)
+        self._orden = ascendente[::-1] if self._orden_inverso else list(ascendente)
+
+    def buscar(self, texto):
+        """Model rows whose words/IDs start with every term of `texto`, or None for no filter"""
+        return self._indice.buscar(texto)
+
+    def _al_buscar(self):
+        self._coincidencias = self.buscar(self.texto_busqueda.get())
+        self._inicio = 0
+        self._aplicar_busqueda(recalcular=False)
+        self._renderizar()
+
+    def _aplicar_busqueda(self, recalcular=True):
+        if recalcular and self._coincidencias is not None:
+            self._coincidencias = self.buscar(self.texto_busqueda.get())
+        if self._coincidencias is None:
+            self._vista = self._orden
+        else:
+            coincidencias = self._coincidencias
+            self._vista = [indice for indice in self._orden if indice in coincidencias]
+            if self._seleccion not in coincidencias:
+                self._seleccion = None
+        if self._coincidencias is None:
+            self.etiqueta_total.config(text=f"{len(self._orden)} games")
+        else:
+            self.etiqueta_total.config(text=f"{len(self._vista)} of {len(self._orden)} games")
+
+    def _valores(self, juego):
+        return tuple(juego.get(clave) or "N/A" for _, clave, _ in self.COLUMNAS)
+
+    def _vigente(self):
+        """False once another thread cleared or replaced the model (call with the lock held)"""
+        return self._generacion == self._generacion_vista
+
+    def _renderizar(self):
+        total = len(self._vista)
+        self._inicio = max(0, min(self._inicio, total - self._filas))
+        necesarias = min(self._filas, total - self._inicio)
+
+        with self._lock:
+            vigente = self._vigente()
+            if vigente:
+                valores = [self._valores(self.modelo[indice])
+                           for indice in self._vista[self._inicio:self._inicio + necesarias]]
+        if not vigente:
+            # Catch up with the new list now instead of drawing rows of the old one
+            self._refrescar()
+            return
+
+        items = self.tree.get_children()
+        if len(items) > necesarias:
+            self.tree.delete(*items[necesarias:])
+        for _ in range(len(items), necesarias):
+            self.tree.insert("", "end")
+        items = self.tree.get_children()
+
+        seleccionado = None
+        for pos, item in enumerate(items):
+            indice = self._vista[self._inicio + pos]
+            self.tree.item(item, values=valores[pos])
+            if indice == self._seleccion:
+                seleccionado = item
+        if seleccionado:
+            self.tree.selection_set(seleccionado)
+            self.tree.focus(seleccionado)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self._inicio / total, (self._inicio + necesarias) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _al_redimensionar(self, event):
+        self._medir(event.height)
+
+    def _medir(self, alto=None):
+        """Number of rows that fit, measured from the first rendered row"""
+        items = self.tree.get_children()
+        caja = self.tree.bbox(items[0]) if items else None
+        if not caja:
+            return
+        # Only whole rows, so Treeview never scrolls by itself
+        filas = max(1, ((alto or self.tree.winfo_height()) - caja[1]) // caja[3])
+        if filas != self._filas:
+            self._filas = filas
+            self._renderizar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._inicio = int(float(cantidad) * len(self._vista))
+            self._renderizar()
+        elif accion == "scroll":
+            paso = self._filas if unidad == "pages" else 1
+            self._mover_vista(int(cantidad) * paso)
+
+    def _mover_vista(self, filas):
+        self._inicio += filas
+        self._renderizar()
+        return "break"
+
+    def _rueda(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        pasos = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._mover_vista(-pasos * WHEEL_ROWS)
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._seleccion = self._vista[self._inicio + self.tree.index(seleccion[0])]
+
+    def _mover_seleccion(self, paso):
+        total = len(self._vista)
+        if not total:
+            return "break"
+        try:
+            pos = self._vista.index(self._seleccion)
+        except ValueError:
+            pos = self._inicio - 1
+        if paso == "inicio":
+            pos = 0
+        elif paso == "fin":
+            pos = total - 1
+        elif paso in ("page", "-page"):
+            pos += self._filas if paso == "page" else -self._filas
+        else:
+            pos += paso
+        pos = max(0, min(pos, total - 1))
+
+        self._seleccion = self._vista[pos]
+        if pos < self._inicio:
+            self._inicio = pos
+        elif pos >= self._inicio + self._filas:
+            self._inicio = pos - self._filas + 1
+        self._renderizar()
+        return "break"
+
+    def seleccionar_en(self, y):
+        """Select the row under a mouse position (context menu); returns the game or None"""
+        item = self.tree.identify_row(y)
+        if not item:
+            return None
+        with self._lock:
+            if not self._vigente():
+                return None  # The row on screen belongs to a list that is gone
+            self._seleccion = self._vista[self._inicio + self.tree.index(item)]
+            juego = self.modelo[self._seleccion]
+        self._renderizar()
+        return juego
+
+    def seleccionado(self):
+        """The selected game (dict from the model), or None"""
+        with self._lock:
+            if self._seleccion is None or not self._vigente():
+                return None
+            return self.modelo[self._seleccion]
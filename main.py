@@ -1,15 +1,28 @@
 import os
 import sys
 import json
+import time
+import queue
 import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from ftplib import FTP
-from xboxunity_api import login_xboxunity, buscar_tus, descargar_tu, probar_conectividad
-from xex_reader import obtener_info_juego
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from game_cache import obtener_cache_juegos
+from game_list import GameListView
+from session_snapshot import (guardar_sesion, cargar_sesion, mtimes_directorios, carpetas_a_reescanear,
+                              dentro_de)
 
 # Save config in user's home directory to avoid read-only filesystem issues
 CONFIG_FILE = os.path.expanduser("~/.x360-tu-manager-config.json")
+# XboxUnity login tokens are reused from the config file for this long
+TOKEN_MAX_AGE = 6 * 3600
+# Line prefix the ISO extractor addon uses to report extracted games (--handoff)
+HANDOFF_PREFIX = "X360TUM-GAME "
+# How often the GUI thread picks up results of the session restore
+RESTORE_POLL_MS = 50
+# Logins that fail for a transient reason (no connection, 429, 5xx) are retried after 2s, 4s...
+LOGIN_RETRIES = 2
+LOGIN_BACKOFF = 2.0
+LOGIN_MAX_WAIT = 60
 
 class XboxTUMApp:
     def __init__(self, root):
@@ -21,7 +34,15 @@ class XboxTUMApp:
         
         self.token = None
         self.api_key = None
+        # Cleared while a login runs in the background; API calls wait on it
+        self.login_listo = threading.Event()
+        self.login_listo.set()
         self.juegos = []
+        # Where the current list came from, saved with it in the session snapshot
+        self.sesion = {"origen": None, "carpeta": None, "directorios": {}}
+        # Advanced FTP tuning, only set by editing the config file
+        self.ftp_block_size = None  # ftp_uploader's default
+        self.ftp_use_sendfile = True
 
         # Top Frame for Login and FTP
         top_frame = tk.Frame(root)
@@ -63,18 +84,27 @@ class XboxTUMApp:
 
         tk.Button(ftp_frame, text="Test FTP", command=self.test_ftp_connection).grid(row=0, column=2, rowspan=3, padx=5)
 
+        # Dry run: only report which TUs would be transferred
+        self.ftp_dry_run = tk.BooleanVar(value=False)
+        tk.Checkbutton(ftp_frame, text="Preview upload only (dry run)",
+                       variable=self.ftp_dry_run).grid(row=3, column=0, columnspan=3, sticky="w")
+
+        # Direct mode: stream downloaded TUs straight to the console over FTP
+        self.ftp_direct = tk.BooleanVar(value=False)
+        tk.Checkbutton(ftp_frame, text="Download TUs straight to console",
+                       variable=self.ftp_direct).grid(row=4, column=0, columnspan=3, sticky="w")
+
+        # Check the console inventory first and skip TUs it already has
+        self.ftp_skip_installed = tk.BooleanVar(value=False)
+        tk.Checkbutton(ftp_frame, text="Skip TUs already installed on console",
+                       variable=self.ftp_skip_installed).grid(row=5, column=0, columnspan=3, sticky="w")
+
         # Games Frame
         juegos_frame = tk.LabelFrame(root, text="Detected Games", padx=10, pady=10)
         juegos_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-        self.tree = ttk.Treeview(juegos_frame, columns=("Game", "MediaID", "TitleID"), show="headings")
-        self.tree.heading("Game", text="Game")
-        self.tree.heading("MediaID", text="MediaID")
-        self.tree.heading("TitleID", text="TitleID")
-        self.tree.column("Game", width=200)
-        self.tree.column("MediaID", width=100)
-        self.tree.column("TitleID", width=100)
-        self.tree.pack(fill="both", expand=True)
+        # Only the visible rows exist as Treeview items; self.juegos is the model
+        self.lista_juegos = GameListView(juegos_frame, root, self.juegos)
 
         # Buttons for copying IDs and export
         botones_copiar_frame = tk.Frame(juegos_frame)
@@ -97,7 +127,7 @@ class XboxTUMApp:
         self.menu_popup = tk.Menu(self.root, tearoff=0)
         self.menu_popup.add_command(label="Copy MediaID", command=self.copy_media_id)
         self.menu_popup.add_command(label="Copy TitleID", command=self.copy_title_id)
-        self.tree.bind("<Button-3>", self.mostrar_menu)
+        self.lista_juegos.tree.bind("<Button-3>", self.mostrar_menu)
 
         # Progress bar
         self.progress = ttk.Progressbar(root, orient="horizontal", mode="determinate")
@@ -112,6 +142,8 @@ class XboxTUMApp:
         botones_frame.pack(fill="x", pady=5)
 
         tk.Button(botones_frame, text="Select Games Folder", command=self.select_folder).pack(side="left", padx=5)
+        tk.Button(botones_frame, text="Scan Console Games", command=self.scan_console_games).pack(side="left", padx=5)
+        tk.Button(botones_frame, text="Import Aurora DB", command=self.import_dashboard_db).pack(side="left", padx=5)
         tk.Button(botones_frame, text="Search and Download TUs", command=self.buscar_y_descargar_tus).pack(side="left", padx=5)
 
         # Optional: display project logo at the bottom-right next to the action buttons
@@ -128,6 +160,9 @@ class XboxTUMApp:
 
         # Load config
         self.load_config()
+
+        # Bring back the last library once the window is up
+        self.root.after(0, self._restaurar_sesion)
     
     def _configure_window_properties(self):
         """Configure window properties for better Linux integration"""
@@ -185,14 +220,25 @@ class XboxTUMApp:
             pass
 
     def save_config(self, username, password, api_key, xbox_ip="", ftp_user="", ftp_pass=""):
-        config_data = {
+        # Keep any other settings already stored in the file (e.g. FTP tuning)
+        config_data = {}
+        if os.path.exists(CONFIG_FILE):
+            try:
+                with open(CONFIG_FILE, "r") as f:
+                    config_data = json.load(f)
+            except Exception:
+                config_data = {}
+        config_data.update({
             "username": username, 
             "password": password, 
             "api_key": api_key,
             "xbox_ip": xbox_ip,
             "ftp_user": ftp_user,
             "ftp_pass": ftp_pass
-        }
+        })
+        self._escribir_config(config_data)
+
+    def _escribir_config(self, config_data):
         with open(CONFIG_FILE, "w") as f:
             json.dump(config_data, f)
         try:
@@ -200,6 +246,37 @@ class XboxTUMApp:
         except Exception:
             pass
 
+    def _guardar_token(self, username, token):
+        """Cache the login token (with its expiry) next to the saved credentials"""
+        try:
+            with open(CONFIG_FILE, "r") as f:
+                config_data = json.load(f)
+        except Exception:
+            return  # Credentials are not saved, so neither is the token
+        config_data.update({"token": token, "token_user": username,
+                            "token_expires": time.time() + TOKEN_MAX_AGE})
+        try:
+            self._escribir_config(config_data)
+        except OSError as e:
+            print(f"[ERROR] Saving login token: {e}")
+
+    def _borrar_token(self):
+        """Forget the cached login token (memory and config file)"""
+        self.token = None
+        try:
+            with open(CONFIG_FILE, "r") as f:
+                config_data = json.load(f)
+        except Exception:
+            return
+        if "token" not in config_data:
+            return
+        for clave in ("token", "token_user", "token_expires"):
+            config_data.pop(clave, None)
+        try:
+            self._escribir_config(config_data)
+        except OSError as e:
+            print(f"[ERROR] Removing login token: {e}")
+
     def load_config(self):
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, "r") as f:
@@ -210,10 +287,17 @@ class XboxTUMApp:
                 self.entry_xbox_ip.insert(0, data.get("xbox_ip", ""))
                 self.entry_ftp_user.insert(0, data.get("ftp_user", ""))
                 self.entry_ftp_pass.insert(0, data.get("ftp_pass", ""))
+                self.ftp_block_size = data.get("ftp_block_size")
+                self.ftp_use_sendfile = data.get("ftp_use_sendfile", True)
                 if data.get("api_key"):
                     self.api_key = data.get("api_key")
                 elif data.get("username") and data.get("password"):
-                    self.login(auto=True)
+                    # A token from an earlier session avoids logging in again
+                    if (data.get("token") and data.get("token_user") == data.get("username")
+                            and data.get("token_expires", 0) > time.time()):
+                        self.token = data["token"]
+                    else:
+                        self.login(auto=True)
 
     def delete_config(self):
         if os.path.exists(CONFIG_FILE):
@@ -226,45 +310,85 @@ class XboxTUMApp:
 
         self.api_key = api_key if api_key else None
 
+        consola = (self.entry_xbox_ip.get().strip(), self.entry_ftp_user.get().strip(),
+                   self.entry_ftp_pass.get().strip())
+
         if self.api_key:
             if not auto:
-                xbox_ip = self.entry_xbox_ip.get().strip()
-                ftp_user = self.entry_ftp_user.get().strip()
-                ftp_pass = self.entry_ftp_pass.get().strip()
-                self.save_config(username, password, api_key, xbox_ip, ftp_user, ftp_pass)
+                self.save_config(username, password, api_key, *consola)
                 self._log("API Key saved successfully.")
-                # Test connectivity with API Key
-                self._log("Testing connectivity with XboxUnity...")
-                if probar_conectividad():
-                    self._log("Connectivity verified successfully.")
-                else:
-                    self._log("WARNING: Connectivity issues with XboxUnity.")
+                # Test connectivity with API Key (in the background, it can take a while)
+                threading.Thread(target=self._probar_api_key, daemon=True).start()
             return
 
         if not username or not password:
             messagebox.showerror("Error", "Enter username and password or API Key")
             return
 
-        if not auto:
-            self._log("Testing connectivity with XboxUnity...")
-            if not probar_conectividad():
-                messagebox.showerror("Error", "Cannot connect to XboxUnity. Check your internet connection.")
-                return
+        if not self.login_listo.is_set():
+            self._log("Login already in progress...")
+            return
 
-        self._log("Attempting to login...")
-        token = login_xboxunity(username, password)
-        if token:
-            self.token = token
-            if not auto:
-                xbox_ip = self.entry_xbox_ip.get().strip()
-                ftp_user = self.entry_ftp_user.get().strip()
-                ftp_pass = self.entry_ftp_pass.get().strip()
-                self.save_config(username, password, api_key, xbox_ip, ftp_user, ftp_pass)
-                self._log("Login successful.")
+        # The network calls must not block the window; API calls wait on login_listo
+        self.login_listo.clear()
+        threading.Thread(target=self._login_en_segundo_plano, args=(username, password, api_key, consola, auto),
+                         daemon=True).start()
+
+    def _probar_api_key(self):
+        from xboxunity_api import probar_conectividad
+        self._log("Testing connectivity with XboxUnity...")
+        if probar_conectividad():
+            self._log("Connectivity verified successfully.")
         else:
-            self.delete_config()
+            self._log("WARNING: Connectivity issues with XboxUnity.")
+
+    def _login_en_segundo_plano(self, username, password, api_key, consola, auto):
+        from xboxunity_api import login_xboxunity, probar_conectividad
+        try:
             if not auto:
-                messagebox.showerror("Error", "Could not login to XboxUnity. Check your credentials.")
+                self._log("Testing connectivity with XboxUnity...")
+                if not probar_conectividad():
+                    self._message_error("Error", "Cannot connect to XboxUnity. Check your internet connection.")
+                    return
+
+            self._log("Attempting to login...")
+            detalles = {}
+            token = login_xboxunity(username, password, detalles)
+            for intento in range(1, LOGIN_RETRIES + 1):
+                if token or detalles.get("error") == "credentials":
+                    break
+                espera = min(detalles.get("espera") or LOGIN_BACKOFF * 2 ** (intento - 1), LOGIN_MAX_WAIT)
+                self._log(f"Login failed (XboxUnity unreachable or busy), retrying in {espera:.0f}s...")
+                time.sleep(espera)
+                detalles = {}
+                token = login_xboxunity(username, password, detalles)
+            if not token and detalles.get("error") == "credentials":
+                # Don't keep a token XboxUnity may no longer accept; try once more before
+                # deciding the saved credentials are wrong
+                self._borrar_token()
+                self._log("Login rejected, retrying once...")
+                detalles = {}
+                token = login_xboxunity(username, password, detalles)
+            if token:
+                self.token = token
+                if not auto:
+                    self.save_config(username, password, api_key, *consola)
+                    self._log("Login successful.")
+                self._guardar_token(username, token)
+            elif detalles.get("error") == "credentials":
+                self.delete_config()
+                if not auto:
+                    self._message_error("Error", "Could not login to XboxUnity. Check your credentials.")
+                else:
+                    self._log("WARNING: Automatic login to XboxUnity failed.")
+            else:
+                # XboxUnity unreachable or busy: the saved credentials are still good for the next attempt
+                if not auto:
+                    self._message_error("Error", "Could not reach XboxUnity to login. Check your internet connection.")
+                else:
+                    self._log("WARNING: Automatic login to XboxUnity failed (XboxUnity unreachable).")
+        finally:
+            self.login_listo.set()
 
     def select_folder(self):
         folder = filedialog.askdirectory(title="Select folder with games")
@@ -272,16 +396,47 @@ class XboxTUMApp:
             # Execute in thread to avoid blocking GUI
             threading.Thread(target=self._process_games, args=(folder,), daemon=True).start()
 
-    def _process_games(self, folder):
-        self.juegos.clear()
-        self.tree.delete(*self.tree.get_children())
-        
-        # Count XEX files first
+    def _buscar_xex(self, folder, visitadas=None):
+        """Paths of every default.xex under folder; `visitadas` collects the folders walked"""
         xex_files = []
         for root_dir, dirs, files in os.walk(folder):
+            if visitadas is not None:
+                visitadas.append(root_dir)
             for file in files:
                 if file.lower() == "default.xex":
                     xex_files.append(os.path.join(root_dir, file))
+        return xex_files
+
+    def _identificar_xex(self, xex_path, cache, log=None):
+        """Game entry for a default.xex (from the scan cache when unchanged); returns (game, cached)"""
+        from xex_reader import obtener_info_juego
+        log = log or self._log
+        game_name = os.path.basename(os.path.dirname(xex_path))
+        
+        # Unchanged games (same size/mtime) are not read again
+        game_info = cache.obtener(xex_path)
+        desde_cache = bool(game_info)
+        if not game_info:
+            log(f"Reading information from '{game_name}'...")
+            game_info = obtener_info_juego(xex_path)
+            if game_info and (game_info["media_id"] or game_info["title_id"]):
+                cache.registrar(xex_path, game_info["media_id"], game_info["title_id"])
+        if not game_info or not (game_info["media_id"] or game_info["title_id"]):
+            log(f"  ERROR: Could not read information from '{game_name}'")
+            return None, desde_cache
+        return {
+            "nombre": game_name,
+            "media_id": game_info["media_id"],
+            "title_id": game_info["title_id"],
+            "ruta": os.path.abspath(os.path.dirname(xex_path)),
+        }, desde_cache
+
+    def _process_games(self, folder):
+        self.lista_juegos.limpiar()
+        
+        # Count XEX files first
+        visitadas = []
+        xex_files = self._buscar_xex(folder, visitadas)
         
         if not xex_files:
             self._log("No default.xex files found in selected folder.")
@@ -291,44 +446,290 @@ class XboxTUMApp:
         self._log(f"Reading MediaID...please wait ({total_files} games found)")
         self._progress_set(value=0, maximum=total_files)
         
+        cache = obtener_cache_juegos()
+        desde_cache = 0
         for idx, xex_path in enumerate(xex_files, 1):
-            game_name = os.path.basename(os.path.dirname(xex_path))
-            self._log(f"Reading information from '{game_name}'...")
-            
-            game_info = obtener_info_juego(xex_path)
-            if game_info and (game_info["media_id"] or game_info["title_id"]):
-                media_id = game_info["media_id"] or "N/A"
-                title_id = game_info["title_id"] or "N/A"
-                self.juegos.append({
-                    "nombre": game_name, 
-                    "media_id": game_info["media_id"], 
-                    "title_id": game_info["title_id"]
-                })
-                self.tree.insert("", "end", values=(game_name, media_id, title_id))
-            else:
-                self._log(f"  ERROR: Could not read information from '{game_name}'")
+            juego, cacheado = self._identificar_xex(xex_path, cache)
+            desde_cache += cacheado
+            if juego:
+                self.lista_juegos.agregar(juego)
             
             self._progress_set(value=idx)
 
+        cache.guardar()
         self._progress_set(value=0)
+        if desde_cache:
+            self._log(f"{desde_cache} game(s) loaded from scan cache.")
         self._log(f"Detected {len(self.juegos)} games with valid information.")
+        self.sesion = {"origen": "folder", "carpeta": os.path.abspath(folder),
+                       "directorios": mtimes_directorios(folder, [j["ruta"] for j in self.juegos if j.get("ruta")],
+                                                         visitadas)}
+        self._guardar_sesion()
+
+    def _guardar_sesion(self):
+        guardar_sesion(list(self.juegos), **self.sesion)
+
+    def _restaurar_sesion(self):
+        """Load the last session's list, then rescan only the folders that changed since (GUI thread)
+
+        The snapshot is read and changed folders are rescanned on a worker thread, which
+        hands its results back through a queue polled here.
+        """
+        cola = queue.Queue()
+        generacion = self.lista_juegos.generacion()
+        threading.Thread(target=self._preparar_restauracion, args=(cola,), daemon=True).start()
+        self.root.after(RESTORE_POLL_MS, self._atender_restauracion, cola, generacion)
+
+    def _atender_restauracion(self, cola, generacion):
+        """Apply what the restore worker has produced so far (GUI thread)"""
+        while True:
+            try:
+                mensaje = cola.get_nowait()
+            except queue.Empty:
+                self.root.after(RESTORE_POLL_MS, self._atender_restauracion, cola, generacion)
+                return
+            tipo = mensaje[0]
+            if tipo == "fin":
+                return
+            if tipo == "log":
+                self._log(mensaje[1])
+            elif tipo == "sesion":
+                _, juegos, sesion, texto = mensaje
+                if not self.lista_juegos.reemplazar(juegos, generacion):
+                    return  # A scan was started meanwhile; its results win
+                generacion = self.lista_juegos.generacion()
+                self.sesion = sesion
+                self._log(texto)
+            elif tipo == "actualizada":
+                _, juegos, directorios, texto = mensaje
+                if not self.lista_juegos.reemplazar(juegos, generacion):
+                    return
+                self.sesion["directorios"] = directorios
+                self._log(texto)
+                threading.Thread(target=self._guardar_sesion, daemon=True).start()
+
+    def _preparar_restauracion(self, cola):
+        """Worker side of the restore: never touches Tk, only queues results"""
+        try:
+            self._leer_sesion_guardada(cola)
+        except Exception as e:
+            cola.put(("log", f"Could not restore last session: {e}"))
+        finally:
+            cola.put(("fin",))
+
+    def _leer_sesion_guardada(self, cola):
+        sesion = cargar_sesion()
+        if not sesion or not sesion["juegos"]:
+            return
+        juegos = sesion["juegos"]
+        consultados = [j for j in juegos if j.get("tu_consulta")]
+        detalle = ""
+        if consultados:
+            ultima = time.strftime("%Y-%m-%d %H:%M", time.localtime(max(j["tu_consulta"] for j in consultados)))
+            detalle = f", {sum(1 for j in consultados if j.get('tus'))} with TUs (last lookup {ultima})"
+        cola.put(("sesion", list(juegos), {"origen": sesion.get("origen"), "carpeta": sesion.get("carpeta"),
+                                           "directorios": sesion["directorios"]},
+                  f"Restored {len(juegos)} games from last session{detalle}."))
+
+        if sesion.get("origen") != "folder" or not sesion["directorios"]:
+            return
+        eliminadas, escanear = carpetas_a_reescanear(sesion["directorios"],
+                                                     {j["ruta"] for j in juegos if j.get("ruta")})
+        if not eliminadas and not escanear:
+            return
+
+        # Games in new or changed folders are identified again (mostly from the scan cache)
+        cache = obtener_cache_juegos()
+        anteriores = {j.get("ruta"): j for j in juegos}
+        juegos = [j for j in juegos if not any(dentro_de(j.get("ruta"), c) for c in eliminadas + escanear)]
+        visitadas = [c for c in sesion["directorios"] if not any(dentro_de(c, e) for e in eliminadas)]
+        for carpeta in escanear:
+            for xex_path in self._buscar_xex(carpeta, visitadas):
+                juego, _ = self._identificar_xex(xex_path, cache, log=lambda texto: cola.put(("log", texto)))
+                if juego:
+                    # Keep the TU status of games that are still there
+                    previo = anteriores.get(juego["ruta"])
+                    if previo and (previo["media_id"], previo["title_id"]) == (juego["media_id"], juego["title_id"]):
+                        juego = dict(previo, nombre=juego["nombre"])
+                    juegos.append(juego)
+        cache.guardar()
+        directorios = mtimes_directorios(sesion["carpeta"], [j["ruta"] for j in juegos if j.get("ruta")], visitadas)
+        cola.put(("actualizada", juegos, directorios,
+                  f"Library updated ({len(escanear)} folder(s) rescanned, {len(eliminadas)} removed): "
+                  f"{len(juegos)} games."))
+
+    def scan_console_games(self):
+        """Identify the games on the console's HDD over FTP, without copying them"""
+        from xbox_console import DEFAULT_GAMES_ROOT
+        xbox_ip = self.entry_xbox_ip.get().strip()
+        if not xbox_ip:
+            messagebox.showwarning("Warning", "Please enter Xbox 360 IP address and test FTP connection first.")
+            return
+
+        carpeta_remota = simpledialog.askstring("Scan Console Games",
+                                                "Games folder on the console (GOD games are scanned too):",
+                                                initialvalue=DEFAULT_GAMES_ROOT, parent=self.root)
+        if carpeta_remota is None:
+            return
+
+        consola = (xbox_ip, self.entry_ftp_user.get().strip(), self.entry_ftp_pass.get().strip())
+        # Execute in thread to avoid blocking GUI
+        threading.Thread(target=self._process_console_games, args=(consola, carpeta_remota.strip()),
+                         daemon=True).start()
+
+    def _process_console_games(self, consola, carpeta_remota):
+        """Read only the XEX/STFS headers of each game on the console (ranged RETR + ABOR)"""
+        from ftp_uploader import FTPUploadEngine
+        from xbox_console import escanear_juegos_remotos, escanear_juegos_god
+        self.lista_juegos.limpiar()
+
+        inicio = time.monotonic()
+        ftp = None
+        try:
+            ftp = FTPUploadEngine(*consola, log=self._log).conectar()
+            self._log(f"Connected to console at {consola[0]}")
+            self._progress_set(value=0, maximum=2)
+
+            encontrados = []
+            if carpeta_remota:
+                self._log(f"Reading MediaID from {carpeta_remota}...please wait")
+                encontrados += escanear_juegos_remotos(ftp, carpeta_remota, log=self._log)
+            self._progress_set(value=1)
+            self._log("Scanning Games on Demand...")
+            encontrados += escanear_juegos_god(ftp, log=self._log)
+            self._progress_set(value=2)
+        except Exception as e:
+            self._log(f"ERROR: Could not scan console: {e}")
+            self._message_error("FTP Error", f"Could not scan console: {e}")
+            self._progress_set(value=0)
+            return
+        finally:
+            if ftp is not None:
+                try:
+                    ftp.quit()
+                except Exception:
+                    pass
+
+        self.lista_juegos.agregar_varios([{
+            "nombre": juego["nombre"],
+            "media_id": juego["media_id"],
+            "title_id": juego["title_id"]
+        } for juego in encontrados])
+
+        self._progress_set(value=0)
+        self._log(f"Detected {len(self.juegos)} games on the console in {time.monotonic() - inicio:.1f}s.")
+        self.sesion = {"origen": "console", "carpeta": carpeta_remota, "directorios": {}}
+        self._guardar_sesion()
+
+    def import_dashboard_db(self):
+        """Load the game list from the dashboard's (Aurora/FSD) content database on the console"""
+        xbox_ip = self.entry_xbox_ip.get().strip()
+        if not xbox_ip:
+            messagebox.showwarning("Warning", "Please enter Xbox 360 IP address and test FTP connection first.")
+            return
+
+        consola = (xbox_ip, self.entry_ftp_user.get().strip(), self.entry_ftp_pass.get().strip())
+        # Execute in thread to avoid blocking GUI
+        threading.Thread(target=self._process_dashboard_db, args=(consola,), daemon=True).start()
+
+    def _process_dashboard_db(self, consola):
+        """Download the content database once and read the TitleID/MediaID pairs locally"""
+        from ftp_uploader import FTPUploadEngine
+        from dashboard_db import descargar_base_contenido, leer_base_contenido
+        ruta_local = None
+        try:
+            ftp = FTPUploadEngine(*consola, log=self._log).conectar()
+            try:
+                self._log(f"Connected to console at {consola[0]}, looking for dashboard database...")
+                ruta_local, ruta_remota = descargar_base_contenido(ftp, log=self._log)
+            finally:
+                try:
+                    ftp.quit()
+                except Exception:
+                    pass
+
+            if not ruta_local:
+                self._log("No Aurora/FSD content database found on the console.")
+                self._message_error("Error", "No Aurora/FSD content database found on the console.\n\n"
+                                             "Use 'Scan Console Games' instead.")
+                return
+
+            juegos = leer_base_contenido(ruta_local)
+        except Exception as e:
+            self._log(f"ERROR: Could not import dashboard database: {e}")
+            self._message_error("Error", f"Could not import dashboard database: {e}")
+            return
+        finally:
+            if ruta_local:
+                try:
+                    os.remove(ruta_local)
+                except OSError:
+                    pass
+
+        if juegos is None:
+            self._log(f"ERROR: {ruta_remota} has no recognizable content table.")
+            return
+
+        self.lista_juegos.limpiar()
+        self.lista_juegos.agregar_varios(juegos)
+        self._log(f"Detected {len(self.juegos)} games from the dashboard database.")
+        self.sesion = {"origen": "dashboard", "carpeta": ruta_remota, "directorios": {}}
+        self._guardar_sesion()
 
     def buscar_y_descargar_tus(self):
         if not self.juegos:
             messagebox.showerror("Error", "No games detected. Select the folder first.")
             return
-        if not self.token and not self.api_key:
+        # A login still running in the background is awaited by the worker
+        if not self.token and not self.api_key and self.login_listo.is_set():
             messagebox.showerror("Error", "You must login or enter API Key")
             return
 
-        carpeta_destino = filedialog.askdirectory(title="Select folder to save TUs")
-        if not carpeta_destino:
-            return
+        consola = None
+        directo = self.ftp_direct.get()
+        omitir_instalados = self.ftp_skip_installed.get()
+        if directo or omitir_instalados:
+            xbox_ip = self.entry_xbox_ip.get().strip()
+            if not xbox_ip:
+                messagebox.showwarning("Warning", "Please enter Xbox 360 IP address and test FTP connection first.")
+                return
+            consola = (xbox_ip, self.entry_ftp_user.get().strip(), self.entry_ftp_pass.get().strip())
+
+        if directo:
+            carpeta_destino = None
+            if messagebox.askyesno("Local copy", "TUs will be sent straight to the console.\n\n"
+                                                 "Also keep a local copy for archiving?"):
+                carpeta_destino = filedialog.askdirectory(title="Select folder to archive TUs")
+                if not carpeta_destino:
+                    return
+        else:
+            carpeta_destino = filedialog.askdirectory(title="Select folder to save TUs")
+            if not carpeta_destino:
+                return
 
         # Execute in thread to avoid blocking GUI
-        threading.Thread(target=self._procesar_tus, args=(carpeta_destino,), daemon=True).start()
+        threading.Thread(target=self._procesar_tus, args=(carpeta_destino, consola, directo, omitir_instalados),
+                         daemon=True).start()
+
+    def _procesar_tus(self, carpeta_destino, consola=None, directo=False, omitir_instalados=False):
+        """Search and download TUs
+
+        `consola` is (ip, user, pass). With `directo` TUs are streamed to the console instead of
+        (or besides) the local folder; with `omitir_instalados` (always in direct mode) TUs the
+        console already has are skipped.
+        """
+        from xboxunity_api import buscar_tus, descargar_tu
+        from tu_manifest import obtener_manifest
+        from ftp_uploader import FTPUploadEngine
+        from xbox_console import escanear_tus_instalados
+        if not self.login_listo.is_set():
+            self._log("Waiting for XboxUnity login to finish...")
+            self.login_listo.wait()
+        if not self.token and not self.api_key:
+            self._log("ERROR: Not logged in to XboxUnity.")
+            self._message_error("Error", "You must login or enter API Key")
+            return
 
-    def _procesar_tus(self, carpeta_destino):
         total_juegos = len(self.juegos)
         juegos_con_tu = 0
         total_tus_descargados = 0
@@ -337,6 +738,29 @@ class XboxTUMApp:
         self._log("Starting TU search and download...\n")
         self._progress_set(value=0, maximum=total_juegos)
 
+        conexion = None
+        inventario = None
+        tus_omitidos = 0
+        if consola:
+            conexion = {'engine': FTPUploadEngine(*consola, log=self._log), 'ftp': None}
+            try:
+                conexion['ftp'] = conexion['engine'].conectar()
+                self._log(f"Connected to console at {consola[0]}")
+                if directo or omitir_instalados:
+                    self._log("Scanning TUs installed on console...")
+                    inventario = escanear_tus_instalados(conexion['ftp'], log=self._log)
+                if directo:
+                    self._log("TUs will be streamed directly to the console\n")
+                else:
+                    # The inventory is all we needed from the console
+                    conexion['ftp'].quit()
+                    conexion = None
+            except Exception as e:
+                self._log(f"ERROR: Could not connect to console: {e}")
+                self._message_error("FTP Error", f"Could not connect to console: {e}")
+                self._progress_set(value=0)
+                return
+
         for idx, juego in enumerate(self.juegos, 1):
             nombre = juego["nombre"]
             media_id = juego["media_id"]
@@ -352,6 +776,9 @@ class XboxTUMApp:
             self._log(f"Searching TUs for '{nombre}' ({ids_str})...")
 
             tus = buscar_tus(media_id=media_id, title_id=title_id, token=self.token, api_key=self.api_key)
+            # TU status is kept with the game in the session snapshot
+            juego["tus"] = len(tus) if tus is not None else None
+            juego["tu_consulta"] = time.time()
             if tus is None:
                 self._log(f"  ERROR querying TUs for {nombre}.")
                 errores += 1
@@ -368,38 +795,73 @@ class XboxTUMApp:
 
             # Crear carpeta para el juego
             nombre_carpeta = self._limpiar_nombre_archivo(nombre)
-            carpeta_juego = os.path.join(carpeta_destino, nombre_carpeta)
+            carpeta_juego = os.path.join(carpeta_destino, nombre_carpeta) if carpeta_destino else None
             
-            try:
-                os.makedirs(carpeta_juego, exist_ok=True)
-                self._log(f"  Folder created: {nombre_carpeta}")
-            except Exception as e:
-                self._log(f"  ERROR creating folder for {nombre}: {e}")
-                errores += 1
-                self._progress_set(value=idx)
-                continue
+            if carpeta_juego:
+                try:
+                    os.makedirs(carpeta_juego, exist_ok=True)
+                    self._log(f"  Folder created: {nombre_carpeta}")
+                except Exception as e:
+                    self._log(f"  ERROR creating folder for {nombre}: {e}")
+                    errores += 1
+                    self._progress_set(value=idx)
+                    continue
 
+            manifest = obtener_manifest()
             for tu in tus:
                 filename = tu["fileName"]
                 url = tu["downloadUrl"]
+
+                if inventario is not None and self._tu_en_consola(manifest, inventario, tu, juego):
+                    self._log(f"    TU v{tu.get('version', '?')} already installed on console, skipping")
+                    tus_omitidos += 1
+                    continue
+
+                if conexion:
+                    if self._transmitir_tu_a_consola(conexion, tu, juego, carpeta_juego):
+                        total_tus_descargados += 1
+                    else:
+                        errores += 1
+                    continue
+
                 destino = os.path.join(carpeta_juego, filename)
 
+                # Skip TUs the manifest already has on disk in this folder
+                previo = self._tu_ya_descargado(manifest, tu, carpeta_juego)
+                if previo:
+                    self._log(f"    {previo['archivo']} already downloaded, skipping")
+                    total_tus_descargados += 1
+                    continue
+
                 def actualizar_progreso(descargado, total):
                     if total > 0:
                         porcentaje = (descargado / total) * 100
                         self._progress_set(maximum=100, value=porcentaje)
 
                 self._log(f"    Downloading {filename} to {nombre_carpeta}/...")
-                exito, original_filename = descargar_tu(url, destino, progreso_callback=actualizar_progreso)
+                detalles = {}
+                exito, original_filename = descargar_tu(url, destino, progreso_callback=actualizar_progreso,
+                                                        detalles=detalles)
                 if exito:
                     actual_filename = original_filename if original_filename else filename
                     self._log(f"    Downloaded {actual_filename} successfully to {nombre_carpeta}/")
                     
-                    # Create a mapping file to track original filename -> TitleID relationship
-                    if original_filename and original_filename != filename:
-                        mapping_file = os.path.join(carpeta_juego, ".tu_mapping.txt")
-                        with open(mapping_file, "a", encoding="utf-8") as f:
-                            f.write(f"{original_filename}={juego['title_id']}={juego['nombre']}\n")
+                    # Record the TU in the manifest (filename -> TitleID, MediaID, game, version...)
+                    try:
+                        ruta_tu = detalles.get('ruta', os.path.join(carpeta_juego, actual_filename))
+                        clasificacion = self._clasificar_tu(ruta_tu, juego['title_id'])
+                        manifest.registrar_tu(
+                            ruta_tu,
+                            title_id=clasificacion['title_id'],
+                            media_id=tu.get('mediaId') or juego['media_id'],
+                            nombre_juego=juego['nombre'],
+                            version=clasificacion['version'] or tu.get('version'),
+                            tipo=clasificacion['tipo'],
+                            hash_md5=detalles.get('md5'),
+                            tu_id=tu.get('titleUpdateId'),
+                            cabecera=clasificacion['cabecera'])
+                    except Exception as e:
+                        self._log(f"    WARNING: Could not record {actual_filename} in TU manifest: {e}")
                     
                     total_tus_descargados += 1
                 else:
@@ -408,44 +870,179 @@ class XboxTUMApp:
 
             self._progress_set(maximum=total_juegos, value=idx)
 
+        if conexion and conexion['ftp']:
+            try:
+                conexion['ftp'].quit()
+            except Exception:
+                conexion['ftp'].close()
+
         self._log("\nSummary:\n")
         self._log(f"Games processed: {total_juegos}")
         self._log(f"Games with TUs found: {juegos_con_tu}")
         self._log(f"TUs downloaded: {total_tus_descargados}")
+        if inventario is not None:
+            self._log(f"TUs already on console (skipped): {tus_omitidos}")
         self._log(f"Errors: {errores}")
         self._progress_set(value=0)
+        self._guardar_sesion()
 
         self._message_info("Process completed", "TU search and download has finished.")
 
+    def _transmitir_tu_a_consola(self, conexion, tu, juego, carpeta_juego=None):
+        """Stream one TU from XboxUnity straight into the console over FTP
+
+        The header is peeked from the first chunks to pick Cache vs Content, the MD5 is
+        computed in flight and checked against XboxUnity's hash, and `carpeta_juego`
+        (if given) receives a local archive copy.
+        """
+        from xboxunity_api import abrir_descarga_tu
+        from tu_manifest import obtener_manifest
+        from tu_header import analizar_cabecera_tu, HEADER_READ_SIZE
+        from ftp_uploader import formatear_velocidad
+        engine = conexion['engine']
+        r, nombre_tu, total = abrir_descarga_tu(tu["downloadUrl"], tu["fileName"])
+        if r is None:
+            self._log(f"    ERROR downloading {tu['fileName']}.")
+            return False
+        
+        ruta_copia = os.path.join(carpeta_juego, nombre_tu) if carpeta_juego else None
+        dir_remoto = None
+        try:
+            trozos = r.iter_content(chunk_size=64 * 1024)
+            
+            # Peek the STFS header to decide where the TU goes
+            cabecera = b""
+            for bloque in trozos:
+                cabecera += bloque
+                if len(cabecera) >= HEADER_READ_SIZE:
+                    break
+            info = analizar_cabecera_tu(cabecera)
+            tipo_tu = info['tipo'] if info else self._detectar_tipo_tu(nombre_tu)
+            title_id = (info and info['title_id']) or juego['title_id']
+            if tipo_tu == 'cache':
+                dir_remoto = "/Hdd1/Cache"
+            else:
+                dir_remoto = f"/Hdd1/Content/0000000000000000/{title_id}/000B0000"
+            
+            def todos_los_trozos():
+                yield cabecera
+                yield from trozos
+            
+            def actualizar_progreso(enviados, total_bytes):
+                if total_bytes > 0:
+                    self._progress_set(maximum=100, value=(enviados / total_bytes) * 100)
+            
+            engine.progreso_callback = actualizar_progreso
+            
+            # The HTTP stream can't be replayed, so make sure the FTP session is alive first
+            try:
+                conexion['ftp'].voidcmd("NOOP")
+            except Exception:
+                self._log("    Reconnecting to console...")
+                conexion['ftp'] = None
+                conexion['ftp'] = engine.conectar()
+            
+            self._log(f"    Streaming {nombre_tu} to {dir_remoto}/...")
+            inicio = time.monotonic()
+            enviados, md5 = engine.subir_stream(conexion['ftp'], todos_los_trozos(), dir_remoto,
+                                                nombre_tu, ruta_copia=ruta_copia, total=total)
+            duracion = time.monotonic() - inicio
+        except Exception as e:
+            self._log(f"    ERROR streaming {nombre_tu}: {e}")
+            self._borrar_tu_remoto(conexion, dir_remoto, nombre_tu)
+            if ruta_copia and os.path.exists(ruta_copia):
+                os.remove(ruta_copia)
+            return False
+        finally:
+            r.close()
+        
+        # Verify in-flight hash/size (XboxUnity publishes an MD5 for each TU)
+        hash_esperado = str(tu.get('hash') or '').lower()
+        if (total and enviados != total) or (len(hash_esperado) == 32 and md5 != hash_esperado):
+            self._log(f"    ERROR: {nombre_tu} failed verification (size/MD5 mismatch), removing it")
+            self._borrar_tu_remoto(conexion, dir_remoto, nombre_tu)
+            if ruta_copia and os.path.exists(ruta_copia):
+                os.remove(ruta_copia)
+            return False
+        
+        self._log(f"    ✅ {nombre_tu} installed on console ({formatear_velocidad(enviados, duracion)})")
+        if ruta_copia:
+            try:
+                obtener_manifest().registrar_tu(
+                    ruta_copia, title_id=title_id, media_id=tu.get('mediaId') or juego['media_id'],
+                    nombre_juego=juego['nombre'], version=(info and info['version']) or tu.get('version'), tipo=tipo_tu,
+                    hash_md5=md5, tu_id=tu.get('titleUpdateId'), cabecera=info['formato'] if info else None)
+            except Exception as e:
+                self._log(f"    WARNING: Could not record {nombre_tu} in TU manifest: {e}")
+        return True
+
+    def _tu_en_consola(self, manifest, inventario, tu, juego):
+        """Check a search result against the console inventory"""
+        from xbox_console import tu_instalada
+        try:
+            tamano = int(tu.get("size") or 0)
+        except (TypeError, ValueError):
+            tamano = 0
+        # Filenames are only known after a download, so use the names the manifest has seen
+        nombres = set()
+        if tu.get("titleUpdateId"):
+            nombres = {r['archivo'] for r in manifest.buscar_por_tu_id(tu["titleUpdateId"])}
+        return tu_instalada(inventario, juego['title_id'], tamano, nombres)
+
+    def _borrar_tu_remoto(self, conexion, dir_remoto, nombre_tu):
+        from ftplib import error_perm
+        if not dir_remoto or conexion['ftp'] is None:
+            return
+        try:
+            conexion['ftp'].delete(f"{dir_remoto}/{nombre_tu}")
+        except error_perm:
+            pass  # Nothing was written
+        except Exception:
+            # A failed transfer can leave the session closed: delete over a fresh one
+            try:
+                conexion['ftp'].close()
+                conexion['ftp'] = conexion['engine'].conectar()
+                conexion['ftp'].delete(f"{dir_remoto}/{nombre_tu}")
+            except Exception as e:
+                self._log(f"    WARNING: Could not remove partial {nombre_tu} from console: {e}")
+
+    def _tu_ya_descargado(self, manifest, tu, carpeta_juego):
+        """Return the manifest entry of an identical TU already stored in carpeta_juego, if any"""
+        tu_id = tu.get("titleUpdateId")
+        if not tu_id:
+            return None
+        try:
+            tamano_esperado = int(tu.get("size") or 0)
+        except (TypeError, ValueError):
+            tamano_esperado = 0
+        for registro in manifest.buscar_por_tu_id(tu_id, carpeta_juego):
+            try:
+                tamano = os.path.getsize(registro['ruta'])
+            except OSError:
+                continue
+            if not tamano_esperado or tamano == tamano_esperado:
+                return registro
+        return None
+
     def copy_media_id(self):
-        self._copy_id_from_tree(1, "MediaID")
+        self._copy_id_from_tree("media_id", "MediaID")
 
     def copy_title_id(self):
-        self._copy_id_from_tree(2, "TitleID")
+        self._copy_id_from_tree("title_id", "TitleID")
     
-    def _copy_id_from_tree(self, column_index, id_type):
-        """Generic function to copy ID from tree view"""
-        # Get selected item
-        selected_items = self.tree.selection()
-        if not selected_items:
-            # If no selection, use focused item
-            item = self.tree.focus()
-            if not item:
-                messagebox.showwarning("Warning", "Please select a game from the list")
-                return
-        else:
-            item = selected_items[0]
+    def _copy_id_from_tree(self, key, id_type):
+        """Generic function to copy an ID of the selected game (read from the model)"""
+        juego = self.lista_juegos.seleccionado()
+        if not juego:
+            messagebox.showwarning("Warning", "Please select a game from the list")
+            return
         
         try:
-            values = self.tree.item(item)["values"]
-            if len(values) >= column_index + 1:
-                id_value = str(values[column_index]).strip()
-                if id_value and id_value != "N/A" and id_value != "":
-                    self._copiar_al_portapapeles(id_value, id_type)
-                else:
-                    messagebox.showwarning("Warning", f"This game doesn't have {id_type} available")
+            id_value = str(juego.get(key) or "").strip()
+            if id_value and id_value != "N/A":
+                self._copiar_al_portapapeles(id_value, id_type)
             else:
-                messagebox.showwarning("Error", "Could not get game information")
+                messagebox.showwarning("Warning", f"This game doesn't have {id_type} available")
         except Exception as e:
             messagebox.showerror("Error", f"Error copying {id_type}: {e}")
 
@@ -528,9 +1125,7 @@ class XboxTUMApp:
         return nombre_limpio
 
     def mostrar_menu(self, event):
-        item = self.tree.identify_row(event.y)
-        if item:
-            self.tree.selection_set(item)
+        if self.lista_juegos.seleccionar_en(event.y):
             self.menu_popup.post(event.x_root, event.y_root)
 
     def exportar_lista_html(self):
@@ -959,71 +1554,177 @@ class XboxTUMApp:
         
         return None
     
-    def _cargar_mapeo_tus(self, carpeta_base):
-        """Load TU filename to TitleID mapping from .tu_mapping.txt files"""
-        mapeo = {}
-        try:
-            for root, dirs, files in os.walk(carpeta_base):
-                if ".tu_mapping.txt" in files:
-                    mapping_file = os.path.join(root, ".tu_mapping.txt")
-                    with open(mapping_file, "r", encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if "=" in line:
-                                parts = line.split("=")
-                                if len(parts) >= 3:
-                                    filename = parts[0]
-                                    title_id = parts[1]
-                                    game_name = parts[2]
-                                    mapeo[filename] = {'title_id': title_id, 'game_name': game_name}
-        except Exception as e:
-            self._log(f"Error loading TU mapping: {e}")
-        return mapeo
+    def _indexar_carpeta_tus(self, carpeta_base):
+        """Add TU files the manifest doesn't know yet (legacy folders or files copied by hand)
+
+        The manifest keeps the mtime of every directory it has scanned. Only directories
+        whose mtime changed (a file was added, removed or renamed) and new directories
+        are listed again; everything else is answered from the manifest.
+        """
+        from tu_manifest import obtener_manifest, LEGACY_MAPPING_FILE
+        manifest = obtener_manifest()
+        indexadas = manifest.carpetas_indexadas(carpeta_base)
+        pendientes = [carpeta_base] if not indexadas else []
+        for carpeta, mtime_ns in indexadas.items():
+            try:
+                if os.stat(carpeta).st_mtime_ns != mtime_ns:
+                    pendientes.append(carpeta)
+            except OSError:
+                manifest.olvidar_carpeta(carpeta)
+        if not pendientes:
+            return manifest.tus_en_carpeta(carpeta_base)
+
+        conocidos = {r['ruta'] for r in manifest.tus_en_carpeta(carpeta_base)}
+        while pendientes:
+            carpeta = pendientes.pop()
+            nueva = os.path.normcase(os.path.abspath(carpeta)) not in indexadas
+            try:
+                mtime_ns = os.stat(carpeta).st_mtime_ns
+                with os.scandir(carpeta) as it:
+                    entradas = list(it)
+            except OSError as e:
+                self._log(f"Error indexing TU folder {carpeta}: {e}")
+                continue
+
+            # Import legacy .tu_mapping.txt files written by older versions (new folders only,
+            # re-importing would overwrite what the manifest learned since)
+            if nueva and any(e.name == LEGACY_MAPPING_FILE for e in entradas):
+                try:
+                    manifest.importar_mapeo_legacy(os.path.join(carpeta, LEGACY_MAPPING_FILE))
+                except Exception as e:
+                    self._log(f"Error importing legacy TU mapping: {e}")
+                conocidos = {r['ruta'] for r in manifest.tus_en_carpeta(carpeta_base)}
+
+            for entrada in entradas:
+                try:
+                    es_carpeta = entrada.is_dir()
+                except OSError:
+                    continue
+                if es_carpeta:
+                    # Never index the generated USB copy as a second set of TUs
+                    if (entrada.name != "USB_Xbox360"
+                            and os.path.normcase(os.path.abspath(entrada.path)) not in indexadas):
+                        pendientes.append(entrada.path)
+                    continue
+                if (not self._es_archivo_tu(entrada.name)
+                        or os.path.normcase(os.path.abspath(entrada.path)) in conocidos):
+                    continue
+                try:
+                    clasificacion = self._clasificar_tu(entrada.path)
+                    title_id = clasificacion['title_id']
+                    juego_info = self._buscar_juego_por_title_id(title_id)
+                    manifest.registrar_tu(
+                        entrada.path,
+                        title_id=title_id,
+                        media_id=juego_info.get('media_id') if juego_info else clasificacion['media_id'],
+                        nombre_juego=juego_info.get('nombre') if juego_info else None,
+                        version=clasificacion['version'],
+                        tipo=clasificacion['tipo'],
+                        cabecera=clasificacion['cabecera'])
+                except Exception as e:
+                    self._log(f"Error indexing TU {entrada.name}: {e}")
+            manifest.marcar_carpeta(carpeta, mtime_ns)
+        return manifest.tus_en_carpeta(carpeta_base)
+    
+    def _inventario_tus_locales(self, carpeta_base):
+        """List TUs under a folder from the manifest, indexing files it hasn't seen yet"""
+        from tu_manifest import obtener_manifest, md5_archivo
+        manifest = obtener_manifest()
+        registros = self._indexar_carpeta_tus(carpeta_base)
+        
+        inventario = []
+        for registro in registros:
+            try:
+                st = os.stat(registro['ruta'])
+            except OSError:
+                continue
+            
+            # Classify and hash once per file identity; the result is kept in the manifest.
+            # STFS entries without a version were classified before the version was stored.
+            cambiado = registro['tamano'] != st.st_size or registro['mtime_ns'] != st.st_mtime_ns
+            if (cambiado or not registro['cabecera'] or not registro['hash']
+                    or (registro['cabecera'] not in ('raw', 'filename') and not registro['version'])):
+                clasificacion = self._clasificar_tu(registro['ruta'], registro['title_id'])
+                campos = {
+                    'tipo': clasificacion['tipo'],
+                    'title_id': clasificacion['title_id'],
+                    'media_id': registro['media_id'] or clasificacion['media_id'],
+                    'version': clasificacion['version'] or registro['version'],
+                    'tamano': st.st_size,
+                    'mtime_ns': st.st_mtime_ns,
+                    'cabecera': clasificacion['cabecera'] or 'filename',
+                }
+                if cambiado or not registro['hash']:
+                    try:
+                        campos['hash'] = md5_archivo(registro['ruta'])
+                    except OSError:
+                        pass
+                manifest.actualizar_campos(registro['ruta'], **campos)
+                registro.update(campos)
+            
+            if not registro['title_id']:
+                registro['title_id'] = self._extraer_title_id_de_archivo(registro['archivo'])
+            if not registro['tipo']:
+                registro['tipo'] = self._detectar_tipo_tu(registro['archivo'])
+            inventario.append(registro)
+        return inventario
+    
+    def _clasificar_tu(self, ruta, title_id_conocido=None):
+        """Get TU type and TitleID from the STFS header, falling back to known data and filename patterns"""
+        from tu_header import leer_cabecera_tu
+        archivo = os.path.basename(ruta)
+        cabecera = leer_cabecera_tu(ruta)
+        if cabecera:
+            return {
+                'tipo': cabecera['tipo'],
+                'title_id': (cabecera['title_id'] or title_id_conocido
+                             or self._extraer_title_id_de_archivo(archivo)),
+                'media_id': cabecera['media_id'],
+                'version': cabecera['version'],
+                'cabecera': cabecera['formato'],
+            }
+        return {
+            'tipo': self._detectar_tipo_tu(archivo),
+            'title_id': title_id_conocido or self._extraer_title_id_de_archivo(archivo),
+            'media_id': None,
+            'version': None,
+            'cabecera': None,
+        }
+    
+    def _buscar_juego_por_title_id(self, title_id):
+        if not title_id:
+            return None
+        for juego in self.juegos:
+            if juego.get('title_id') == title_id:
+                return juego
+        return None
     
     def _buscar_tus_descargados(self, carpeta_base):
         """Search for downloaded TU files in folder structure"""
         tus_encontrados = []
         
         try:
-            # Load mapping from .tu_mapping.txt files
-            mapeo_tus = self._cargar_mapeo_tus(carpeta_base)
-            
-            for root, dirs, files in os.walk(carpeta_base):
-                for file in files:
-                    if self._es_archivo_tu(file):
-                        ruta_completa = os.path.join(root, file)
-                        
-                        # Try to get TitleID from mapping first
-                        title_id = None
-                        game_name = None
-                        
-                        if file in mapeo_tus:
-                            title_id = mapeo_tus[file]['title_id']
-                            game_name = mapeo_tus[file]['game_name']
-                        else:
-                            # Fallback to filename extraction
-                            title_id = self._extraer_title_id_de_archivo(file)
-                        
-                        # Find corresponding game in our list
-                        juego_info = None
-                        if title_id:
-                            for juego in self.juegos:
-                                if juego.get('title_id') == title_id:
-                                    juego_info = juego
-                                    break
-                        
-                        if juego_info:
-                            tus_encontrados.append({
-                                'archivo': file,
-                                'ruta_completa': ruta_completa,
-                                'title_id': title_id,
-                                'media_id': juego_info.get('media_id'),
-                                'nombre_juego': juego_info.get('nombre')
-                            })
-                        else:
-                            # Log unmatched TUs
-                            self._log(f"TU found but no matching game: {file} (TitleID: {title_id})")
-                            
+            for registro in self._inventario_tus_locales(carpeta_base):
+                file = registro['archivo']
+                title_id = registro['title_id']
+                
+                # Find corresponding game in our list, falling back to the game recorded in the manifest
+                juego_info = self._buscar_juego_por_title_id(title_id)
+                nombre_juego = juego_info.get('nombre') if juego_info else registro['nombre_juego']
+                
+                if title_id and nombre_juego:
+                    tus_encontrados.append({
+                        'archivo': file,
+                        'ruta_completa': registro['ruta'],
+                        'title_id': title_id,
+                        'media_id': juego_info.get('media_id') if juego_info else registro['media_id'],
+                        'nombre_juego': nombre_juego,
+                        'tipo': registro['tipo']
+                    })
+                else:
+                    # Log unmatched TUs
+                    self._log(f"TU found but no matching game: {file} (TitleID: {title_id})")
+                    
             return tus_encontrados
             
         except Exception as e:
@@ -1076,7 +1777,7 @@ class XboxTUMApp:
                     nombre_juego = tu_info['nombre_juego']
                     
                     # Detect TU type
-                    tipo_tu = self._detectar_tipo_tu(archivo)
+                    tipo_tu = tu_info.get('tipo') or self._detectar_tipo_tu(archivo)
                     
                     self._log(f"Processing TU for '{nombre_juego}' (TitleID: {title_id})...")
                     self._log(f"  📁 TU Type: {tipo_tu.upper()} - {archivo}")
@@ -1176,6 +1877,7 @@ class XboxTUMApp:
 
     def test_ftp_connection(self):
         """Test FTP connection to Xbox 360"""
+        from ftplib import FTP
         xbox_ip = self.entry_xbox_ip.get().strip()
         ftp_user = self.entry_ftp_user.get().strip()
         ftp_pass = self.entry_ftp_pass.get().strip()
@@ -1232,39 +1934,58 @@ class XboxTUMApp:
             return
         
         # Execute in thread to avoid blocking GUI
-        threading.Thread(target=self._upload_tus_to_xbox, args=(carpeta_tus, xbox_ip, ftp_user, ftp_pass), daemon=True).start()
+        simulacion = self.ftp_dry_run.get()
+        threading.Thread(target=self._upload_tus_to_xbox, args=(carpeta_tus, xbox_ip, ftp_user, ftp_pass, simulacion),
+                         daemon=True).start()
+
+    def _upload_tus_to_xbox(self, carpeta_tus, xbox_ip, ftp_user, ftp_pass, simulacion=False):
+        """Upload TUs to Xbox 360 via FTP - threaded function
 
-    def _upload_tus_to_xbox(self, carpeta_tus, xbox_ip, ftp_user, ftp_pass):
-        """Upload TUs to Xbox 360 via FTP - threaded function"""
+        Only files missing on the console (or with a different size) are sent.
+        """
+        from ftp_uploader import FTPUploadEngine, DEFAULT_BLOCK_SIZE
         try:
             self._log("Starting upload to Xbox 360...")
             self._log(f"Connecting to {xbox_ip}...")
             
-            # Connect to FTP
-            ftp = FTP()
-            ftp.connect(xbox_ip, 21, timeout=30)
-            
-            if ftp_user and ftp_pass:
-                ftp.login(ftp_user, ftp_pass)
-                self._log(f"Logged in as: {ftp_user}")
-            else:
-                ftp.login()
-                self._log("Logged in anonymously")
-            
-            # Navigate to Hdd1
-            ftp.cwd('/Hdd1')
-            self._log("Navigated to /Hdd1")
-            
             # Check if it's a USB_Xbox360 structure or individual files
             usb_structure_path = os.path.join(carpeta_tus, "USB_Xbox360")
             if os.path.exists(usb_structure_path):
                 self._log("Detected USB_Xbox360 structure")
-                self._upload_usb_structure(ftp, usb_structure_path)
+                trabajos = self._plan_usb_structure_upload(usb_structure_path)
             else:
                 self._log("Detected individual TU files")
-                self._upload_individual_files(ftp, carpeta_tus)
+                trabajos = self._plan_individual_files_upload(carpeta_tus)
+            
+            if not trabajos:
+                self._log("No TU files to upload.")
+                self._message_info("Upload", "No TU files found to upload.")
+                return
+            
+            def actualizar_progreso(enviados, total):
+                if total > 0:
+                    self._progress_set(maximum=100, value=(enviados / total) * 100)
+            
+            engine = FTPUploadEngine(xbox_ip, ftp_user, ftp_pass, log=self._log,
+                                     progreso_callback=actualizar_progreso,
+                                     tamano_bloque=self.ftp_block_size or DEFAULT_BLOCK_SIZE,
+                                     usar_sendfile=self.ftp_use_sendfile)
+            resumen = engine.subir(trabajos, simulacion=simulacion)
+            self._progress_set(value=0)
+            
+            if simulacion:
+                self._report_dry_run(resumen)
+                return
+            
+            self._log(f"Total files uploaded: {resumen['archivos']}")
+            if resumen['omitidos']:
+                self._log(f"Skipped (already on console): {len(resumen['omitidos'])}")
+            if resumen['errores']:
+                error_msg = f"{len(resumen['errores'])} file(s) could not be uploaded. Check the log for details."
+                self._log(error_msg)
+                self._message_error("Upload Error", error_msg)
+                return
             
-            ftp.quit()
             self._log("Upload completed successfully! ✅")
             self._message_info("Success", "TUs uploaded to Xbox 360 successfully!")
             
@@ -1273,120 +1994,54 @@ class XboxTUMApp:
             self._log(error_msg)
             self._message_error("Upload Error", error_msg)
 
-    def _upload_usb_structure(self, ftp, usb_path):
-        """Upload from USB_Xbox360 structure"""
-        content_path = os.path.join(usb_path, "Content")
-        cache_path = os.path.join(usb_path, "Cache")
-        
-        uploaded_files = 0
-        
-        # Upload Content TUs
-        if os.path.exists(content_path):
-            self._log("Uploading Content TUs...")
-            self._ensure_ftp_dir(ftp, "Content")
-            uploaded_files += self._upload_directory_recursive(ftp, content_path, "Content")
-        
-        # Upload Cache TUs
-        if os.path.exists(cache_path):
-            self._log("Uploading Cache TUs...")
-            self._ensure_ftp_dir(ftp, "Cache")
-            uploaded_files += self._upload_directory_recursive(ftp, cache_path, "Cache")
-        
-        self._log(f"Total files uploaded: {uploaded_files}")
-
-    def _upload_individual_files(self, ftp, carpeta_tus):
-        """Upload individual TU files, detecting type automatically"""
-        uploaded_files = 0
-        
-        for root, dirs, files in os.walk(carpeta_tus):
-            for file in files:
-                if self._es_archivo_tu(file):
-                    ruta_local = os.path.join(root, file)
-                    tipo_tu = self._detectar_tipo_tu(file)
-                    
-                    self._log(f"Uploading {file} to {tipo_tu.upper()}...")
-                    
-                    if tipo_tu == 'cache':
-                        self._ensure_ftp_dir(ftp, "Cache")
-                        ftp.cwd('/Hdd1/Cache')
-                        with open(ruta_local, 'rb') as f:
-                            ftp.storbinary(f'STOR {file}', f)
-                    else:
-                        # For content TUs, we need TitleID
-                        title_id = self._extraer_title_id_de_archivo(file)
-                        if title_id:
-                            content_path = f"Content/0000000000000000/{title_id}/000B0000"
-                            self._ensure_ftp_dir_recursive(ftp, content_path)
-                            ftp.cwd(f'/Hdd1/{content_path}')
-                            with open(ruta_local, 'rb') as f:
-                                ftp.storbinary(f'STOR {file}', f)
-                        else:
-                            self._log(f"Warning: Could not determine TitleID for {file}, skipping")
-                            continue
-                    
-                    uploaded_files += 1
-                    self._log(f"✅ Uploaded: {file}")
-        
-        self._log(f"Total files uploaded: {uploaded_files}")
+    def _report_dry_run(self, resumen):
+        """Log what an upload would transfer without sending anything"""
+        pendientes = resumen['pendientes']
+        total_bytes = sum(os.path.getsize(ruta) for ruta, _ in pendientes)
+        self._log("\n" + "="*50)
+        self._log("DRY RUN - NOTHING WAS UPLOADED")
+        self._log("="*50)
+        for ruta_local, dir_remoto in pendientes:
+            self._log(f"  Would upload: {os.path.basename(ruta_local)} -> {dir_remoto}/")
+        for ruta_local, dir_remoto in resumen['omitidos']:
+            self._log(f"  Already on console: {os.path.basename(ruta_local)} ({dir_remoto}/)")
+        self._log(f"Files to upload: {len(pendientes)} ({total_bytes / (1024 * 1024):.1f} MB)")
+        self._log(f"Files already on console: {len(resumen['omitidos'])}")
+        self._message_info(
+            "Upload Preview",
+            f"Files to upload: {len(pendientes)} ({total_bytes / (1024 * 1024):.1f} MB)\n"
+            f"Already on console: {len(resumen['omitidos'])}\n\n"
+            f"See the log for the full list."
+        )
 
-    def _upload_directory_recursive(self, ftp, local_path, remote_base):
-        """Upload directory recursively"""
-        uploaded_files = 0
-        
-        for root, dirs, files in os.walk(local_path):
-            # Calculate relative path
-            rel_path = os.path.relpath(root, local_path)
-            if rel_path == '.':
-                remote_path = remote_base
+    def _plan_usb_structure_upload(self, usb_path):
+        """Build (local file, remote dir) upload jobs from a USB_Xbox360 structure"""
+        trabajos = []
+        for carpeta in ("Content", "Cache"):
+            local_base = os.path.join(usb_path, carpeta)
+            if not os.path.exists(local_base):
+                continue
+            for root, dirs, files in os.walk(local_base):
+                dirs.sort()
+                rel_path = os.path.relpath(root, usb_path).replace(os.sep, '/')
+                for file in sorted(files):
+                    trabajos.append((os.path.join(root, file), f"/Hdd1/{rel_path}"))
+        return trabajos
+
+    def _plan_individual_files_upload(self, carpeta_tus):
+        """Build upload jobs for individual TU files, detecting type automatically"""
+        trabajos = []
+        for registro in self._inventario_tus_locales(carpeta_tus):
+            file = registro['archivo']
+            if registro['tipo'] == 'cache':
+                trabajos.append((registro['ruta'], "/Hdd1/Cache"))
+            elif registro['title_id']:
+                # Content TUs go in Content/0000000000000000/[TitleID]/000B0000/
+                trabajos.append((registro['ruta'],
+                                 f"/Hdd1/Content/0000000000000000/{registro['title_id']}/000B0000"))
             else:
-                remote_path = f"{remote_base}/{rel_path.replace(os.sep, '/')}"
-            
-            # Ensure remote directory exists
-            if rel_path != '.':
-                self._ensure_ftp_dir_recursive(ftp, remote_path)
-            
-            # Upload files in current directory
-            if files:
-                ftp.cwd(f'/Hdd1/{remote_path}')
-                for file in files:
-                    local_file = os.path.join(root, file)
-                    self._log(f"Uploading {file} to {remote_path}/")
-                    with open(local_file, 'rb') as f:
-                        ftp.storbinary(f'STOR {file}', f)
-                    uploaded_files += 1
-        
-        return uploaded_files
-
-    def _ensure_ftp_dir(self, ftp, dirname):
-        """Ensure FTP directory exists"""
-        try:
-            ftp.cwd(f'/Hdd1/{dirname}')
-        except:
-            try:
-                ftp.cwd('/Hdd1')
-                ftp.mkd(dirname)
-                self._log(f"Created directory: {dirname}")
-            except:
-                pass  # Directory might already exist
-
-    def _ensure_ftp_dir_recursive(self, ftp, path):
-        """Ensure FTP directory path exists recursively"""
-        parts = path.split('/')
-        current_path = '/Hdd1'
-        
-        for part in parts:
-            if part:
-                current_path += f'/{part}'
-                try:
-                    ftp.cwd(current_path)
-                except:
-                    try:
-                        parent_path = '/'.join(current_path.split('/')[:-1])
-                        ftp.cwd(parent_path)
-                        ftp.mkd(part)
-                        self._log(f"Created directory: {current_path}")
-                    except:
-                        pass  # Directory might already exist
+                self._log(f"Warning: Could not determine TitleID for {file}, skipping")
+        return trabajos
 
     def extract_iso(self):
         """Launch the ISO extractor addon"""
@@ -1405,11 +2060,14 @@ class XboxTUMApp:
             
             self._log("Launching ISO Extractor addon...")
             
-            # Launch the extractor as an independent process
+            # Launch the extractor as an independent process; games it extracts are
+            # reported back on its stdout (--handoff) and added to the list
+            cmd = [sys.executable, extractor_path, "--handoff"]
             if os.name == 'nt':  # Windows
-                subprocess.Popen([sys.executable, extractor_path], creationflags=subprocess.CREATE_NEW_CONSOLE)
+                proceso = subprocess.Popen(cmd, stdout=subprocess.PIPE, creationflags=subprocess.CREATE_NEW_CONSOLE)
             else:  # Linux/macOS
-                subprocess.Popen([sys.executable, extractor_path])
+                proceso = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+            threading.Thread(target=self._leer_handoff_extractor, args=(proceso,), daemon=True).start()
             
             self._log("ISO Extractor launched successfully.")
             
@@ -1418,6 +2076,56 @@ class XboxTUMApp:
             self._log(error_msg)
             messagebox.showerror("Error", error_msg)
 
+    def _leer_handoff_extractor(self, proceso):
+        """Add every game the extractor reports to the game list and the scan cache"""
+        from xex_reader import obtener_info_juego
+        cache = obtener_cache_juegos()
+        for linea in proceso.stdout:
+            linea = linea.decode("utf-8", errors="replace").rstrip()
+            if not linea.startswith(HANDOFF_PREFIX):
+                if linea:
+                    print(linea)
+                continue
+            try:
+                datos = json.loads(linea[len(HANDOFF_PREFIX):])
+            except ValueError:
+                continue
+
+            ruta_xex = datos.get("xex")
+            media_id, title_id = datos.get("media_id"), datos.get("title_id")
+            if ruta_xex and not (media_id or title_id):
+                # Header could not be parsed by the extractor, fall back to XexTool
+                info = obtener_info_juego(ruta_xex) or {}
+                media_id, title_id = info.get("media_id"), info.get("title_id")
+            if not (media_id or title_id):
+                self._log(f"  ERROR: Could not read information from extracted '{datos.get('nombre')}'")
+                continue
+            if ruta_xex:
+                cache.registrar(ruta_xex, media_id, title_id)
+                cache.guardar()
+            self.root.after(0, self._agregar_juego, datos.get("nombre"), media_id, title_id, datos.get("ruta"))
+        proceso.wait()
+        # Let the GUI thread add the last games before the snapshot is written
+        self.root.after(0, lambda: threading.Thread(target=self._guardar_sesion, daemon=True).start())
+
+    def _agregar_juego(self, nombre, media_id, title_id, ruta=None):
+        """Append a game to the list unless it is already there (GUI thread)
+
+        `ruta` (the game folder, or the trimmed ISO) lets the session snapshot tell
+        this game apart from the ones a rescan of that folder finds.
+        """
+        ruta = os.path.abspath(ruta) if ruta else None
+        for juego in self.juegos:
+            if (juego["nombre"], juego["media_id"], juego["title_id"]) == (nombre, media_id, title_id):
+                if ruta and not juego.get("ruta"):
+                    juego["ruta"] = ruta
+                return
+        juego = {"nombre": nombre, "media_id": media_id, "title_id": title_id}
+        if ruta:
+            juego["ruta"] = ruta
+        self.lista_juegos.agregar(juego)
+        self._log(f"Extracted game added: '{nombre}' ({title_id or media_id})")
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = XboxTUMApp(root)
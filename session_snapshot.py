@@ -0,0 +1,110 @@
+import os
+import json
+import time
+
+# Stored next to the config file in the user's home directory
+SESSION_FILE = os.path.expanduser("~/.x360-tu-manager-session.json")
+SESSION_VERSION = 1
+
+
+def mtimes_directorios(carpeta_raiz, carpetas_juego, visitadas=()):
+    """mtime of every folder the scan visited, every game folder and the folders above them
+
+    `visitadas` are the folders walked while looking for games, including those where
+    none were found. A new or removed game always changes the mtime of one of these
+    folders, so they are all the staleness check needs to stat.
+    """
+    raiz = os.path.abspath(carpeta_raiz)
+    carpetas = {raiz}
+    for carpeta in visitadas:
+        carpeta = os.path.abspath(carpeta)
+        if dentro_de(carpeta, raiz):
+            carpetas.add(carpeta)
+    for carpeta in carpetas_juego:
+        carpeta = os.path.abspath(carpeta)
+        while carpeta not in carpetas and carpeta.startswith(raiz):
+            carpetas.add(carpeta)
+            carpeta = os.path.dirname(carpeta)
+
+    mtimes = {}
+    for carpeta in carpetas:
+        try:
+            mtimes[carpeta] = os.stat(carpeta).st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+
+def carpetas_a_reescanear(mtimes, carpetas_juego):
+    """Compare the folder mtimes of a snapshot with the disk
+
+    Returns (removed, to_scan): folders that no longer exist, and folders to scan
+    again. A changed game folder is scanned again; a changed folder holding games
+    only needs its new subfolders scanned, its known ones are checked on their own.
+    """
+    eliminadas, escanear = [], []
+    for carpeta in sorted(mtimes):
+        if any(dentro_de(carpeta, c) for c in eliminadas):
+            continue
+        try:
+            actual = os.stat(carpeta).st_mtime_ns
+        except OSError:
+            eliminadas.append(carpeta)
+            continue
+        if actual == mtimes[carpeta]:
+            continue
+        if carpeta in carpetas_juego:
+            escanear.append(carpeta)
+            continue
+        try:
+            with os.scandir(carpeta) as entradas:
+                nuevas = [e.path for e in entradas if e.is_dir() and e.path not in mtimes]
+        except OSError:
+            eliminadas.append(carpeta)
+            continue
+        escanear.extend(nuevas)
+    return eliminadas, escanear
+
+
+def dentro_de(ruta, carpeta):
+    return bool(ruta) and (ruta == carpeta or ruta.startswith(carpeta + os.sep))
+
+
+def guardar_sesion(juegos, origen, carpeta=None, directorios=None, ruta_sesion=SESSION_FILE):
+    """Write the identified library (games, TU status, folder mtimes) atomically"""
+    datos = {
+        "version": SESSION_VERSION,
+        "guardado": time.time(),
+        "origen": origen,
+        "carpeta": carpeta,
+        "directorios": directorios or {},
+        "juegos": [{clave: valor for clave, valor in juego.items() if valor is not None}
+                   for juego in juegos],
+    }
+    temporal = ruta_sesion + ".tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, separators=(",", ":"))
+        os.replace(temporal, ruta_sesion)
+    except OSError as e:
+        print(f"[ERROR] Saving session snapshot: {e}")
+
+
+def cargar_sesion(ruta_sesion=SESSION_FILE):
+    """Last saved session, or None if there is none or it cannot be used"""
+    try:
+        with open(ruta_sesion, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(datos, dict) or datos.get("version") != SESSION_VERSION:
+        return None
+    juegos = []
+    for juego in datos.get("juegos") or []:
+        if isinstance(juego, dict) and juego.get("nombre"):
+            juego.setdefault("media_id", None)
+            juego.setdefault("title_id", None)
+            juegos.append(juego)
+    datos["juegos"] = juegos
+    datos["directorios"] = datos.get("directorios") or {}
+    return datos
@@ -0,0 +1,151 @@
+"""Cold-start benchmark for X360 TU Manager
+
+Measures, each in a fresh interpreter:
+  - import time of main.py and of every module it imports directly (python -X importtime)
+  - time until the XboxTUMApp window is first painted
+
+and exits with status 1 when a budget is exceeded, so it can guard against startup
+regressions in CI. The window needs a display; on a headless machine run it under
+Xvfb:
+
+    xvfb-run -a python startup_benchmark.py
+
+A throwaway HOME is used so saved config, session and caches do not affect the
+numbers (pass --real-home to measure with yours).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Budgets leave headroom: main imports in ~20 ms once the feature modules load lazily
+IMPORT_BUDGET_MS = 60
+FIRST_PAINT_BUDGET_MS = 1000
+DEFAULT_RUNS = 5
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def _entorno(home):
+    entorno = dict(os.environ)
+    if home:
+        entorno["HOME"] = home
+    return entorno
+
+
+def medir_importaciones(home=None):
+    """Cumulative import time (ms) of main and of each module it imports directly"""
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                             cwd=DIRECTORIO, env=_entorno(home), capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proceso.stderr[-2000:]}")
+
+    # Lines are "import time: self | cumulative | <indent>name", children before their parent
+    lineas = [l for l in proceso.stderr.splitlines() if l.startswith("import time:") and "|" in l]
+    indice_main = max(i for i, l in enumerate(lineas) if l.split("|")[2].strip() == "main")
+    modulos = {}
+    for linea in reversed(lineas[:indice_main]):
+        _, acumulado, nombre = linea.split("|")
+        nivel = len(nombre) - len(nombre.lstrip(" "))
+        if nivel <= 1:
+            break  # Imported before main started
+        if nivel == 3:
+            modulos[nombre.strip()] = int(acumulado) / 1000
+    modulos["main"] = int(lineas[indice_main].split("|")[1]) / 1000
+    return modulos
+
+
+def medir_primer_pintado(home=None):
+    """Timings (ms) of one fresh process up to the first painted window; display=False when there is none"""
+    proceso = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"],
+                             cwd=DIRECTORIO, env=_entorno(home), capture_output=True, text=True)
+    for linea in proceso.stdout.splitlines():
+        if linea.startswith("{"):
+            return json.loads(linea)
+    raise RuntimeError(f"benchmark child failed:\n{proceso.stderr[-2000:]}")
+
+
+def _hijo():
+    """Runs in the fresh interpreter: build the app and report when the window is drawn"""
+    inicio = time.perf_counter()
+    sys.path.insert(0, DIRECTORIO)
+    import tkinter as tk
+    import main
+    importado = time.perf_counter()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print(json.dumps({"display": False}))
+        return
+    main.XboxTUMApp(root)
+    creado = time.perf_counter()
+
+    medido = []
+
+    def pintado():
+        if medido:
+            return
+        medido.append(True)
+        # Expose has been handled and the idle redraws are done
+        root.update_idletasks()
+        fin = time.perf_counter()
+        print(json.dumps({"display": True, "import_ms": (importado - inicio) * 1000,
+                          "app_ms": (creado - importado) * 1000,
+                          "first_paint_ms": (fin - inicio) * 1000}))
+        root.destroy()
+
+    root.bind("<Expose>", lambda e: e.widget is root and root.after_idle(pintado), add="+")
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure X360 TU Manager cold-start time")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="fresh interpreters per measurement")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS, help="ms allowed to import main")
+    parser.add_argument("--paint-budget", type=float, default=FIRST_PAINT_BUDGET_MS,
+                        help="ms allowed until the window is painted")
+    parser.add_argument("--real-home", action="store_true", help="use your own config/session files")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _hijo()
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="x360tum-home-") as temporal:
+        home = None if args.real_home else temporal
+
+        importaciones = [medir_importaciones(home) for _ in range(args.runs)]
+        tiempo_main = statistics.median(m["main"] for m in importaciones)
+        print(f"Import time (median of {args.runs}): main {tiempo_main:.1f} ms")
+        for modulo in sorted(importaciones[0], key=lambda m: -importaciones[0][m]):
+            if modulo != "main":
+                print(f"  {modulo:<24} {statistics.median(m.get(modulo, 0) for m in importaciones):7.1f} ms")
+
+        fallos = []
+        if tiempo_main > args.import_budget:
+            fallos.append(f"import main took {tiempo_main:.1f} ms (budget {args.import_budget:.0f} ms)")
+
+        pintados = [medir_primer_pintado(home) for _ in range(args.runs)]
+        if not pintados[0].get("display"):
+            print("First paint: skipped, no display (run under xvfb-run)")
+        else:
+            primer_pintado = statistics.median(p["first_paint_ms"] for p in pintados)
+            print(f"First paint (median of {args.runs}): {primer_pintado:.0f} ms "
+                  f"(import {statistics.median(p['import_ms'] for p in pintados):.0f} ms, "
+                  f"XboxTUMApp() {statistics.median(p['app_ms'] for p in pintados):.0f} ms)")
+            if primer_pintado > args.paint_budget:
+                fallos.append(f"first paint took {primer_pintado:.0f} ms (budget {args.paint_budget:.0f} ms)")
+
+    for fallo in fallos:
+        print(f"[ERROR] Startup regression: {fallo}")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
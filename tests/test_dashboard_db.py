@@ -0,0 +1,66 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_db import leer_base_contenido
+
+
+class LeerBaseContenidoTest(unittest.TestCase):
+    def setUp(self):
+        descriptor, self.ruta = tempfile.mkstemp(suffix=".db")
+        os.close(descriptor)
+
+    def tearDown(self):
+        os.remove(self.ruta)
+
+    def _crear(self, *sentencias):
+        conn = sqlite3.connect(self.ruta)
+        with conn:
+            for sentencia, filas in sentencias:
+                if filas:
+                    conn.executemany(sentencia, filas)
+                else:
+                    conn.execute(sentencia)
+        conn.close()
+
+    def test_aurora_content_items(self):
+        # Aurora stores IDs as signed 32-bit integers
+        self._crear(
+            ("CREATE TABLE ContentItems (Id INTEGER PRIMARY KEY, Directory TEXT, Executable TEXT, "
+             "TitleId INTEGER, MediaId INTEGER, TitleName TEXT)", None),
+            ("INSERT INTO ContentItems (Directory, Executable, TitleId, MediaId, TitleName) "
+             "VALUES (?, ?, ?, ?, ?)", [
+                 ("\\Hdd1\\Games\\Halo 3\\", "default.xex", 0x4D5307E6, 0x1C4A2A2B, "Halo 3"),
+                 ("\\Hdd1\\Games\\Halo 3 (copy)\\", "default.xex", 0x4D5307E6, 0x1C4A2A2B, "Halo 3"),
+                 ("\\Hdd1\\Games\\Forza Motorsport 4\\", "default.xex", 0x4D53085B, 0x9A1D4C2F - 2 ** 32, None),
+                 ("\\Hdd1\\Games\\Broken\\", "default.xex", 0, 0, "Broken"),
+             ]),
+        )
+        self.assertEqual(leer_base_contenido(self.ruta), [
+            {"nombre": "Forza Motorsport 4", "media_id": "9A1D4C2F", "title_id": "4D53085B"},
+            {"nombre": "Halo 3", "media_id": "1C4A2A2B", "title_id": "4D5307E6"},
+        ])
+
+    def test_hex_text_ids_and_other_column_names(self):
+        self._crear(
+            ("CREATE TABLE contentitems (contentid INTEGER PRIMARY KEY, path TEXT, titleid TEXT, mediaid TEXT)",
+             None),
+            ("INSERT INTO contentitems (path, titleid, mediaid) VALUES (?, ?, ?)", [
+                ("Hdd1:\\Games\\Gears of War 3", "0x4D53082D", "2CC5B2D1"),
+            ]),
+        )
+        self.assertEqual(leer_base_contenido(self.ruta), [
+            {"nombre": "Gears of War 3", "media_id": "2CC5B2D1", "title_id": "4D53082D"},
+        ])
+
+    def test_database_without_content_table(self):
+        self._crear(("CREATE TABLE Settings (Name TEXT, Value TEXT)", None))
+        self.assertIsNone(leer_base_contenido(self.ruta))
+
+
+if __name__ == "__main__":
+    unittest.main()
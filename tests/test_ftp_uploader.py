@@ -0,0 +1,261 @@
+import os
+import sys
+import tempfile
+import unittest
+from ftplib import error_perm, error_temp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ftp_uploader
+from ftp_uploader import FTPUploadEngine, UploadJournal, listar_directorio, resincronizar
+
+
+class _ConexionDatos:
+    def __init__(self, destino):
+        self.destino = destino
+
+    def sendall(self, datos):
+        self.destino += datos
+
+    def close(self):
+        pass
+
+
+class FakeFTP:
+    """In-memory FTP session: {remote path: bytes} for files, a set for directories"""
+
+    def __init__(self, archivos=None, directorios=(), mlsd=True, respuestas=()):
+        self.archivos = {ruta: bytearray(datos) for ruta, datos in (archivos or {}).items()}
+        self.directorios = set(directorios)
+        self.usar_mlsd = mlsd
+        self.respuestas = list(respuestas)
+        self.actual = "/"
+        self.cerrada = False
+
+    def _ruta(self, ruta):
+        return ruta if ruta.startswith("/") else f"{self.actual.rstrip('/')}/{ruta}"
+
+    def _hijos(self, ruta):
+        prefijo = ruta.rstrip("/") + "/"
+        for candidato in list(self.archivos) + list(self.directorios):
+            if candidato.startswith(prefijo) and "/" not in candidato[len(prefijo):]:
+                yield candidato[len(prefijo):], candidato
+
+    def mlsd(self, ruta, facts=()):
+        if not self.usar_mlsd:
+            raise error_perm("500 MLSD not understood")
+        if ruta not in self.directorios:
+            raise error_perm("550 No such directory")
+        for nombre, completa in self._hijos(ruta):
+            if completa in self.archivos:
+                yield nombre, {"type": "file", "size": str(len(self.archivos[completa]))}
+            else:
+                yield nombre, {"type": "dir"}
+
+    def retrlines(self, comando, callback):
+        ruta = comando.split(" ", 1)[1]
+        for nombre, completa in self._hijos(ruta):
+            if completa in self.archivos:
+                callback(f"-rw-r--r-- 1 root root {len(self.archivos[completa])} Jan 01 00:00 {nombre}")
+            else:
+                callback(f"drwxr-xr-x 1 root root 0 Jan 01 00:00 {nombre}")
+        return "226 Transfer complete"
+
+    def pwd(self):
+        return self.actual
+
+    def cwd(self, ruta):
+        ruta = self._ruta(ruta)
+        if ruta != "/" and ruta not in self.directorios:
+            raise error_perm("550 No such directory")
+        self.actual = ruta
+
+    def mkd(self, ruta):
+        self.directorios.add(ruta)
+        return ruta
+
+    def voidcmd(self, comando):
+        return "200 OK"
+
+    def size(self, ruta):
+        ruta = self._ruta(ruta)
+        if ruta not in self.archivos:
+            raise error_perm("550 No such file")
+        return len(self.archivos[ruta])
+
+    def transfercmd(self, comando, rest=None):
+        verbo, nombre = comando.split(" ", 1)
+        ruta = self._ruta(nombre)
+        if verbo == "STOR":
+            self.archivos[ruta] = self.archivos.get(ruta, bytearray())[:rest or 0]
+        return _ConexionDatos(self.archivos[ruta])
+
+    def voidresp(self):
+        return "226 Transfer complete"
+
+    def putcmd(self, comando):
+        self.respuestas.append("200 NOOP ok")
+
+    def getresp(self):
+        respuesta = self.respuestas.pop(0)
+        if respuesta.startswith("4"):
+            raise error_temp(respuesta)
+        return respuesta
+
+    def quit(self):
+        self.cerrada = True
+
+    def close(self):
+        self.cerrada = True
+
+
+class ListarDirectorioTest(unittest.TestCase):
+    def test_mlsd(self):
+        ftp = FakeFTP({"/Cache/TU_A": b"x" * 10}, {"/Cache", "/Cache/sub"})
+        self.assertEqual(listar_directorio(ftp, "/Cache"), ({"TU_A": 10, "sub": None}, True))
+        self.assertEqual(listar_directorio(ftp, "/Missing"), ({}, False))
+
+    def test_list_fallback(self):
+        ftp = FakeFTP({"/Cache/TU_A": b"x" * 10}, {"/Cache", "/Cache/sub", "/Empty"}, mlsd=False)
+        self.assertEqual(listar_directorio(ftp, "/Cache"), ({"TU_A": 10, "sub": None}, True))
+        self.assertEqual(listar_directorio(ftp, "/Empty"), ({}, True))
+        # An empty listing of a path that can't be entered is a missing directory
+        self.assertEqual(listar_directorio(ftp, "/Missing"), ({}, False))
+        self.assertEqual(ftp.pwd(), "/")
+
+    def test_unparsed_list_lines_keep_the_name(self):
+        ftp = FakeFTP(mlsd=False)
+        ftp.retrlines = lambda comando, callback: callback("01-01-24  12:00AM       <DIR>  4D5307E6")
+        self.assertEqual(listar_directorio(ftp, "/Content"), ({"4D5307E6": None}, True))
+
+
+class UploadJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta_diario = os.path.join(self.carpeta.name, "uploads.json")
+        self.local = os.path.join(self.carpeta.name, "TU_A")
+        with open(self.local, "wb") as f:
+            f.write(b"x" * 100)
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def test_started_upload_is_resumable_after_reload(self):
+        UploadJournal(self.ruta_diario).iniciar("host", "/Cache/TU_A", self.local)
+        diario = UploadJournal(self.ruta_diario)
+        self.assertTrue(diario.reanudable("host", "/Cache/TU_A", self.local))
+        self.assertFalse(diario.reanudable("other", "/Cache/TU_A", self.local))
+        diario.terminar("host", "/Cache/TU_A")
+        self.assertFalse(UploadJournal(self.ruta_diario).reanudable("host", "/Cache/TU_A", self.local))
+
+    def test_modified_local_file_is_not_resumed(self):
+        diario = UploadJournal(self.ruta_diario)
+        diario.iniciar("host", "/Cache/TU_A", self.local)
+        with open(self.local, "ab") as f:
+            f.write(b"y")
+        self.assertFalse(diario.reanudable("host", "/Cache/TU_A", self.local))
+
+    def test_corrupt_journal_starts_empty(self):
+        with open(self.ruta_diario, "w") as f:
+            f.write("{not json")
+        self.assertFalse(UploadJournal(self.ruta_diario).reanudable("host", "/Cache/TU_A", self.local))
+
+
+class EngineTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.diario = UploadJournal(os.path.join(self.carpeta.name, "uploads.json"))
+        self.mensajes = []
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def _local(self, nombre, datos):
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, "wb") as f:
+            f.write(datos)
+        return ruta
+
+    def _engine(self, ftp):
+        engine = FTPUploadEngine("host", conexiones=1, log=self.mensajes.append,
+                                 usar_sendfile=False, diario=self.diario)
+        engine.conectar = lambda: ftp
+        return engine
+
+    def test_plan_skips_same_size_and_resumes_only_journaled_files(self):
+        iguales = self._local("TU_SAME", b"a" * 10)
+        propia = self._local("TU_OWN", b"b" * 10)
+        ajena = self._local("TU_OLD", b"c" * 10)
+        nueva = self._local("TU_NEW", b"d" * 10)
+        ftp = FakeFTP({"/Cache/TU_SAME": b"a" * 10, "/Cache/TU_OWN": b"b" * 4,
+                       "/Cache/TU_OLD": b"z" * 4}, {"/Cache"})
+        self.diario.iniciar("host", "/Cache/TU_OWN", propia)
+        engine = self._engine(ftp)
+
+        pendientes, omitidos = engine.planificar(ftp, [(r, "/Cache") for r in (iguales, propia, ajena, nueva)])
+        self.assertEqual(omitidos, [(iguales, "/Cache")])
+        self.assertEqual(pendientes, [(propia, "/Cache"), (ajena, "/Cache"), (nueva, "/Cache")])
+        self.assertEqual(engine._parciales, {("/Cache", "TU_OWN"): 4})
+
+    def test_upload_resumes_and_overwrites(self):
+        propia = self._local("TU_OWN", b"b" * 10)
+        ajena = self._local("TU_OLD", b"c" * 10)
+        ftp = FakeFTP({"/Cache/TU_OWN": b"b" * 4, "/Cache/TU_OLD": b"z" * 4}, {"/Cache"})
+        self.diario.iniciar("host", "/Cache/TU_OWN", propia)
+
+        resumen = self._engine(ftp).subir([(propia, "/Cache"), (ajena, "/Cache")])
+        self.assertEqual(resumen["errores"], [])
+        self.assertEqual(resumen["bytes"], 6 + 10)
+        self.assertEqual(ftp.archivos["/Cache/TU_OWN"], b"b" * 10)
+        self.assertEqual(ftp.archivos["/Cache/TU_OLD"], b"c" * 10)
+        self.assertFalse(self.diario.reanudable("host", "/Cache/TU_OWN", propia))
+
+    def test_missing_local_file_fails_only_that_file(self):
+        borrado = self._local("TU_GONE", b"a" * 10)
+        sigue = self._local("TU_NEXT", b"b" * 10)
+        ftp = FakeFTP(directorios={"/Cache"})
+        os.remove(borrado)
+
+        resumen = self._engine(ftp).subir([(borrado, "/Cache"), (sigue, "/Cache")], incremental=False)
+        self.assertEqual(resumen["errores"], [borrado])
+        self.assertEqual(resumen["archivos"], 1)
+        self.assertEqual(ftp.archivos["/Cache/TU_NEXT"], b"b" * 10)
+        self.assertFalse(any("Connection lost" in m for m in self.mensajes))
+
+    def test_dropped_connection_reconnects_and_resumes(self):
+        ruta = self._local("TU_A", b"a" * 10)
+        ftp = FakeFTP(directorios={"/Cache"})
+        transfercmd = ftp.transfercmd
+
+        def cortar_una_vez(comando, rest=None):
+            ftp.transfercmd = transfercmd
+            transfercmd(comando, rest).sendall(b"a" * 3)
+            raise ConnectionResetError("link dropped")
+
+        ftp.transfercmd = cortar_una_vez
+        espera, ftp_uploader.BACKOFF_INICIAL = ftp_uploader.BACKOFF_INICIAL, 0
+        try:
+            resumen = self._engine(ftp).subir([(ruta, "/Cache")], incremental=False)
+        finally:
+            ftp_uploader.BACKOFF_INICIAL = espera
+        self.assertEqual(resumen["errores"], [])
+        self.assertEqual(ftp.archivos["/Cache/TU_A"], b"a" * 10)
+        self.assertIn("Resuming TU_A at 3 bytes", self.mensajes)
+
+
+class ResincronizarTest(unittest.TestCase):
+    def test_drains_stale_replies(self):
+        ftp = FakeFTP(respuestas=["426 Connection closed; transfer aborted"])
+        resincronizar(ftp)
+        self.assertEqual(ftp.respuestas, [])
+        self.assertFalse(ftp.cerrada)
+
+    def test_closes_and_raises_when_out_of_sync(self):
+        ftp = FakeFTP(respuestas=["226 Transfer complete"] * 4)
+        with self.assertRaises(ConnectionError):
+            resincronizar(ftp)
+        self.assertTrue(ftp.cerrada)
+
+
+if __name__ == "__main__":
+    unittest.main()
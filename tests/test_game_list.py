@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_list import IndiceBusqueda
+
+JUEGOS = [
+    {"nombre": "Halo 3", "media_id": "1C4A2A2B", "title_id": "4D5307E6"},
+    {"nombre": "Halo: Reach", "media_id": "2B7F3A10", "title_id": "4D53085B"},
+    {"nombre": "Forza Motorsport 4", "media_id": "9A1D4C2F", "title_id": "4D53085B"},
+    {"nombre": "Gears of War 3", "media_id": None, "title_id": "4D53082D"},
+    {"nombre": None, "media_id": None, "title_id": None},
+]
+
+
+class IndiceBusquedaTest(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceBusqueda()
+        self.indice.agregar(range(len(JUEGOS)), JUEGOS)
+
+    def test_empty_search_is_no_filter(self):
+        self.assertIsNone(self.indice.buscar(""))
+        self.assertIsNone(self.indice.buscar("  :: "))
+
+    def test_word_prefixes_case_insensitive(self):
+        self.assertEqual(self.indice.buscar("ha"), {0, 1})
+        self.assertEqual(self.indice.buscar("REA"), {1})
+        self.assertEqual(self.indice.buscar("mot"), {2})
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.indice.buscar("halo 3"), {0})
+        self.assertEqual(self.indice.buscar("3 halo"), {0})
+        self.assertEqual(self.indice.buscar("halo forza"), frozenset())
+
+    def test_ids(self):
+        self.assertEqual(self.indice.buscar("4d53085b"), {1, 2})
+        self.assertEqual(self.indice.buscar("9a1d"), {2})
+
+    def test_rows_added_later_are_found(self):
+        self.assertEqual(self.indice.buscar("halo"), {0, 1})
+        self.indice.agregar([5], [{"nombre": "Halo Wars", "media_id": None, "title_id": "4D5307F1"}])
+        self.assertEqual(self.indice.buscar("halo"), {0, 1, 5})
+        self.assertEqual(self.indice.buscar("wa"), {3, 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
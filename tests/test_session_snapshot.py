@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_snapshot import cargar_sesion, carpetas_a_reescanear, guardar_sesion, mtimes_directorios
+
+
+class StalenessTest(unittest.TestCase):
+    def setUp(self):
+        self.temporal = tempfile.TemporaryDirectory()
+        self.raiz = self.temporal.name
+        self.halo = self._crear("A", "Halo 3")
+        os.makedirs(os.path.join(self.raiz, "Empty"))
+        self.visitadas = [carpeta for carpeta, _dirs, _files in os.walk(self.raiz)]
+        self.mtimes = mtimes_directorios(self.raiz, [self.halo], self.visitadas)
+
+    def tearDown(self):
+        self.temporal.cleanup()
+
+    def _crear(self, *partes):
+        carpeta = os.path.join(self.raiz, *partes)
+        os.makedirs(carpeta)
+        open(os.path.join(carpeta, "default.xex"), "wb").close()
+        return carpeta
+
+    def _tocar(self, carpeta):
+        # Some filesystems keep mtimes to the second: move it well into the future
+        st = os.stat(carpeta)
+        os.utime(carpeta, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    def test_unchanged(self):
+        self.assertEqual(carpetas_a_reescanear(self.mtimes, {self.halo}), ([], []))
+
+    def test_game_added_under_a_folder_without_games(self):
+        nuevo = self._crear("Empty", "Forza 4")
+        self._tocar(os.path.join(self.raiz, "Empty"))
+        self.assertEqual(carpetas_a_reescanear(self.mtimes, {self.halo}), ([], [nuevo]))
+
+    def test_new_sibling_folder(self):
+        nuevo = self._crear("Gears 3")
+        self._tocar(self.raiz)
+        self.assertEqual(carpetas_a_reescanear(self.mtimes, {self.halo}), ([], [nuevo]))
+
+    def test_changed_game_folder_is_rescanned(self):
+        self._tocar(self.halo)
+        self.assertEqual(carpetas_a_reescanear(self.mtimes, {self.halo}), ([], [self.halo]))
+
+    def test_removed_folder(self):
+        os.remove(os.path.join(self.halo, "default.xex"))
+        os.rmdir(self.halo)
+        os.rmdir(os.path.dirname(self.halo))
+        self._tocar(self.raiz)
+        eliminadas, escanear = carpetas_a_reescanear(self.mtimes, {self.halo})
+        self.assertEqual(eliminadas, [os.path.join(self.raiz, "A")])
+        self.assertEqual(escanear, [])
+
+    def test_folders_outside_the_root_are_ignored(self):
+        with tempfile.TemporaryDirectory() as otra:
+            self.assertNotIn(otra, mtimes_directorios(self.raiz, [self.halo], [otra]))
+
+
+class SesionTest(unittest.TestCase):
+    def setUp(self):
+        descriptor, self.ruta = tempfile.mkstemp(suffix=".json")
+        os.close(descriptor)
+
+    def tearDown(self):
+        os.remove(self.ruta)
+
+    def test_round_trip(self):
+        juegos = [{"nombre": "Halo 3", "media_id": "1C4A2A2B", "title_id": "4D5307E6", "tus": 2,
+                   "tu_consulta": 1700000000.0, "ruta": None}]
+        guardar_sesion(juegos, "folder", "/games", {"/games": 1}, ruta_sesion=self.ruta)
+        sesion = cargar_sesion(self.ruta)
+        self.assertEqual(sesion["origen"], "folder")
+        self.assertEqual(sesion["directorios"], {"/games": 1})
+        self.assertEqual(sesion["juegos"], [{"nombre": "Halo 3", "media_id": "1C4A2A2B", "title_id": "4D5307E6",
+                                             "tus": 2, "tu_consulta": 1700000000.0}])
+
+    def test_unusable_snapshots(self):
+        with open(self.ruta, "w") as f:
+            json.dump({"version": 0, "juegos": [{"nombre": "Halo 3"}]}, f)
+        self.assertIsNone(cargar_sesion(self.ruta))
+        with open(self.ruta, "w") as f:
+            f.write("{")
+        self.assertIsNone(cargar_sesion(self.ruta))
+        self.assertIsNone(cargar_sesion(self.ruta + ".missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
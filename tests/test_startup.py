@@ -0,0 +1,39 @@
+import os
+import statistics
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import startup_benchmark
+
+try:
+    import tkinter  # noqa: F401
+except ImportError:
+    tkinter = None
+
+RUNS = 3
+
+
+@unittest.skipIf(tkinter is None, "tkinter is not installed")
+class ImportBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.temporal = tempfile.TemporaryDirectory(prefix="x360tum-home-")
+        self.mediciones = [startup_benchmark.medir_importaciones(self.temporal.name) for _ in range(RUNS)]
+
+    def tearDown(self):
+        self.temporal.cleanup()
+
+    def test_import_main_within_budget(self):
+        tiempo_main = statistics.median(m["main"] for m in self.mediciones)
+        self.assertLessEqual(tiempo_main, startup_benchmark.IMPORT_BUDGET_MS,
+                             f"import main took {tiempo_main:.1f} ms")
+
+    def test_feature_modules_load_lazily(self):
+        for modulo in ("requests", "ftplib", "ftp_uploader", "xboxunity_api", "tu_manifest", "xex_reader"):
+            self.assertNotIn(modulo, self.mediciones[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tu_header import HEADER_READ_SIZE, analizar_cabecera_tu, leer_cabecera_tu
+
+
+def _paquete_stfs(magic=b"LIVE", title_id=0x4D5307E6, media_id=0x1C4A2A2B,
+                  version=0x20002C01, base_version=0x20000001, nombre="Halo 3"):
+    datos = bytearray(HEADER_READ_SIZE)
+    datos[:4] = magic
+    struct.pack_into(">I", datos, 0x344, 0x000B0000)
+    struct.pack_into(">IIII", datos, 0x354, media_id, version, base_version, title_id)
+    texto = nombre.encode("utf-16-be")
+    datos[0x411:0x411 + len(texto)] = texto
+    return bytes(datos)
+
+
+class AnalizarCabeceraTest(unittest.TestCase):
+    def test_stfs_package(self):
+        info = analizar_cabecera_tu(_paquete_stfs())
+        self.assertEqual(info["formato"], "LIVE")
+        self.assertEqual(info["tipo"], "content")
+        self.assertEqual(info["title_id"], "4D5307E6")
+        self.assertEqual(info["media_id"], "1C4A2A2B")
+        self.assertEqual(info["version"], "2.0.44.1")
+        self.assertEqual(info["base_version"], "2.0.0.1")
+        self.assertEqual(info["content_type"], 0x000B0000)
+        self.assertEqual(info["nombre"], "Halo 3")
+
+    def test_con_package_without_ids(self):
+        info = analizar_cabecera_tu(_paquete_stfs(magic=b"CON ", title_id=0, media_id=0, nombre=""))
+        self.assertEqual(info["formato"], "CON")
+        self.assertIsNone(info["title_id"])
+        self.assertIsNone(info["media_id"])
+        self.assertIsNone(info["nombre"])
+
+    def test_raw_data_is_a_cache_tu(self):
+        info = analizar_cabecera_tu(b"\x00\x01\x02\x03" * 64)
+        self.assertEqual(info["formato"], "raw")
+        self.assertEqual(info["tipo"], "cache")
+        self.assertIsNone(info["title_id"])
+
+    def test_truncated_buffers(self):
+        self.assertIsNone(analizar_cabecera_tu(b"LI"))
+        self.assertIsNone(analizar_cabecera_tu(_paquete_stfs()[:0x360]))
+        # The display name is optional when the buffer ends before it
+        self.assertIsNone(analizar_cabecera_tu(_paquete_stfs()[:0x364])["nombre"])
+
+
+class LeerCabeceraTest(unittest.TestCase):
+    def test_reads_file_and_missing_file(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "TU_1234567_000000000.0000000000001")
+            with open(ruta, "wb") as f:
+                f.write(_paquete_stfs(magic=b"PIRS") + os.urandom(4096))
+            self.assertEqual(leer_cabecera_tu(ruta)["title_id"], "4D5307E6")
+            self.assertIsNone(leer_cabecera_tu(os.path.join(carpeta, "missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
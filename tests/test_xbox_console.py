@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+from ftplib import error_perm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xbox_console import CONTENT_ROOT, escanear_tus_instalados, tu_instalada
+
+_LISTADO_RECURSIVO = [
+    f"{CONTENT_ROOT}:",
+    "drwxr-xr-x 1 root root 0 Jan 01 00:00 4D5307E6",
+    "drwxr-xr-x 1 root root 0 Jan 01 00:00 FFFE07D1",
+    "",
+    "./4D5307E6:",
+    "drwxr-xr-x 1 root root 0 Jan 01 00:00 000B0000",
+    "drwxr-xr-x 1 root root 0 Jan 01 00:00 00007000",
+    "",
+    "./4D5307E6/000B0000:",
+    "-rw-r--r-- 1 root root 5242880 Jan 01 00:00 tu00000002_00000000",
+    "",
+    "./4D5307E6/00007000:",
+    "-rw-r--r-- 1 root root 4096 Jan 01 00:00 0123456789ABCDEF",
+    "",
+    "./FFFE07D1:",
+    "drwxr-xr-x 1 root root 0 Jan 01 00:00 00010000",
+]
+
+
+class FakeFTP:
+    def __init__(self, recursivo):
+        self.recursivo = recursivo
+        self.comandos = []
+
+    def retrlines(self, comando, callback):
+        self.comandos.append(comando)
+        if comando.startswith("LIST -R"):
+            if not self.recursivo:
+                raise error_perm("550 No such file or directory")
+            for linea in _LISTADO_RECURSIVO:
+                callback(linea)
+        elif comando == f"LIST {CONTENT_ROOT}":
+            callback("drwxr-xr-x 1 root root 0 Jan 01 00:00 4D5307E6")
+        elif comando == f"LIST {CONTENT_ROOT}/4D5307E6/000B0000":
+            callback("-rw-r--r-- 1 root root 5242880 Jan 01 00:00 tu00000002_00000000")
+        elif comando == "LIST /Hdd1/Cache":
+            callback("-rw-r--r-- 1 root root 1024 Jan 01 00:00 TU_16L61V6_0000014000000.00000000000O9")
+        return "226 Transfer complete"
+
+    def mlsd(self, ruta, facts=()):
+        raise error_perm("500 MLSD not understood")
+
+
+class EscanearTusInstaladosTest(unittest.TestCase):
+    _ESPERADO = {
+        "content": {"4D5307E6": {"tu00000002_00000000": 5242880}},
+        "cache": {"TU_16L61V6_0000014000000.00000000000O9": 1024},
+    }
+
+    def test_single_recursive_listing(self):
+        ftp = FakeFTP(recursivo=True)
+        self.assertEqual(escanear_tus_instalados(ftp, log=lambda mensaje: None), self._ESPERADO)
+        self.assertEqual(ftp.comandos, [f"LIST -R {CONTENT_ROOT}", "LIST /Hdd1/Cache"])
+
+    def test_falls_back_to_one_listing_per_title(self):
+        ftp = FakeFTP(recursivo=False)
+        self.assertEqual(escanear_tus_instalados(ftp, log=lambda mensaje: None), self._ESPERADO)
+        self.assertIn(f"LIST {CONTENT_ROOT}/4D5307E6/000B0000", ftp.comandos)
+
+
+class TuInstaladaTest(unittest.TestCase):
+    inventario = {"content": {"4D5307E6": {"tu00000002_00000000": 5242880}},
+                  "cache": {"TU_16L61V6_0000014000000.00000000000O9": 1024}}
+
+    def test_known_name_and_size(self):
+        self.assertTrue(tu_instalada(self.inventario, "4d5307e6", 5242880, {"tu00000002_00000000"}))
+        self.assertTrue(tu_instalada(self.inventario, "4D5307E6", 1024,
+                                     {"TU_16L61V6_0000014000000.00000000000O9"}))
+        self.assertFalse(tu_instalada(self.inventario, "4D5307E6", 999, {"tu00000002_00000000"}))
+
+    def test_same_size_without_the_name_is_not_installed(self):
+        self.assertFalse(tu_instalada(self.inventario, "4D5307E6", 5242880))
+        self.assertFalse(tu_instalada(self.inventario, "4D5307E6", 5242880, {"tu00000003_00000000"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
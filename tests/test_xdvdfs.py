@@ -0,0 +1,172 @@
+import io
+import os
+import random
+import struct
+import sys
+import tempfile
+import unittest
+import zipfile
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "addons"))
+
+import xdvdfs
+from xdvdfs import CRC32Reader, XDVDFSImage, pattern_filter, rebuild_xiso
+
+FILES = {
+    "default.xex": b"XEX2" + bytes(range(256)) * 40,
+    "media/intro.xmv": os.urandom(5000),
+    "media/empty.bin": b"",
+    "data/maps/level1.bin": os.urandom(3 * xdvdfs.SECTOR_SIZE),
+    "data/readme.txt": b"hello",
+}
+
+
+def build_image(files):
+    """XISO laid out like extract-xiso: each directory table, then its files, then its subdirectories"""
+    children = {"": []}
+    for path in sorted(files):
+        parts = path.split("/")
+        for depth in range(1, len(parts)):
+            directory = "/".join(parts[:depth])
+            if directory not in children:
+                children[directory] = []
+                children["/".join(parts[:depth - 1])].append((parts[depth - 1], directory, True, 0))
+        children["/".join(parts[:-1])].append((parts[-1], path, False, len(files[path])))
+
+    locations = {}
+    order = []
+    next_sector = [xdvdfs.VOLUME_DESCRIPTOR_SECTOR + 1]
+
+    def place(directory):
+        size = xdvdfs._table_size(children[directory]) if children[directory] else 0
+        locations[directory] = (next_sector[0] if size else 0, size)
+        next_sector[0] += xdvdfs._sectors(size)
+        order.append(directory)
+        for name, path, is_dir, length in sorted(children[directory]):
+            if not is_dir:
+                locations[path] = (next_sector[0] if length else 0, length)
+                next_sector[0] += xdvdfs._sectors(length)
+        for name, path, is_dir, _length in sorted(children[directory]):
+            if is_dir:
+                place(path)
+
+    place("")
+    image = bytearray(next_sector[0] * xdvdfs.SECTOR_SIZE)
+    descriptor = xdvdfs.VOLUME_DESCRIPTOR_SECTOR * xdvdfs.SECTOR_SIZE
+    image[descriptor:descriptor + 20] = xdvdfs.XDVDFS_MAGIC
+    struct.pack_into("<II", image, descriptor + 20, *locations[""])
+    for directory in order:
+        if children[directory]:
+            start = locations[directory][0] * xdvdfs.SECTOR_SIZE
+            table = xdvdfs._build_directory_table(children[directory], locations)
+            image[start:start + len(table)] = table
+    for path, data in files.items():
+        start = locations[path][0] * xdvdfs.SECTOR_SIZE
+        image[start:start + len(data)] = data
+    return bytes(image)
+
+
+class ForwardOnlyStream(io.BytesIO):
+    """Fails on any backward seek, like a stream that would have to be decompressed again"""
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET and offset < self.tell():
+            raise AssertionError(f"backward seek from {self.tell()} to {offset}")
+        return super().seek(offset, whence)
+
+
+def read_tree(root):
+    found = {}
+    for folder, _dirs, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, "rb") as f:
+                found[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return found
+
+
+class ExtractTest(unittest.TestCase):
+    def setUp(self):
+        self.image = build_image(FILES)
+        self.dest = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dest.cleanup()
+
+    def test_single_forward_pass(self):
+        image = XDVDFSImage(ForwardOnlyStream(self.image))
+        self.assertEqual(image.extract(self.dest.name), (len(FILES), sum(map(len, FILES.values()))))
+        self.assertEqual(read_tree(self.dest.name), FILES)
+        # The tables read along the way are kept
+        self.assertEqual(sorted(e.path for e in image.entries() if not e.is_dir), sorted(FILES))
+
+    def test_extract_after_listing(self):
+        image = XDVDFSImage(io.BytesIO(self.image))
+        self.assertEqual(image.data_size(), sum(map(len, FILES.values())))
+        image.extract(self.dest.name)
+        self.assertEqual(read_tree(self.dest.name), FILES)
+
+    def test_pattern_filter(self):
+        XDVDFSImage(io.BytesIO(self.image)).extract(self.dest.name, include=pattern_filter(xdvdfs.MINIMAL_PATTERNS))
+        self.assertEqual(sorted(read_tree(self.dest.name)), ["default.xex", "media/empty.bin", "media/intro.xmv"])
+
+    def test_progress_reaches_the_total(self):
+        calls = []
+        XDVDFSImage(io.BytesIO(self.image)).extract(self.dest.name, lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls[-1], (sum(map(len, FILES.values())),) * 2)
+
+    def test_not_an_image(self):
+        with self.assertRaises(xdvdfs.XDVDFSError):
+            XDVDFSImage(io.BytesIO(bytes(64 * 1024)))
+
+
+class RebuildTest(unittest.TestCase):
+    def test_trimmed_image_round_trip(self):
+        # Put the game partition at the XGD2 offset, as in a Redump image
+        source = bytes(0xFD90000) + build_image(FILES)
+        out = io.BytesIO()
+        written = rebuild_xiso(XDVDFSImage(io.BytesIO(source)), out)
+        self.assertEqual(written, len(out.getvalue()))
+        rebuilt = XDVDFSImage(io.BytesIO(out.getvalue()))
+        self.assertEqual(rebuilt.partition_offset, 0)
+        with tempfile.TemporaryDirectory() as dest:
+            rebuilt.extract(dest)
+            self.assertEqual(read_tree(dest), FILES)
+
+
+class CRC32ReaderTest(unittest.TestCase):
+    def test_random_seeks_count_every_byte_once(self):
+        data = os.urandom(200000)
+        rng = random.Random(1)
+        for _ in range(50):
+            reader = CRC32Reader(io.BytesIO(data))
+            for _ in range(rng.randrange(1, 10)):
+                reader.seek(rng.randrange(len(data)))
+                if rng.random() < 0.5:
+                    reader.read(rng.randrange(1, 30000))
+                else:
+                    reader.readinto(bytearray(rng.randrange(1, 30000)))
+            self.assertEqual(reader.finish(), zlib.crc32(data))
+            self.assertEqual(reader.consumed, len(data))
+
+    def test_zipped_image_extracts_in_one_pass_and_verifies(self):
+        with tempfile.TemporaryDirectory() as folder:
+            archive = os.path.join(folder, "game.zip")
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+                z.writestr("game.iso", build_image(FILES))
+            with zipfile.ZipFile(archive) as z, z.open("game.iso") as member:
+                info = z.getinfo("game.iso")
+                reader = CRC32Reader(member)
+                rewinds = []
+                seek = member.seek
+                member.seek = lambda offset, whence=0: (rewinds.append(offset) if offset < member.tell() else None,
+                                                        seek(offset, whence))[1]
+                XDVDFSImage(reader).extract(os.path.join(folder, "out"))
+                self.assertEqual(reader.finish(), info.CRC)
+            self.assertEqual(rewinds, [])
+            self.assertEqual(read_tree(os.path.join(folder, "out")), FILES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import struct
+import threading
+
+# STFS package magics (console-signed, Live-signed and Microsoft-signed packages)
+STFS_MAGICS = (b"CON ", b"LIVE", b"PIRS")
+
+# Only the first few KB are read: the STFS metadata block ends well before 0x1000
+HEADER_READ_SIZE = 0x1000
+
+# Offsets inside the STFS metadata (big-endian fields)
+_OFF_CONTENT_TYPE = 0x344
+_OFF_MEDIA_ID = 0x354
+_OFF_VERSION = 0x358
+_OFF_BASE_VERSION = 0x35C
+_OFF_TITLE_ID = 0x360
+_OFF_DISPLAY_NAME = 0x411
+_DISPLAY_NAME_SIZE = 0x80
+
+CONTENT_TYPE_TITLE_UPDATE = 0x000B0000
+
+# (st_dev, st_ino, size, mtime_ns) -> parsed header (or None when the file is not STFS)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _formatear_version(valor):
+    """Xbox 360 version field: major(4) minor(4) build(16) qfe(8)"""
+    return f"{valor >> 28}.{(valor >> 24) & 0xF}.{(valor >> 8) & 0xFFFF}.{valor & 0xFF}"
+
+
+def analizar_cabecera_tu(datos):
+    """Parse the first bytes of a TU file
+
+    STFS packages (CON/LIVE/PIRS) carry their TitleID, MediaID and version in the
+    metadata block. Anything in Content/.../000B0000 must be an STFS package, so
+    STFS data is a content TU and non-STFS data is a raw cache TU, whatever the
+    filename says. Returns None when the buffer is too short to tell.
+    """
+    if len(datos) < 4:
+        return None
+
+    magic = bytes(datos[:4])
+    if magic not in STFS_MAGICS:
+        return {
+            "formato": "raw",
+            "tipo": "cache",
+            "title_id": None,
+            "media_id": None,
+            "version": None,
+            "base_version": None,
+            "content_type": None,
+            "nombre": None,
+        }
+
+    if len(datos) < _OFF_TITLE_ID + 4:
+        return None
+
+    content_type, = struct.unpack_from(">I", datos, _OFF_CONTENT_TYPE)
+    media_id, version, base_version, title_id = struct.unpack_from(">IIII", datos, _OFF_MEDIA_ID)
+
+    nombre = None
+    fin_nombre = _OFF_DISPLAY_NAME + _DISPLAY_NAME_SIZE
+    if len(datos) >= fin_nombre:
+        nombre = bytes(datos[_OFF_DISPLAY_NAME:fin_nombre]).decode("utf-16-be", errors="ignore")
+        nombre = nombre.split("\x00", 1)[0].strip() or None
+
+    return {
+        "formato": magic.decode("ascii").strip(),
+        "tipo": "content",
+        "title_id": f"{title_id:08X}" if title_id else None,
+        "media_id": f"{media_id:08X}" if media_id else None,
+        "version": _formatear_version(version),
+        "base_version": _formatear_version(base_version),
+        "content_type": content_type,
+        "nombre": nombre,
+    }
+
+
+def leer_cabecera_tu(ruta):
+    """Read and parse a TU header, cached by file identity so each file is read once"""
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return None
+
+    clave = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        if clave in _cache:
+            return _cache[clave]
+
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read(HEADER_READ_SIZE)
+    except OSError as e:
+        print(f"[ERROR] Reading TU header from {ruta}: {e}")
+        return None
+
+    info = analizar_cabecera_tu(datos)
+    with _cache_lock:
+        _cache[clave] = info
+    return info
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Stored next to the config file in the user's home directory
+MANIFEST_FILE = os.path.expanduser("~/.x360-tu-manager-manifest.db")
+LEGACY_MAPPING_FILE = ".tu_mapping.txt"
+
+_COLUMNAS = ("ruta", "carpeta", "archivo", "title_id", "media_id", "nombre_juego",
+             "version", "tipo", "tamano", "mtime_ns", "hash", "tu_id", "actualizado", "cabecera")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tus (
+    ruta TEXT PRIMARY KEY,
+    carpeta TEXT NOT NULL,
+    archivo TEXT NOT NULL,
+    title_id TEXT,
+    media_id TEXT,
+    nombre_juego TEXT,
+    version TEXT,
+    tipo TEXT,
+    tamano INTEGER,
+    mtime_ns INTEGER,
+    hash TEXT,
+    tu_id TEXT,
+    actualizado REAL,
+    cabecera TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tus_archivo ON tus(archivo);
+CREATE INDEX IF NOT EXISTS idx_tus_title_id ON tus(title_id);
+CREATE INDEX IF NOT EXISTS idx_tus_tu_id ON tus(tu_id);
+CREATE TABLE IF NOT EXISTS carpetas (
+    ruta TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+"""
+
+
+def _normalizar_ruta(ruta):
+    return os.path.normcase(os.path.abspath(ruta))
+
+
+def _rango(carpeta):
+    """(lower, upper) bounds of the paths under `carpeta` in an ordered index"""
+    base = _normalizar_ruta(carpeta).rstrip(os.sep) + os.sep
+    return base, base[:-1] + chr(ord(os.sep) + 1)
+
+
+def md5_archivo(ruta):
+    """MD5 hex digest of a file, read in 1 MB blocks"""
+    md5 = hashlib.md5()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(bloque)
+    return md5.hexdigest()
+
+
+class TUManifest:
+    """Indexed record of every downloaded TU (TitleID, MediaID, game, version, type, size, hash)"""
+
+    def __init__(self, ruta_db=MANIFEST_FILE):
+        self.ruta_db = ruta_db
+        # Worker threads share a single connection, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta_db, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_ESQUEMA)
+            # Columns added after the first manifest version
+            existentes = {fila[1] for fila in self._conn.execute("PRAGMA table_info(tus)")}
+            if "cabecera" not in existentes:
+                self._conn.execute("ALTER TABLE tus ADD COLUMN cabecera TEXT")
+        try:
+            os.chmod(ruta_db, 0o600)
+        except Exception:
+            pass
+
+    def cerrar(self):
+        with self._lock:
+            self._conn.close()
+
+    def registrar_tu(self, ruta, title_id=None, media_id=None, nombre_juego=None, version=None,
+                     tipo=None, hash_md5=None, tu_id=None, cabecera=None):
+        """Insert or update the manifest entry for the TU stored at `ruta`
+
+        `cabecera` records the header format the type/TitleID came from (None = filename guess).
+        The MD5 is computed from the file when the caller doesn't already have it.
+        """
+        ruta = _normalizar_ruta(ruta)
+        try:
+            st = os.stat(ruta)
+            tamano, mtime_ns = st.st_size, st.st_mtime_ns
+            if not hash_md5:
+                hash_md5 = md5_archivo(ruta)
+        except OSError:
+            tamano, mtime_ns = None, None
+
+        fila = (ruta, os.path.dirname(ruta), os.path.basename(ruta), title_id, media_id,
+                nombre_juego, str(version) if version not in (None, "") else None, tipo,
+                tamano, mtime_ns, hash_md5 or None, str(tu_id) if tu_id else None, time.time(),
+                cabecera)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO tus ({', '.join(_COLUMNAS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNAS))})", fila)
+
+    def actualizar_campos(self, ruta, **campos):
+        """Update selected columns of an existing entry"""
+        campos = {k: v for k, v in campos.items() if k in _COLUMNAS and k != "ruta"}
+        if not campos:
+            return
+        asignaciones = ", ".join(f"{k} = ?" for k in campos)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE tus SET {asignaciones} WHERE ruta = ?",
+                               (*campos.values(), _normalizar_ruta(ruta)))
+
+    def eliminar(self, ruta):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tus WHERE ruta = ?", (_normalizar_ruta(ruta),))
+
+    def tus_en_carpeta(self, carpeta):
+        """Return all TUs registered under `carpeta` (recursively) using the primary key index"""
+        # Range scan over the ordered primary key instead of a LIKE pattern
+        base, limite = _rango(carpeta)
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT * FROM tus WHERE ruta >= ? AND ruta < ? ORDER BY ruta",
+                (base, limite)).fetchall()
+        return [dict(fila) for fila in filas]
+
+    def carpetas_indexadas(self, carpeta):
+        """{directory: mtime_ns} of `carpeta` and the directories under it as of their last scan"""
+        base, limite = _rango(carpeta)
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT ruta, mtime_ns FROM carpetas WHERE ruta = ? OR (ruta >= ? AND ruta < ?)",
+                (_normalizar_ruta(carpeta), base, limite)).fetchall()
+        return {fila[0]: fila[1] for fila in filas}
+
+    def marcar_carpeta(self, carpeta, mtime_ns):
+        """Record that `carpeta` was scanned while its mtime was `mtime_ns`"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO carpetas (ruta, mtime_ns) VALUES (?, ?)",
+                               (_normalizar_ruta(carpeta), mtime_ns))
+
+    def olvidar_carpeta(self, carpeta):
+        """Drop a directory that no longer exists, and those under it, from the scan record"""
+        base, limite = _rango(carpeta)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM carpetas WHERE ruta = ? OR (ruta >= ? AND ruta < ?)",
+                               (_normalizar_ruta(carpeta), base, limite))
+
+    def buscar_por_archivo(self, archivo):
+        """Return the most recent entry for a TU filename, or None"""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT * FROM tus WHERE archivo = ? ORDER BY actualizado DESC LIMIT 1",
+                (archivo,)).fetchone()
+        return dict(fila) if fila else None
+
+    def buscar_por_tu_id(self, tu_id, carpeta=None):
+        """Return entries for an XboxUnity TitleUpdateID, optionally limited to one folder"""
+        consulta = "SELECT * FROM tus WHERE tu_id = ?"
+        parametros = [str(tu_id)]
+        if carpeta:
+            consulta += " AND carpeta = ?"
+            parametros.append(_normalizar_ruta(carpeta))
+        with self._lock:
+            filas = self._conn.execute(consulta, parametros).fetchall()
+        return [dict(fila) for fila in filas]
+
+    def tus_por_title_id(self, title_id):
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT * FROM tus WHERE title_id = ? ORDER BY archivo", (title_id,)).fetchall()
+        return [dict(fila) for fila in filas]
+
+    def importar_mapeo_legacy(self, ruta_mapeo):
+        """Import a legacy .tu_mapping.txt file (filename=TitleID=GameName per line)"""
+        carpeta = os.path.dirname(ruta_mapeo)
+        importados = 0
+        with open(ruta_mapeo, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split("=")
+                if len(parts) < 3:
+                    continue
+                ruta_tu = os.path.join(carpeta, parts[0])
+                if os.path.isfile(ruta_tu):
+                    self.registrar_tu(ruta_tu, title_id=parts[1], nombre_juego=parts[2])
+                    importados += 1
+        return importados
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def obtener_manifest():
+    """Shared manifest instance (opened lazily on first use)"""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = TUManifest()
+        return _manifest
@@ -0,0 +1,164 @@
+import re
+from ftplib import all_errors
+
+from ftp_uploader import listar_directorio, listar_recursivo, resincronizar
+from tu_header import analizar_cabecera_tu, HEADER_READ_SIZE
+from xex_reader import analizar_cabecera_xex, XEX_HEADER_READ_SIZE
+
+CONTENT_ROOT = "/Hdd1/Content/0000000000000000"
+CACHE_ROOT = "/Hdd1/Cache"
+TU_CONTENT_TYPE_DIR = "000B0000"
+GOD_CONTENT_TYPE_DIR = "00007000"
+DEFAULT_GAMES_ROOT = "/Hdd1/Games"
+# Game folders are rarely nested deeper than Games/<Letter>/<Game>/<Disc>
+MAX_SCAN_DEPTH = 4
+
+_TITLE_ID = re.compile(r"^[0-9A-Fa-f]{8}$")
+
+
+def escanear_tus_instalados(ftp, log=print):
+    """Inventory of TUs installed on the console, using one FTP connection
+
+    Reads Content/0000000000000000/<TitleID>/000B0000 and Cache once and returns
+    {"content": {title_id: {filename: size}}, "cache": {filename: size}}. The content
+    tree comes from one recursive LIST; servers without LIST -R get one listing per
+    TitleID folder instead.
+    """
+    inventario = {"content": {}, "cache": {}}
+
+    arbol = listar_recursivo(ftp, CONTENT_ROOT)
+    if arbol is not None:
+        for carpeta, archivos in arbol.items():
+            partes = carpeta[len(CONTENT_ROOT):].strip("/").split("/")
+            if (carpeta.startswith(CONTENT_ROOT + "/") and len(partes) == 2 and _TITLE_ID.match(partes[0])
+                    and partes[1].upper() == TU_CONTENT_TYPE_DIR and archivos):
+                inventario["content"][partes[0].upper()] = archivos
+    else:
+        titulos, _ = listar_directorio(ftp, CONTENT_ROOT)
+        for title_id in sorted(titulos):
+            if not _TITLE_ID.match(title_id):
+                continue
+            archivos, existe = listar_directorio(ftp, f"{CONTENT_ROOT}/{title_id}/{TU_CONTENT_TYPE_DIR}")
+            if existe and archivos:
+                inventario["content"][title_id.upper()] = archivos
+
+    inventario["cache"], _ = listar_directorio(ftp, CACHE_ROOT)
+
+    total = sum(len(a) for a in inventario["content"].values()) + len(inventario["cache"])
+    log(f"Console inventory: {total} TU file(s) installed "
+        f"({len(inventario['content'])} title(s) with content TUs, {len(inventario['cache'])} cache file(s))")
+    return inventario
+
+
+def tu_instalada(inventario, title_id, tamano=None, nombres_conocidos=()):
+    """Check whether a TU is already on the console
+
+    A TU matches by one of its known filenames, in the title's 000B0000 folder or in
+    Cache; when the size is known the installed file must have it too.
+    """
+    content = inventario["content"].get((title_id or "").upper(), {})
+    for nombre in nombres_conocidos:
+        for carpeta in (content, inventario["cache"]):
+            if nombre in carpeta and (not tamano or carpeta[nombre] in (None, tamano)):
+                return True
+    return False
+
+
+def leer_rango_remoto(ftp, ruta, longitud, offset=0):
+    """Read `longitud` bytes of a remote file starting at `offset` (REST), then ABOR the rest"""
+    ftp.voidcmd("TYPE I")
+    conn = ftp.transfercmd(f"RETR {ruta}", rest=offset or None)
+    datos = bytearray()
+    completo = False
+    try:
+        while len(datos) < longitud:
+            bloque = conn.recv(min(65536, longitud - len(datos)))
+            if not bloque:
+                completo = True  # Whole (small) file received
+                break
+            datos += bloque
+    finally:
+        conn.close()
+
+    if completo:
+        ftp.voidresp()
+    else:
+        try:
+            ftp.putcmd("ABOR")
+        except all_errors:
+            pass
+        resincronizar(ftp)
+    return bytes(datos)
+
+
+def identificar_xex_remoto(ftp, ruta_xex):
+    """MediaID/TitleID of a remote default.xex from its first few KB"""
+    datos = leer_rango_remoto(ftp, ruta_xex, XEX_HEADER_READ_SIZE)
+    return analizar_cabecera_xex(
+        datos, leer_rango=lambda offset, longitud: leer_rango_remoto(ftp, ruta_xex, longitud, offset))
+
+
+def escanear_juegos_remotos(ftp, raiz=DEFAULT_GAMES_ROOT, log=print):
+    """Identify extracted games under `raiz` on the console without copying them
+
+    Each folder with a default.xex is one game; only its header is read.
+    """
+    juegos = []
+    pendientes = [(raiz.rstrip("/") or "/", 0)]
+    while pendientes:
+        carpeta, profundidad = pendientes.pop(0)
+        entradas, existe = listar_directorio(ftp, carpeta)
+        if not existe:
+            log(f"  Remote folder not found: {carpeta}")
+            continue
+
+        xex = next((n for n, t in entradas.items() if n.lower() == "default.xex" and t is not None), None)
+        if xex:
+            nombre = carpeta.rsplit("/", 1)[-1]
+            try:
+                info = identificar_xex_remoto(ftp, f"{carpeta}/{xex}")
+            except all_errors as e:
+                log(f"  ERROR: Could not read '{nombre}': {e}")
+                continue
+            if info and (info["media_id"] or info["title_id"]):
+                juegos.append({"nombre": nombre, "media_id": info["media_id"],
+                               "title_id": info["title_id"], "ruta_remota": carpeta})
+                log(f"  Identified '{nombre}' ({info['title_id']})")
+            else:
+                log(f"  ERROR: Could not read information from '{nombre}'")
+            continue
+
+        if profundidad < MAX_SCAN_DEPTH:
+            for nombre, tamano in sorted(entradas.items()):
+                if tamano is None:
+                    pendientes.append((f"{carpeta}/{nombre}", profundidad + 1))
+    return juegos
+
+
+def escanear_juegos_god(ftp, log=print):
+    """Identify Games on Demand installed in Content/0000000000000000/<TitleID>/00007000"""
+    juegos = []
+    titulos, _ = listar_directorio(ftp, CONTENT_ROOT)
+    for title_id in sorted(titulos):
+        if not _TITLE_ID.match(title_id):
+            continue
+        carpeta = f"{CONTENT_ROOT}/{title_id}/{GOD_CONTENT_TYPE_DIR}"
+        archivos, existe = listar_directorio(ftp, carpeta)
+        if not existe:
+            continue
+        # Each GOD package is a small STFS header file next to its <name>.data folder
+        for nombre, tamano in sorted(archivos.items()):
+            if tamano is None and f"{nombre}.data" not in archivos:
+                continue
+            try:
+                cabecera = analizar_cabecera_tu(leer_rango_remoto(ftp, f"{carpeta}/{nombre}", HEADER_READ_SIZE))
+            except all_errors as e:
+                log(f"  ERROR: Could not read GOD header {nombre}: {e}")
+                continue
+            if not cabecera or not cabecera["title_id"]:
+                continue
+            juegos.append({"nombre": cabecera["nombre"] or cabecera["title_id"],
+                           "media_id": cabecera["media_id"], "title_id": cabecera["title_id"],
+                           "ruta_remota": f"{carpeta}/{nombre}"})
+            log(f"  Identified GOD '{juegos[-1]['nombre']}' ({cabecera['title_id']})")
+    return juegos
@@ -1,6 +1,7 @@
 import requests
 import time
 import os
+import hashlib
 from urllib.parse import quote
 
 BASE_URL = "https://xboxunity.net/Api"
@@ -24,8 +25,17 @@ def probar_conectividad():
         print(f"[ERROR] Cannot connect to XboxUnity: {e}")
         return False
 
-def login_xboxunity(usuario, contrasena):
-    """Login using username/password and return token"""
+def login_xboxunity(usuario, contrasena, detalles=None):
+    """Login using username/password and return token
+
+    If `detalles` is a dict, on failure detalles["error"] is "credentials" when XboxUnity
+    rejected the credentials (401/403, or no token in the reply) and "network" for anything
+    worth retrying: no connection, rate limiting (429) or a server error (5xx). A 429's
+    Retry-After, in seconds, is stored as detalles["espera"].
+    """
+    if detalles is None:
+        detalles = {}
+    detalles["error"] = "network"
     url = f"{BASE_URL}/Auth/Login"
     headers = {
         "User-Agent": "UnityApp/1.0",
@@ -47,15 +57,21 @@ def login_xboxunity(usuario, contrasena):
                 print(f"[INFO] JSON response received: {data}")
                 if "token" in data:
                     print("[INFO] Token obtained successfully")
+                    detalles.pop("error", None)
                     return data["token"]
                 else:
                     print("[ERROR] Token not found in response")
+                    detalles["error"] = "credentials"
             except Exception as e:
                 print(f"[ERROR] Parsing login response: {e}")
                 print(f"[ERROR] Response content: {r.text[:500]}")
         else:
             print(f"[ERROR] HTTP status code: {r.status_code}")
             print(f"[ERROR] Server response: {r.text[:500]}")
+            if r.status_code in (401, 403):
+                detalles["error"] = "credentials"
+            elif r.status_code == 429 and r.headers.get("Retry-After", "").strip().isdigit():
+                detalles["espera"] = int(r.headers["Retry-After"])
             
     except requests.exceptions.Timeout:
         print("[ERROR] Timeout connecting to XboxUnity")
@@ -236,33 +252,64 @@ def buscar_tus(media_id=None, title_id=None, token=None, api_key=None):
             print(f"[WARNING] With specific MediaID: {media_id}")
         return []
 
-def descargar_tu(url, destino, progreso_callback=None):
-    """Download a TU from the specified URL and return the original filename"""
+DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': 'https://xboxunity.net/'
+}
+
+def _nombre_original(r):
+    """Original TU filename from the Content-Disposition header, or None"""
+    content_disposition = r.headers.get('content-disposition', '')
+    if content_disposition:
+        import re
+        filename_match = re.search(r'filename[^;=\n]*=(([\'"]).*?\2|[^;\n]*)', content_disposition)
+        if filename_match:
+            original_filename = filename_match.group(1).strip('\'"')
+            print(f"[INFO] Original filename from headers: {original_filename}")
+            return original_filename
+    return None
+
+def abrir_descarga_tu(url, nombre_por_defecto):
+    """Start a streaming TU download without writing it anywhere
+
+    Returns (response, filename, total_size) or (None, None, 0) on error.
+    The caller consumes response.iter_content() and must close the response.
+    """
+    try:
+        print(f"[INFO] Streaming from: {url}")
+        r = _session.get(url, headers=DOWNLOAD_HEADERS, stream=True, timeout=60)
+        if r.status_code != 200:
+            print(f"[ERROR] Download error: {r.status_code}")
+            print(f"[ERROR] Response: {r.text[:200]}")
+            r.close()
+            return None, None, 0
+        nombre = _nombre_original(r) or nombre_por_defecto
+        total_size = int(r.headers.get('content-length', 0))
+        print(f"[INFO] File size: {total_size} bytes")
+        return r, nombre, total_size
+    except Exception as e:
+        print(f"[ERROR] Error starting TU download: {e}")
+        return None, None, 0
+
+def descargar_tu(url, destino, progreso_callback=None, detalles=None):
+    """Download a TU from the specified URL and return the original filename
+
+    If `detalles` is a dict it is filled with the final path, size and MD5 of the file
+    (hashed while downloading, so no second read is needed).
+    """
     try:
         print(f"[INFO] Downloading from: {url}")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Referer': 'https://xboxunity.net/'
-        }
-        
         # Create directory if it doesn't exist
         directorio = os.path.dirname(destino)
         if directorio and not os.path.exists(directorio):
             os.makedirs(directorio, exist_ok=True)
         
-        r = _session.get(url, headers=headers, stream=True, timeout=60)
+        r = _session.get(url, headers=DOWNLOAD_HEADERS, stream=True, timeout=60)
         
         if r.status_code == 200:
             # Try to get original filename from Content-Disposition header
-            original_filename = None
-            content_disposition = r.headers.get('content-disposition', '')
-            if content_disposition:
-                import re
-                filename_match = re.search(r'filename[^;=\n]*=(([\'"]).*?\2|[^;\n]*)', content_disposition)
-                if filename_match:
-                    original_filename = filename_match.group(1).strip('\'"')
-                    print(f"[INFO] Original filename from headers: {original_filename}")
+            original_filename = _nombre_original(r)
             
             # If no filename in headers, try to get it from URL or use the provided destino
             if not original_filename:
@@ -285,16 +332,22 @@ def descargar_tu(url, destino, progreso_callback=None):
             print(f"[INFO] File size: {total_size} bytes")
             
             downloaded = 0
+            md5 = hashlib.md5()
             with open(destino, 'wb') as f:
                 for chunk in r.iter_content(chunk_size=8192):
                     if chunk:
                         f.write(chunk)
+                        md5.update(chunk)
                         downloaded += len(chunk)
                         
                         if progreso_callback and total_size > 0:
                             progreso_callback(downloaded, total_size)
             
             print(f"[INFO] Download completed: {destino}")
+            if detalles is not None:
+                detalles['ruta'] = destino
+                detalles['tamano'] = downloaded
+                detalles['md5'] = md5.hexdigest()
             return True, original_filename
         else:
             print(f"[ERROR] Download error: {r.status_code}")
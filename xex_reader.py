@@ -2,8 +2,15 @@ import subprocess
 import re
 import os
 import platform
+import struct
 import sys
 
+# XEX2 header: the optional header table follows the fixed 0x18-byte header
+XEX2_MAGIC = b"XEX2"
+XEX_HEADER_READ_SIZE = 0x2000
+_XEX_EXECUTION_INFO_KEY = 0x00040006
+_XEX_EXECUTION_INFO_SIZE = 24
+
 # Detect XexTool.exe path regardless of case sensitivity
 def encontrar_xextool():
     # Get the directory where this script is running from
@@ -41,6 +48,43 @@ def get_xextool_path():
     XEXTOOL_PATH_CACHE = encontrar_xextool()
     return XEXTOOL_PATH_CACHE
 
+def analizar_cabecera_xex(datos, leer_rango=None):
+    """Get MediaID and TitleID straight from the XEX2 header bytes (no XexTool needed)
+
+    `datos` is the start of the file. If the execution info block lies past the end of
+    `datos`, `leer_rango(offset, length)` is called to fetch it (e.g. a ranged FTP read).
+    """
+    if len(datos) < 0x18 or bytes(datos[:4]) != XEX2_MAGIC:
+        return None
+
+    num_cabeceras, = struct.unpack_from(">I", datos, 0x14)
+    offset_info = None
+    for i in range(min(num_cabeceras, 64)):
+        pos = 0x18 + i * 8
+        if pos + 8 > len(datos):
+            break
+        clave, valor = struct.unpack_from(">II", datos, pos)
+        if clave == _XEX_EXECUTION_INFO_KEY:
+            offset_info = valor
+            break
+    if offset_info is None:
+        return None
+
+    if offset_info + _XEX_EXECUTION_INFO_SIZE <= len(datos):
+        info = bytes(datos[offset_info:offset_info + _XEX_EXECUTION_INFO_SIZE])
+    elif leer_rango:
+        info = leer_rango(offset_info, _XEX_EXECUTION_INFO_SIZE)
+    else:
+        return None
+    if not info or len(info) < 16:
+        return None
+
+    media_id, _version, _base_version, title_id = struct.unpack_from(">IIII", info, 0)
+    return {
+        "media_id": f"{media_id:08X}" if media_id else None,
+        "title_id": f"{title_id:08X}" if title_id else None,
+    }
+
 def obtener_media_id(ruta_xex):
     """Get only MediaID (function kept for compatibility)"""
     info = obtener_info_juego(ruta_xex)